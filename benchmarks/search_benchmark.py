@@ -0,0 +1,345 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from recycling_business_finder.geo import EARTH_RADIUS_M, Bounds, haversine_distance
+from recycling_business_finder.material_keywords import MATERIAL_MATCHER
+
+PAGE_SIZE = 20
+PLACES_CAP = 60  # Results a nearby search returns at most, as with the real API
+CELL_DEGREES = 0.01  # Grid cell size of the fake client's spatial index
+
+# Synthetic businesses are spread around Newcastle at roughly ten per square kilometre
+CENTER = (54.9783, -1.6178)
+PLACES_PER_KM2 = 10
+
+SIZES = (60, 600, 6000)
+TARGETS = ('finder', 'manager')
+
+FILLER = ("Our team serves households and businesses across the region with friendly advice, "
+          "flexible collection slots and transparent pricing. ")
+
+def synthetic_area(count: int) -> Bounds:
+    """A square bounding box around CENTER sized for count places"""
+    half_side = math.sqrt(count / PLACES_PER_KM2) * 1000 / 2
+    d_lat = math.degrees(half_side / EARTH_RADIUS_M)
+    d_lng = math.degrees(half_side / (EARTH_RADIUS_M * math.cos(math.radians(CENTER[0]))))
+    return CENTER[0] - d_lat, CENTER[1] - d_lng, CENTER[0] + d_lat, CENTER[1] + d_lng
+
+def synthetic_places(count: int, site_url: Optional[str] = None, website_share: float = 0.7,
+                     seed: int = 0) -> List[Dict]:
+    """Reproducible nearby results with their Place Details, shaped like the Places API's"""
+    rng = random.Random(seed)
+    south, west, north, east = synthetic_area(count)
+    categories = list(MATERIAL_MATCHER.registry)
+    places = []
+    for i in range(count):
+        category = rng.choice(categories)
+        details = {
+            'formatted_address': f"{i} Synthetic Street, Newcastle upon Tyne",
+            'formatted_phone_number': f"0191 {i:06d}",
+            'opening_hours': {'weekday_text': [
+                'Monday: 9:00 AM – 5:00 PM', 'Tuesday: 9:00 AM – 5:00 PM', 'Wednesday: 9:00 AM – 5:00 PM',
+                'Thursday: 9:00 AM – 5:00 PM', 'Friday: 9:00 AM – 5:00 PM', 'Saturday: 10:00 AM – 2:00 PM',
+                'Sunday: Closed'
+            ]},
+            'address_components': [
+                {'long_name': 'Newcastle upon Tyne', 'types': ['postal_town']},
+                {'long_name': 'United Kingdom', 'types': ['country']}
+            ]
+        }
+        if site_url and rng.random() < website_share:
+            details['website'] = f"{site_url}/site/{i}"
+        places.append({
+            'name': f"Synthetic {category.title()} Recycling {i}",
+            'place_id': f"synthetic-{i}",
+            'geometry': {'location': {'lat': rng.uniform(south, north), 'lng': rng.uniform(west, east)}},
+            'rating': round(rng.uniform(1, 5), 1),
+            'types': ['establishment'],
+            'details': details
+        })
+    return places
+
+class FakeGoogleClient:
+    """In-memory stand-in for googlemaps.Client serving synthetic places.
+
+    Nearby searches return the places inside the requested circle, nearest
+    first, in pages of 20 up to the API's cap of 60. Every call sleeps for
+    latency seconds to stand in for the network round trip.
+    """
+
+    def __init__(self, places: List[Dict], latency: float = 0.0):
+        self.places = {place['place_id']: place for place in places}
+        self.latency = latency
+        self.requests = 0
+        self.pages = {}
+        self.lock = threading.Lock()
+        self.grid = {}
+        for place in places:
+            location = place['geometry']['location']
+            self.grid.setdefault(self.cell(location['lat'], location['lng']), []).append(place)
+
+    @staticmethod
+    def cell(lat: float, lng: float) -> Tuple[int, int]:
+        return int(math.floor(lat / CELL_DEGREES)), int(math.floor(lng / CELL_DEGREES))
+
+    def _call(self) -> None:
+        with self.lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def geocode(self, address: str, **kwargs) -> List[Dict]:
+        self._call()
+        return [{'geometry': {'location': {'lat': CENTER[0], 'lng': CENTER[1]}}}]
+
+    def places_nearby(self, location=None, radius=None, page_token=None, **kwargs) -> Dict:
+        self._call()
+        if page_token is not None:
+            with self.lock:
+                remaining = self.pages.pop(page_token)
+        else:
+            lat, lng = location
+            d_lat = math.degrees(radius / EARTH_RADIUS_M)
+            d_lng = math.degrees(radius / (EARTH_RADIUS_M * math.cos(math.radians(lat))))
+            low, high = self.cell(lat - d_lat, lng - d_lng), self.cell(lat + d_lat, lng + d_lng)
+            found = []
+            for cell_lat in range(low[0], high[0] + 1):
+                for cell_lng in range(low[1], high[1] + 1):
+                    for place in self.grid.get((cell_lat, cell_lng), ()):
+                        point = place['geometry']['location']
+                        distance = haversine_distance(lat, lng, point['lat'], point['lng'])
+                        if distance <= radius:
+                            found.append((distance, place['place_id']))
+            found.sort()
+            remaining = [self.places[place_id] for _, place_id in found[:PLACES_CAP]]
+
+        results = [{key: value for key, value in place.items() if key != 'details'} for place in remaining[:PAGE_SIZE]]
+        response = {'results': results, 'status': 'OK'}
+        if len(remaining) > PAGE_SIZE:
+            with self.lock:
+                token = f"token-{len(self.pages)}-{self.requests}"
+                self.pages[token] = remaining[PAGE_SIZE:]
+            response['next_page_token'] = token
+        return response
+
+    def place(self, place_id: str, **kwargs) -> Dict:
+        self._call()
+        return {'result': self.places[place_id]['details'], 'status': 'OK'}
+
+def synthetic_page(index: int, page_bytes: int) -> bytes:
+    """A business homepage mentioning a few materials, padded to about page_bytes"""
+    registry = MATERIAL_MATCHER.registry
+    categories = list(registry)
+    mentioned = [categories[(index + step) % len(categories)] for step in range(3)]
+    paragraphs = ''.join(
+        f"<p>We accept {', '.join(registry[category][:3])} for recycling.</p>" for category in mentioned
+    )
+    head = f"<html><head><title>Business {index}</title></head><body><h1>Business {index}</h1>{paragraphs}"
+    filler = f"<p>{FILLER}</p>" * max(0, (page_bytes - len(head)) // (len(FILLER) + 7))
+    return (head + filler + "</body></html>").encode('utf-8')
+
+class SyntheticSites:
+    """Local HTTP server playing every business website, with configurable latency and page size"""
+
+    def __init__(self, latency: float = 0.0, page_bytes: int = 20000):
+        sites = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                with sites.lock:
+                    sites.requests += 1
+                if sites.latency:
+                    time.sleep(sites.latency)
+                index = int(self.path.rsplit('/', 1)[-1]) if self.path.rsplit('/', 1)[-1].isdigit() else 0
+                body = synthetic_page(index, sites.page_bytes)
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.latency = latency
+        self.page_bytes = page_bytes
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+
+    def __enter__(self) -> 'SyntheticSites':
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+def scenario_environment(count: int, workdir: str) -> Dict[str, str]:
+    """Settings that make a run measure this code rather than quotas, caches or politeness delays"""
+    return {
+        'GOOGLE_API_KEY': os.getenv('GOOGLE_API_KEY') or 'benchmark-key',
+        'SEARCH_MODE': 'tiled',
+        'MAX_RESULTS': str(count),
+        'PAGE_TOKEN_POLL_INTERVAL': '0',
+        'CACHE_DIR': os.path.join(workdir, 'cache'),
+        'HTTP_CACHE_MAX_BYTES': '0',
+        'DETAILS_CACHE_MAX_AGE': '0',
+        'CHECKPOINT_DIR': '',
+        'OUTPUT_FORMAT': 'json',
+        'GOOGLE_QPS': '0',
+        'WEBSITE_HOST_RATE': '0',
+        # Every synthetic site shares one host, so lift the per-host cap to the global one
+        'CRAWL_PER_HOST': os.getenv('CRAWL_CONCURRENCY', '16')
+    }
+
+def peak_memory_mb() -> Optional[float]:
+    """Peak resident set size of this process"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def run_scenario(target: str, count: int, site_latency: float = 0.0, api_latency: float = 0.0,
+                 page_bytes: int = 20000) -> Dict:
+    """Run one search against the stand-ins and measure it.
+
+    Meant to run in a fresh process: it changes the environment and the
+    working directory, and the peak memory it reports is the process's.
+    """
+    with tempfile.TemporaryDirectory(prefix='search_benchmark_') as workdir:
+        os.environ.update(scenario_environment(count, workdir))
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            return measure_search(target, count, site_latency, api_latency, page_bytes)
+        finally:
+            os.chdir(cwd)
+
+def measure_search(target: str, count: int, site_latency: float, api_latency: float, page_bytes: int) -> Dict:
+    from recycling_business_finder.instrumentation import INSTRUMENTATION
+    from recycling_business_finder.recycling_business_finder import EnhancedRecyclingFinder
+
+    with SyntheticSites(site_latency, page_bytes) as sites, open(os.devnull, 'w') as devnull:
+        client = FakeGoogleClient(synthetic_places(count, sites.url), latency=api_latency)
+        bounds = synthetic_area(count)
+        start = time.perf_counter()
+        with redirect_stdout(devnull):
+            if target == 'finder':
+                found = len(EnhancedRecyclingFinder(os.environ['GOOGLE_API_KEY'], client=client)
+                            .search_businesses("Newcastle, UK", bounds=bounds))
+            else:
+                from recycling_services_researcher import RecyclingServiceManager
+                manager = RecyclingServiceManager(client=client)
+                manager.process_location("Newcastle", "UK", bounds=bounds)
+                found = len(manager.json_data or [])
+        wall = time.perf_counter() - start
+        website_requests = sites.requests
+
+    requests = client.requests + website_requests
+    stages = INSTRUMENTATION.summary()['stages']
+    return {
+        'target': target,
+        'places': count,
+        'found': found,
+        'wall_seconds': round(wall, 3),
+        'places_per_second': round(found / wall, 1),
+        'google_requests': client.requests,
+        'website_requests': website_requests,
+        'requests_per_second': round(requests / wall, 1),
+        'peak_memory_mb': peak_memory_mb(),
+        'stage_seconds': {stage: round(stats['seconds'], 3) for stage, stats in stages.items()}
+    }
+
+def run_benchmark(sizes=SIZES, targets=TARGETS, site_latency: float = 0.02, api_latency: float = 0.0,
+                  page_bytes: int = 20000) -> Dict:
+    """Run every target at every size, each in its own process so peak memory is per scenario"""
+    context = multiprocessing.get_context('spawn')
+    scenarios = []
+    for count in sizes:
+        for target in targets:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                scenarios.append(executor.submit(
+                    run_scenario, target, count, site_latency, api_latency, page_bytes
+                ).result())
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {'site_latency': site_latency, 'api_latency': api_latency, 'page_bytes': page_bytes},
+        'scenarios': scenarios
+    }
+
+def compare(previous: Dict, current: Dict) -> List[str]:
+    """Describe how each scenario's wall time changed between two results files"""
+    before = {(s['target'], s['places']): s for s in previous['scenarios']}
+    lines = []
+    for scenario in current['scenarios']:
+        old = before.get((scenario['target'], scenario['places']))
+        if old:
+            change = scenario['wall_seconds'] / old['wall_seconds'] if old['wall_seconds'] else float('inf')
+            lines.append(f"{scenario['target']:<8}{scenario['places']:>6}: {old['wall_seconds']:.2f}s -> "
+                         f"{scenario['wall_seconds']:.2f}s ({change:.2f}x)")
+    return lines
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark searches against a fake Google client and local websites")
+    parser.add_argument('--sizes', default=','.join(map(str, SIZES)), help="comma-separated place counts")
+    parser.add_argument('--targets', default=','.join(TARGETS), help="finder, manager or both")
+    parser.add_argument('--site-latency', type=float, default=0.02, help="seconds each website response takes")
+    parser.add_argument('--api-latency', type=float, default=0.0, help="seconds each Google call takes")
+    parser.add_argument('--page-bytes', type=int, default=20000, help="size of each synthetic website")
+    parser.add_argument('--output', default=os.path.join('output', 'search_benchmark.json'))
+    parser.add_argument('--compare', help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    results = run_benchmark(
+        sizes=[int(size) for size in args.sizes.split(',')],
+        targets=args.targets.split(','),
+        site_latency=args.site_latency,
+        api_latency=args.api_latency,
+        page_bytes=args.page_bytes
+    )
+
+    print(f"{'target':<8}{'places':>7}{'found':>7}{'wall s':>9}{'places/s':>10}{'req/s':>9}{'peak MB':>9}")
+    for s in results['scenarios']:
+        print(f"{s['target']:<8}{s['places']:>7}{s['found']:>7}{s['wall_seconds']:>9.2f}"
+              f"{s['places_per_second']:>10.1f}{s['requests_per_second']:>9.1f}{s['peak_memory_mb'] or 0:>9.1f}")
+
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+    print(f"Results saved to: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print("\n".join(compare(json.load(f), results)))
+
+if __name__ == "__main__":
+    main()
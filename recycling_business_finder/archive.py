@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import sys
+import time
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .cache import SQLiteStore, decode_body, normalize_url
+from .gazetteer import normalize_location
+from .instrumentation import CallbackTimer
+from .website_crawler import WebsiteCrawler, deliver
+
+# What a response answers; each kind has its own key space
+ARCHIVE_KINDS = ('location', 'geocode', 'nearby', 'details', 'website')
+
+class ArchiveMiss(LookupError):
+    """A replayed request has no archived response"""
+
+def default_archive_path() -> str:
+    return os.getenv('ARCHIVE_PATH', os.path.join('archive', 'responses.sqlite3'))
+
+def archive_key(kind: str, key: Any) -> str:
+    """Canonical key for a request, so the same request always finds the same response"""
+    if kind == 'location':
+        return normalize_location(key)
+    if kind == 'website':
+        return normalize_url(key)
+    if isinstance(key, str):
+        return key
+    return json.dumps(key, sort_keys=True, separators=(',', ':'), default=list)
+
+class ResponseArchive(SQLiteStore):
+    """Compressed, content-addressed store of raw Google and website responses.
+
+    Bodies are zlib-compressed and stored once per SHA-256 of their content,
+    so identical responses (shared websites, repeated searches) cost nothing
+    extra. Requests map (kind, key) to the hash of their latest response.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS blobs (
+        hash TEXT PRIMARY KEY,
+        data BLOB NOT NULL,
+        size INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS requests (
+        kind TEXT NOT NULL,
+        key TEXT NOT NULL,
+        hash TEXT NOT NULL,
+        fetched_at REAL NOT NULL,
+        meta TEXT,
+        PRIMARY KEY (kind, key)
+    );
+    """
+
+    def __init__(self, path: Optional[str] = None, level: int = 9):
+        super().__init__(path or default_archive_path(), self.SCHEMA)
+        self.level = level
+        with self.lock, self.connection:
+            columns = {row[1] for row in self.connection.execute("PRAGMA table_info(requests)")}
+            if 'meta' not in columns:
+                # Archives written before response metadata was kept
+                self.connection.execute("ALTER TABLE requests ADD COLUMN meta TEXT")
+
+    def put(self, kind: str, key: Any, body: bytes, meta: Optional[Dict] = None) -> str:
+        """Archive a response body, with optional metadata such as headers, returning its content hash"""
+        digest = hashlib.sha256(body).hexdigest()
+        with self.lock, self.connection:
+            exists = self.connection.execute("SELECT 1 FROM blobs WHERE hash = ?", (digest,)).fetchone()
+            if not exists:
+                self.connection.execute(
+                    "INSERT INTO blobs (hash, data, size) VALUES (?, ?, ?)",
+                    (digest, zlib.compress(body, self.level), len(body))
+                )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO requests (kind, key, hash, fetched_at, meta) VALUES (?, ?, ?, ?, ?)",
+                (kind, archive_key(kind, key), digest, time.time(), json.dumps(meta) if meta is not None else None)
+            )
+        return digest
+
+    def get(self, kind: str, key: Any) -> Optional[bytes]:
+        response = self.get_response(kind, key)
+        return response[0] if response else None
+
+    def get_response(self, kind: str, key: Any) -> Optional[Tuple[bytes, Dict]]:
+        """The archived body and its metadata ({} if none was kept)"""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT b.data, r.meta FROM requests r JOIN blobs b ON b.hash = r.hash WHERE r.kind = ? AND r.key = ?",
+                (kind, archive_key(kind, key))
+            ).fetchone()
+        if not row:
+            return None
+        return zlib.decompress(row[0]), json.loads(row[1]) if row[1] else {}
+
+    def put_json(self, kind: str, key: Any, value: Any) -> str:
+        return self.put(kind, key, json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+    def get_json(self, kind: str, key: Any) -> Any:
+        body = self.get(kind, key)
+        return json.loads(body) if body is not None else None
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Request and unique response counts per kind, with raw and compressed bytes"""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT r.kind, COUNT(*), COUNT(DISTINCT r.hash) FROM requests r GROUP BY r.kind"
+            ).fetchall()
+            blobs = self.connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM blobs"
+            ).fetchone()
+        stats = {kind: {'requests': requests, 'responses': responses} for kind, requests, responses in rows}
+        stats['total'] = {'responses': blobs[0], 'raw_bytes': blobs[1], 'stored_bytes': blobs[2]}
+        return stats
+
+class ArchivingClient:
+    """Pass calls through to a googlemaps client, archiving every response"""
+
+    def __init__(self, client, archive: ResponseArchive):
+        self.client = client
+        self.archive = archive
+
+    def geocode(self, address: str, **kwargs):
+        response = self.client.geocode(address, **kwargs)
+        self.archive.put_json('geocode', address, response)
+        return response
+
+    def places_nearby(self, **kwargs) -> Dict:
+        response = self.client.places_nearby(**kwargs)
+        self.archive.put_json('nearby', kwargs, response)
+        return response
+
+    def place(self, place_id: str, **kwargs) -> Dict:
+        response = self.client.place(place_id, **kwargs)
+        self.archive.put_json('details', place_id, response)
+        return response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+class ReplayClient:
+    """Answer googlemaps client calls from an archive, never touching the network"""
+
+    def __init__(self, archive: ResponseArchive):
+        self.archive = archive
+
+    def _get(self, kind: str, key: Any) -> Any:
+        response = self.archive.get_json(kind, key)
+        if response is None:
+            raise ArchiveMiss(f"No archived {kind} response for {archive_key(kind, key)}")
+        return response
+
+    def geocode(self, address: str, **kwargs):
+        return self._get('geocode', address)
+
+    def places_nearby(self, **kwargs) -> Dict:
+        return self._get('nearby', kwargs)
+
+    def place(self, place_id: str, **kwargs) -> Dict:
+        return self._get('details', place_id)
+
+class ArchiveCrawler(WebsiteCrawler):
+    """WebsiteCrawler that serves archived pages instead of fetching them"""
+
+    def __init__(self, archive: ResponseArchive, **kwargs):
+        super().__init__(**kwargs)
+        self.archive = archive
+
+    def download(self, url: str, on_text: Optional[Callable[[str], Any]] = None,
+                 extract: Optional[CallbackTimer] = None) -> str:
+        response = self.archive.get_response('website', url)
+        if response is None:
+            raise ArchiveMiss(f"No archived page for {url}")
+        body, meta = response
+        # The raw body is capped and decoded with its recorded charset, as the live crawler does
+        return deliver(decode_body(body[:self.max_bytes], meta.get('encoding')), on_text)
+
+def main():
+    archive = ResponseArchive(sys.argv[1] if len(sys.argv) > 1 else None)
+    stats = archive.stats()
+    total = stats.pop('total')
+    print(f"Archive: {archive.path}")
+    for kind in ARCHIVE_KINDS:
+        if kind in stats:
+            print(f"{kind:<10}{stats[kind]['requests']:>8} requests {stats[kind]['responses']:>8} unique responses")
+    ratio = total['raw_bytes'] / total['stored_bytes'] if total['stored_bytes'] else 0
+    print(f"{total['responses']} responses, {total['raw_bytes']} bytes raw, "
+          f"{total['stored_bytes']} bytes stored ({ratio:.1f}x compression)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import json
+import math
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Dict, IO, Iterable, Iterator, List, Optional, Union
+
+def dump_json(records: Iterable[Dict], f: IO[str], indent: int = 2) -> int:
+    """Write records as a JSON array one at a time, returning how many were written.
+
+    The output matches json.dump(list(records), f, indent=indent,
+    ensure_ascii=False) without building the list first. Table rows are
+    serialized as the dicts they stand for.
+    """
+    count = 0
+    padding = ' ' * indent
+    for record in records:
+        f.write(',\n' if count else '[\n')
+        f.write(padding + json.dumps(record, indent=indent, ensure_ascii=False, default=dict).replace('\n', '\n' + padding))
+        count += 1
+    f.write('\n]' if count else '[]')
+    return count
+
+# How each to_dict field is read back from the table's columns
+ROW_FIELDS = {
+    'name': lambda table, i: table.names[i],
+    'address': lambda table, i: table.addresses[i],
+    'coordinates': lambda table, i: {} if math.isnan(table.lats[i]) else {'lat': table.lats[i], 'lng': table.lngs[i]},
+    'place_id': lambda table, i: table.place_ids[i],
+    'materials': lambda table, i: list(table.materials[i]),
+    'website_materials': lambda table, i: {
+        category: list(keywords) for category, keywords in table.website_materials[i]
+    },
+    'phone': lambda table, i: table.phones[i],
+    'website': lambda table, i: table.websites[i],
+    'rating': lambda table, i: table.ratings[i],
+    'opening_hours': lambda table, i: list(table.opening_hours[i]),
+    'service_keywords': lambda table, i: list(table.service_keywords[i]),
+    'address_components': lambda table, i: dict(table.address_components[i])
+}
+
+class BusinessRow(Mapping):
+    """Read-only view of one table row with RecyclingBusiness.to_dict's keys.
+
+    Each field is read from the columns when it is looked up, so reading a
+    few fields of every row never builds the whole record. dict(row) gives
+    the record itself.
+    """
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table: 'BusinessTable', index: int):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, key: str):
+        try:
+            field = ROW_FIELDS[key]
+        except KeyError:
+            raise KeyError(key) from None
+        return field(self.table, self.index)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(ROW_FIELDS)
+
+    def __len__(self) -> int:
+        return len(ROW_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"BusinessRow({dict(self)!r})"
+
+class BusinessTable(Sequence):
+    """Columnar store for business records.
+
+    Coordinates live in float arrays, text columns and ratings in plain
+    lists (ratings keep their int or float type), and repeated values
+    (material categories, keywords, weekly opening hours, address parts)
+    are interned and shared between rows. Indexing or iterating yields
+    BusinessRow views that compare equal to RecyclingBusiness.to_dict, so
+    the table can be handed to anything that reads a list of business
+    dicts.
+    """
+
+    def __init__(self, businesses: Iterable = ()):
+        self.names: List[str] = []
+        self.addresses: List[str] = []
+        self.place_ids: List[Optional[str]] = []
+        self.phones: List[Optional[str]] = []
+        self.websites: List[Optional[str]] = []
+        self.lats = array('d')
+        self.lngs = array('d')
+        self.ratings: List[Optional[float]] = []
+        self.materials: List[tuple] = []
+        self.website_materials: List[tuple] = []
+        self.opening_hours: List[tuple] = []
+        self.service_keywords: List[tuple] = []
+        self.address_components: List[tuple] = []
+        self._shared = {}
+        self.extend(businesses)
+
+    @classmethod
+    def consume(cls, businesses: List) -> 'BusinessTable':
+        """Build a table from a list, emptying the list as rows are added.
+
+        Each business is released as soon as its row exists, so the
+        objects and the table are never held in full at the same time.
+        """
+        table = cls()
+        for i, business in enumerate(businesses):
+            businesses[i] = None
+            table.append(business)
+        businesses.clear()
+        return table
+
+    def _share(self, value):
+        """Return the table's canonical copy of a hashable value"""
+        return self._shared.setdefault(value, value)
+
+    def _strings(self, values: Iterable[str]) -> tuple:
+        return self._share(tuple(sys.intern(value) for value in values))
+
+    def append(self, business: Union[Dict, object]) -> None:
+        """Add a RecyclingBusiness or a business dict as a new row"""
+        record = business if isinstance(business, Mapping) else None
+        get = record.get if record is not None else lambda name, default=None: getattr(business, name, default)
+
+        coordinates = get('coordinates') or {}
+        self.names.append(get('name'))
+        self.addresses.append(get('address'))
+        self.place_ids.append(get('place_id'))
+        self.phones.append(get('phone'))
+        self.websites.append(get('website'))
+        self.lats.append(coordinates.get('lat', math.nan))
+        self.lngs.append(coordinates.get('lng', math.nan))
+        self.ratings.append(get('rating'))
+        self.materials.append(self._strings(sorted(get('materials') or ())))
+        self.website_materials.append(self._share(tuple(
+            (sys.intern(category), self._strings(keywords))
+            for category, keywords in (get('website_materials') or {}).items()
+        )))
+        self.opening_hours.append(self._strings(get('opening_hours') or ()))
+        self.service_keywords.append(self._strings(get('service_keywords') or ()))
+        self.address_components.append(self._share(tuple(
+            (sys.intern(key), sys.intern(value) if isinstance(value, str) else value)
+            for key, value in (get('address_components') or {}).items()
+        )))
+
+    def extend(self, businesses: Iterable) -> None:
+        for business in businesses:
+            self.append(business)
+
+    def row(self, i: int) -> BusinessRow:
+        """View of row i in RecyclingBusiness.to_dict's layout"""
+        return BusinessRow(self, i)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('BusinessTable index out of range')
+        return self.row(index)
+
+    def __iter__(self) -> Iterator[BusinessRow]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def write_json(self, f: IO[str], indent: int = 2) -> int:
+        """Stream the table to f as a JSON array"""
+        return dump_json(self, f, indent)
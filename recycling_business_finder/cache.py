@@ -0,0 +1,246 @@
+import codecs
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from .gazetteer import normalize_location
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def default_cache_dir() -> str:
+    """Directory holding the on-disk caches, shared by every finder and process"""
+    return os.getenv('CACHE_DIR', 'cache')
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL so trivially different spellings share one cache entry"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or 'http'
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    return urlunsplit((scheme, host, parts.path or '/', parts.query, ''))
+
+def decode_body(body: bytes, encoding: Optional[str] = None) -> str:
+    """Decode a response body with its declared charset, falling back to UTF-8"""
+    try:
+        return body.decode(encoding or 'utf-8', errors='replace')
+    except LookupError:
+        return body.decode('utf-8', errors='replace')
+
+def incremental_decoder(encoding: Optional[str] = None) -> codecs.IncrementalDecoder:
+    """Decoder for a body that arrives in chunks, decoding like decode_body"""
+    try:
+        return codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+    except LookupError:
+        return codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+class SQLiteStore:
+    """Thread-safe SQLite connection shared by the on-disk caches"""
+
+    def __init__(self, path: str, schema: str):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.lock = threading.Lock()
+        # Several batch worker processes may share one cache file
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.executescript(schema)
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+class HttpCache(SQLiteStore):
+    """Persistent website response cache with conditional revalidation.
+
+    Entries younger than ``ttl`` seconds are served without touching the
+    network; older ones are revalidated with their ETag/Last-Modified
+    validators. The total body size is kept under ``max_bytes`` by evicting
+    the least recently used entries.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS responses (
+        url TEXT PRIMARY KEY,
+        body BLOB NOT NULL,
+        encoding TEXT,
+        etag TEXT,
+        last_modified TEXT,
+        fetched_at REAL NOT NULL,
+        accessed_at REAL NOT NULL,
+        size INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses (accessed_at);
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None, max_bytes: Optional[int] = None):
+        super().__init__(path or os.path.join(default_cache_dir(), 'http_cache.sqlite3'), self.SCHEMA)
+        self.ttl = float(ttl if ttl is not None else os.getenv('HTTP_CACHE_TTL', 7 * 24 * 3600))
+        self.max_bytes = int(max_bytes if max_bytes is not None else os.getenv('HTTP_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the cached entry for url, marking it as recently used"""
+        key = normalize_url(url)
+        with self.lock, self.connection:
+            row = self.connection.execute(
+                "SELECT body, encoding, etag, last_modified, fetched_at FROM responses WHERE url = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.connection.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), key))
+
+        body, encoding, etag, last_modified, fetched_at = row
+        return {
+            'body': body,
+            'encoding': encoding,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': fetched_at
+        }
+
+    def is_fresh(self, entry: Dict) -> bool:
+        return time.time() - entry['fetched_at'] < self.ttl
+
+    def put(self, url: str, body: bytes, encoding: Optional[str] = None,
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Store a response body and its validators, then enforce the size budget"""
+        if len(body) > self.max_bytes:
+            return
+
+        now = time.time()
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(url, body, encoding, etag, last_modified, fetched_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (normalize_url(url), body, encoding, etag, last_modified, now, now, len(body))
+            )
+            self._evict()
+
+    def refresh(self, url: str) -> None:
+        """Mark an entry as freshly validated after a 304 Not Modified"""
+        now = time.time()
+        with self.lock, self.connection:
+            self.connection.execute(
+                "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, normalize_url(url))
+            )
+
+    def total_size(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _evict(self) -> None:
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        expired = []
+        for url, size in self.connection.execute("SELECT url, size FROM responses ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            expired.append((url,))
+            total -= size
+        self.connection.executemany("DELETE FROM responses WHERE url = ?", expired)
+
+    @staticmethod
+    def decode(entry: Dict) -> str:
+        return decode_body(entry['body'], entry['encoding'])
+
+class PlaceDetailsCache(SQLiteStore):
+    """Persistent Place Details cache keyed by place_id.
+
+    Entries older than ``max_age`` seconds are treated as misses. Hit and
+    miss counts are kept so each search run can report them.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS place_details (
+        place_id TEXT PRIMARY KEY,
+        details TEXT NOT NULL,
+        fetched_at REAL NOT NULL
+    );
+    """
+
+    def __init__(self, path: Optional[str] = None, max_age: Optional[float] = None):
+        super().__init__(path or os.path.join(default_cache_dir(), 'place_details.sqlite3'), self.SCHEMA)
+        self.max_age = float(max_age if max_age is not None else os.getenv('DETAILS_CACHE_MAX_AGE', 30 * 24 * 3600))
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, place_id: str, refresh: bool = False) -> Optional[Dict]:
+        """Return cached details for place_id, or None if missing, expired or refreshing"""
+        row = None
+        with self.lock:
+            if not refresh:
+                row = self.connection.execute(
+                    "SELECT details FROM place_details WHERE place_id = ? AND fetched_at >= ?",
+                    (place_id, time.time() - self.max_age)
+                ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, place_id: str, details: Dict) -> None:
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO place_details (place_id, details, fetched_at) VALUES (?, ?, ?)",
+                (place_id, json.dumps(details, ensure_ascii=False), time.time())
+            )
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def reset_stats(self) -> None:
+        with self.lock:
+            self.hits = 0
+            self.misses = 0
+
+class GeocodeCache(SQLiteStore):
+    """Persistent geocode results keyed by normalized "city, country" string.
+
+    City coordinates do not change, so entries never expire.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS geocodes (
+        location TEXT PRIMARY KEY,
+        lat REAL NOT NULL,
+        lng REAL NOT NULL,
+        bounds TEXT,
+        fetched_at REAL NOT NULL
+    );
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__(path or os.path.join(default_cache_dir(), 'geocode.sqlite3'), self.SCHEMA)
+
+    def get(self, location: str) -> Optional[Dict]:
+        """Return {'lat', 'lng', 'bounds'} for location, or None if not cached"""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT lat, lng, bounds FROM geocodes WHERE location = ?",
+                (normalize_location(location),)
+            ).fetchone()
+        if row is None:
+            return None
+        lat, lng, bounds = row
+        return {'lat': lat, 'lng': lng, 'bounds': tuple(json.loads(bounds)) if bounds else None}
+
+    def put(self, location: str, lat: float, lng: float, bounds: Optional[Tuple] = None) -> None:
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO geocodes (location, lat, lng, bounds, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (normalize_location(location), lat, lng, json.dumps(list(bounds)) if bounds else None, time.time())
+            )
@@ -0,0 +1,115 @@
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+from .json_lines import JsonLinesWriter
+
+class SearchCheckpoint:
+    """Append-only record of a search's progress, used to resume it after a failure.
+
+    Each line of the JSON Lines file is one event: the search parameters,
+    the resolved location, a page of nearby results with its
+    next_page_token, the places of a tiled search, or a finished business.
+    A checkpoint written for different search parameters, or started more
+    than CHECKPOINT_MAX_AGE seconds ago, is discarded.
+    """
+
+    def __init__(self, path: str, search: Dict, max_age: Optional[float] = None):
+        self.path = path
+        # Round-trip through JSON so tuples compare equal to the saved lists
+        self.search = json.loads(json.dumps(search))
+        self.max_age = float(os.getenv('CHECKPOINT_MAX_AGE', 86400)) if max_age is None else max_age
+        self.started_at = time.time()
+        self.location: Optional[Dict] = None
+        self.pages: List[List[Dict]] = []
+        self.next_page_token: Optional[str] = None
+        self.places: Optional[List[Dict]] = None
+        self.businesses: Dict[str, Dict] = {}
+
+        resumed = self._load()
+        if not resumed and os.path.exists(path):
+            os.remove(path)
+        self.writer = JsonLinesWriter(path)
+        if not resumed:
+            self._write({'type': 'search', 'search': self.search, 'started_at': self.started_at})
+
+    def _load(self) -> bool:
+        """Replay the checkpoint file, returning whether it belongs to this search"""
+        if not os.path.exists(self.path):
+            return False
+
+        header = False
+        intact = 0
+        with open(self.path, 'rb') as f:
+            for number, line in enumerate(f):
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError('incomplete line')
+                    event = json.loads(line)
+                except ValueError:
+                    # The process died mid-write; everything before is intact
+                    break
+                intact += len(line)
+                if number == 0:
+                    if event.get('type') != 'search' or event.get('search') != self.search:
+                        print(f"Ignoring checkpoint {self.path} written for a different search")
+                        return False
+                    if self.max_age and time.time() - event.get('started_at', 0) > self.max_age:
+                        print(f"Ignoring checkpoint {self.path} older than {self.max_age:.0f} seconds")
+                        return False
+                    self.started_at = event.get('started_at', self.started_at)
+                    header = True
+                elif event['type'] == 'location':
+                    self.location = event['location']
+                elif event['type'] == 'page':
+                    self.pages.append(event['results'])
+                    self.next_page_token = event.get('next_page_token')
+                elif event['type'] == 'places':
+                    self.places = event['places']
+                elif event['type'] == 'business':
+                    self.businesses[event['business']['place_id']] = event['business']
+
+        if not header:
+            return False
+        if intact < os.path.getsize(self.path):
+            # Drop the partial line so new events start on a line of their own
+            with open(self.path, 'r+b') as f:
+                f.truncate(intact)
+        print(f"Resuming from checkpoint {self.path}: {len(self.pages)} pages, "
+              f"{len(self.businesses)} finished businesses")
+        return True
+
+    def _write(self, event: Dict) -> None:
+        self.writer.write(event)
+
+    @property
+    def pages_done(self) -> bool:
+        """Whether every page of the nearby search has been recorded"""
+        return bool(self.pages) and self.next_page_token is None
+
+    def record_location(self, location: Dict) -> None:
+        self.location = location
+        self._write({'type': 'location', 'location': location})
+
+    def record_page(self, results: List[Dict], next_page_token: Optional[str]) -> None:
+        self.pages.append(results)
+        self.next_page_token = next_page_token
+        self._write({'type': 'page', 'results': results, 'next_page_token': next_page_token})
+
+    def record_places(self, places: List[Dict]) -> None:
+        self.places = places
+        self._write({'type': 'places', 'places': places})
+
+    def record_business(self, business: Dict) -> None:
+        self.businesses[business['place_id']] = business
+        self._write({'type': 'business', 'business': business})
+
+    def close(self) -> None:
+        self.writer.close()
+
+    def remove(self) -> None:
+        """Close and delete the checkpoint once its search has completed"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
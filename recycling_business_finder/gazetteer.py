@@ -0,0 +1,51 @@
+import csv
+import os
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+BUNDLED_GAZETTEER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gazetteer.csv')
+
+COUNTRY_ALIASES = {
+    'united kingdom': 'uk',
+    'great britain': 'uk',
+    'gb': 'uk',
+    'england': 'uk',
+    'scotland': 'uk',
+    'wales': 'uk',
+    'northern ireland': 'uk',
+    'united states': 'usa',
+    'united states of america': 'usa',
+    'us': 'usa'
+}
+
+def normalize_location(location: str) -> str:
+    """Normalize a "city, country" string into a lookup key"""
+    parts = [' '.join(part.split()).lower() for part in location.split(',')]
+    parts = [part for part in parts if part]
+    if len(parts) > 1:
+        parts[-1] = COUNTRY_ALIASES.get(parts[-1], parts[-1])
+    return ', '.join(parts)
+
+@lru_cache(maxsize=None)
+def _read_gazetteer(path: str) -> Dict[str, Tuple[float, float]]:
+    entries = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            key = normalize_location(f"{row['city']}, {row['country']}")
+            entries[key] = (float(row['lat']), float(row['lng']))
+    return entries
+
+def load_gazetteer(path: Optional[str] = None) -> Dict[str, Tuple[float, float]]:
+    """Load the bundled gazetteer plus an optional user file (GAZETTEER_PATH) overriding it.
+
+    Gazetteer files are CSV with city, country, lat and lng columns.
+    """
+    entries = dict(_read_gazetteer(BUNDLED_GAZETTEER))
+    path = path or os.getenv('GAZETTEER_PATH')
+    if path:
+        entries.update(_read_gazetteer(os.path.abspath(path)))
+    return entries
+
+def lookup_location(location: str, path: Optional[str] = None) -> Optional[Tuple[float, float]]:
+    """Return the (lat, lng) of a "city, country" string if the gazetteer knows it"""
+    return load_gazetteer(path).get(normalize_location(location))
@@ -0,0 +1,55 @@
+import math
+from typing import List, Tuple
+
+EARTH_RADIUS_M = 6371000
+MAX_NEARBY_RADIUS = 50000  # Largest radius places_nearby accepts, in meters
+
+# Bounding boxes are (south, west, north, east) tuples in degrees
+Bounds = Tuple[float, float, float, float]
+
+def haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in meters"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = math.radians(lat2 - lat1)
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+def bounds_center(bounds: Bounds) -> Tuple[float, float]:
+    south, west, north, east = bounds
+    return (south + north) / 2, (west + east) / 2
+
+def bounds_radius(bounds: Bounds) -> float:
+    """Radius in meters of the circle centred on the box that covers all of it"""
+    south, west, north, east = bounds
+    lat, lng = bounds_center(bounds)
+    return max(
+        haversine_distance(lat, lng, north, east),
+        haversine_distance(lat, lng, south, west)
+    )
+
+def viewport_to_bounds(viewport: dict) -> Bounds:
+    """Convert a Geocoding API viewport into a bounding box"""
+    return (
+        viewport['southwest']['lat'],
+        viewport['southwest']['lng'],
+        viewport['northeast']['lat'],
+        viewport['northeast']['lng']
+    )
+
+def bounds_around(lat: float, lng: float, radius: float) -> Bounds:
+    """Square bounding box centred on a point, extending radius meters each way"""
+    d_lat = math.degrees(radius / EARTH_RADIUS_M)
+    d_lng = math.degrees(radius / (EARTH_RADIUS_M * max(math.cos(math.radians(lat)), 1e-6)))
+    return lat - d_lat, lng - d_lng, lat + d_lat, lng + d_lng
+
+def split_bounds(bounds: Bounds) -> List[Bounds]:
+    """Split a bounding box into its four quadrants"""
+    south, west, north, east = bounds
+    mid_lat, mid_lng = bounds_center(bounds)
+    return [
+        (south, west, mid_lat, mid_lng),
+        (south, mid_lng, mid_lat, east),
+        (mid_lat, west, north, mid_lng),
+        (mid_lat, mid_lng, north, east)
+    ]
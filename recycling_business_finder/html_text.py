@@ -0,0 +1,125 @@
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+from .material_keywords import KeywordMatcher, MATERIAL_MATCHER
+
+NON_WORD = re.compile(r'\W')
+# Everything up to the last non-word character, i.e. before the trailing word
+UP_TO_LAST_BREAK = re.compile(r'.*\W', re.DOTALL)
+
+# Elements whose content is never visible text. </head> is optional, so
+# the head element itself is not skipped, only what it holds.
+SKIPPED_TAGS = {'script', 'style', 'noscript', 'template', 'svg', 'title'}
+# Inline elements that do not separate words
+INLINE_TAGS = {'a', 'abbr', 'b', 'em', 'font', 'i', 'mark', 'small', 'span', 'strong', 'sub', 'sup', 'u'}
+
+class MaterialTextParser(HTMLParser):
+    """Stream visible page text into a KeywordMatcher without building a DOM.
+
+    Text is scanned in batches as it arrives. Each batch is scanned up to
+    its last complete word; the word still arriving, plus enough of the
+    words before it for multi-word keywords, is carried to the next batch.
+    """
+
+    def __init__(self, matcher: KeywordMatcher = MATERIAL_MATCHER, batch_chars: int = 16 * 1024):
+        super().__init__(convert_charrefs=True)
+        self.matcher = matcher
+        self.batch_chars = batch_chars
+        self.found = set()
+        self.complete = False
+        self._skip_depth = 0
+        self._pending: List[str] = []
+        self._pending_chars = 0
+        self._carry = ''
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag not in INLINE_TAGS:
+            self._add_text(' ')
+
+    def handle_startendtag(self, tag, attrs):
+        if tag not in INLINE_TAGS:
+            self._add_text(' ')
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag not in INLINE_TAGS:
+            self._add_text(' ')
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._add_text(data)
+
+    def _add_text(self, text: str) -> None:
+        self._pending.append(text)
+        self._pending_chars += len(text)
+        if self._pending_chars >= self.batch_chars:
+            self.scan()
+
+    def scan(self, final: bool = False) -> None:
+        """Match the pending text up to its last complete word; final matches all of it"""
+        if not self._pending and not (final and self._carry):
+            return
+        text = self._carry + ''.join(self._pending)
+        self._pending = []
+        self._pending_chars = 0
+        if final:
+            self.matcher.find_keywords(text, self.found)
+            self._carry = ''
+        else:
+            # A word running up to the end of the batch may continue in the next
+            # one ("pet" of "petrol"), so it is only matched once it is complete
+            complete_words = UP_TO_LAST_BREAK.match(text)
+            cut = complete_words.end() if complete_words else 0
+            self.matcher.find_keywords(text[:cut], self.found)
+            # Multi-word keywords may straddle the cut, so the words just
+            # before it are matched again with the next batch
+            boundary = NON_WORD.search(text, max(0, cut - self.matcher.longest_keyword - 1), cut)
+            self._carry = text[boundary.start():] if boundary else text[cut:]
+        self.complete = self.matcher.has_all_categories(self.found)
+
+class MaterialStream:
+    """Find material keywords in a page while it downloads.
+
+    feed() takes the page text in pieces as they arrive and stops parsing
+    once every category is found; result() returns the materials.
+    """
+
+    def __init__(self, matcher: KeywordMatcher = MATERIAL_MATCHER):
+        self.parser = MaterialTextParser(matcher)
+        self.fed = False
+
+    def feed(self, text: str) -> None:
+        self.fed = True
+        if not self.parser.complete:
+            self.parser.feed(text)
+
+    def result(self, text: Optional[str] = None) -> Dict[str, List[str]]:
+        """The materials found, feeding text first if the page was not streamed"""
+        if text and not self.fed:
+            self.feed(text)
+        if not self.parser.complete:
+            self.parser.close()
+            self.parser.scan(final=True)
+        return self.parser.matcher.group(self.parser.found)
+
+def extract_materials_from_html(html: str, matcher: KeywordMatcher = MATERIAL_MATCHER,
+                                chunk_chars: int = 64 * 1024) -> Dict[str, List[str]]:
+    """Find material keywords in the visible text of an HTML page.
+
+    The page is fed to the parser in chunks and parsing stops as soon as
+    every material category has been found.
+    """
+    parser = MaterialTextParser(matcher)
+    for start in range(0, len(html), chunk_chars):
+        parser.feed(html[start:start + chunk_chars])
+        parser.scan()
+        if parser.complete:
+            break
+    else:
+        parser.close()
+        parser.scan(final=True)
+    return matcher.group(parser.found)
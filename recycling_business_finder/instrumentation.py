@@ -0,0 +1,222 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from typing import Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = 'recycling'
+
+class StageStats:
+    """Accumulated timings of one pipeline stage"""
+    __slots__ = ('calls', 'errors', 'seconds', 'max_seconds')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'seconds': round(self.seconds, 6),
+            'mean_ms': round(self.seconds * 1000 / self.calls, 3) if self.calls else 0.0,
+            'max_ms': round(self.max_seconds * 1000, 3)
+        }
+
+class CallbackTimer:
+    """Time spent in a callback that runs inside another stage's span.
+
+    The callback's time is taken out of any span opened with exclude=timer
+    and added to the timer's own stage by record(), without counting a
+    call, so the stage's calls still match its own spans.
+    """
+
+    def __init__(self, instrumentation: 'Instrumentation', stage: str):
+        self.instrumentation = instrumentation
+        self.stage = stage
+        self.seconds = 0.0
+
+    def wrap(self, callback: Optional[Callable]) -> Optional[Callable]:
+        if callback is None:
+            return None
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return callback(*args, **kwargs)
+            finally:
+                self.seconds += time.perf_counter() - start
+        return timed
+
+    def record(self) -> None:
+        if self.seconds:
+            self.instrumentation.record(self.stage, self.seconds, calls=0)
+
+class Instrumentation:
+    """Thread-safe timing spans and counters for one pipeline run.
+
+    Spans add their wall time to a named stage (geocode, nearby_page,
+    details, crawl, extract, hours_parse, material_match, sql_write, ...);
+    counters track quantities such as results, cache hits and bytes. The
+    run can be summarized as a dict, a JSON file or a Prometheus textfile.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new run, discarding everything recorded so far"""
+        with self.lock:
+            self.stages: Dict[str, StageStats] = {}
+            self.counters: Dict[str, float] = {}
+            self.started_at = datetime.now()
+            self.started = time.perf_counter()
+
+    def record(self, stage: str, seconds: float, error: bool = False, calls: int = 1) -> None:
+        with self.lock:
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = StageStats()
+            stats.calls += calls
+            stats.seconds += seconds
+            if calls and seconds > stats.max_seconds:
+                stats.max_seconds = seconds
+            if error:
+                stats.errors += 1
+
+    @contextmanager
+    def span(self, stage: str, exclude: Optional[CallbackTimer] = None) -> Iterator[None]:
+        """Time the enclosed block as one call of stage, counting it as an error if it raises.
+
+        Time the exclude timer's callback spends inside the block is left out.
+        """
+        start = time.perf_counter()
+        excluded = exclude.seconds if exclude else 0.0
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            if exclude:
+                seconds -= exclude.seconds - excluded
+            self.record(stage, seconds, error)
+
+    def callback_timer(self, stage: str) -> CallbackTimer:
+        return CallbackTimer(self, stage)
+
+    def timed(self, stage: str) -> Callable:
+        """Decorator form of span, without the generator overhead for small hot functions"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                error = True
+                try:
+                    result = func(*args, **kwargs)
+                    error = False
+                    return result
+                finally:
+                    self.record(stage, time.perf_counter() - start, error)
+            return wrapper
+        return decorator
+
+    def count(self, name: str, amount: float = 1) -> None:
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def summary(self) -> Dict:
+        """The run so far, with the slowest stages first"""
+        with self.lock:
+            stages = sorted(self.stages.items(), key=lambda item: item[1].seconds, reverse=True)
+            return {
+                'started_at': self.started_at.isoformat(),
+                'elapsed_seconds': round(time.perf_counter() - self.started, 3),
+                'stages': {stage: stats.to_dict() for stage, stats in stages},
+                'counters': dict(sorted(self.counters.items()))
+            }
+
+    def log_summary(self, level: int = logging.INFO) -> None:
+        summary = self.summary()
+        logger.log(level, "Run took %.2fs", summary['elapsed_seconds'])
+        for stage, stats in summary['stages'].items():
+            logger.log(level, "%-16s %6d calls %10.3fs total %9.3fms mean %9.3fms max %d errors",
+                       stage, stats['calls'], stats['seconds'], stats['mean_ms'], stats['max_ms'], stats['errors'])
+        for name, value in summary['counters'].items():
+            logger.log(level, "%-16s %g", name, value)
+
+    def write_json(self, path: str, **extra) -> Dict:
+        """Write the summary, plus any extra fields, to a JSON file"""
+        summary = {**extra, **self.summary()}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        logger.info("Run metrics saved to %s", path)
+        return summary
+
+    def prometheus_text(self, labels: Optional[Dict[str, str]] = None) -> str:
+        """The summary in the Prometheus text exposition format"""
+        summary = self.summary()
+        labels = labels or {}
+        lines = []
+
+        for metric, field, kind, help_text in (
+            ('stage_seconds_total', 'seconds', 'counter', 'Wall time spent in each pipeline stage'),
+            ('stage_calls_total', 'calls', 'counter', 'Calls of each pipeline stage'),
+            ('stage_errors_total', 'errors', 'counter', 'Calls of each pipeline stage that raised'),
+            ('stage_max_seconds', 'max_ms', 'gauge', 'Slowest single call of each pipeline stage')
+        ):
+            name = f"{METRIC_PREFIX}_{metric}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for stage, stats in summary['stages'].items():
+                value = stats[field] / 1000 if field == 'max_ms' else stats[field]
+                lines.append(f"{name}{label_set({'stage': stage, **labels})} {value:g}")
+
+        for counter, value in summary['counters'].items():
+            name = f"{METRIC_PREFIX}_{metric_name(counter)}_total"
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{label_set(labels)} {value:g}")
+
+        name = f"{METRIC_PREFIX}_run_seconds"
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name}{label_set(labels)} {summary['elapsed_seconds']:g}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, labels: Optional[Dict[str, str]] = None) -> None:
+        """Write a textfile for node_exporter's textfile collector, replacing it atomically"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text(labels))
+        os.replace(temp_path, path)
+        logger.info("Prometheus metrics saved to %s", path)
+
+def metric_name(name: str) -> str:
+    return re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+def label_set(labels: Dict[str, str]) -> str:
+    """Render {name: value} as a Prometheus label set, or nothing if empty"""
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for value in labels.values())
+    return '{' + ','.join(f'{key}="{value}"' for key, value in zip(labels, escaped)) + '}'
+
+# Shared by the finder, crawler and SQL generator of this process
+INSTRUMENTATION = Instrumentation()
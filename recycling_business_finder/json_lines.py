@@ -0,0 +1,83 @@
+import gzip
+import json
+import os
+import threading
+from typing import Dict, IO, Iterator, Optional
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+def is_gzip_file(path: str) -> bool:
+    """Whether a file starts with the gzip magic bytes"""
+    with open(path, 'rb') as f:
+        return f.read(2) == GZIP_MAGIC
+
+def open_text(path: str, mode: str = 'r') -> IO[str]:
+    """Open a UTF-8 text file, transparently (de)compressing gzip.
+
+    Files are written compressed when their name ends in .gz, and read
+    compressed whenever they start with the gzip magic bytes.
+    """
+    if 'r' in mode:
+        compressed = is_gzip_file(path)
+    else:
+        compressed = path.endswith('.gz')
+    if compressed:
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+class JsonLinesWriter:
+    """Append one compact JSON object per line, safe to share between threads.
+
+    Plain files are flushed after every record so progress is visible
+    during long runs; gzip output (a .gz path) is only flushed on close,
+    which keeps compression effective.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.compressed = path.endswith('.gz')
+        self.file = open_text(path, 'a')
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def write(self, record: Dict) -> None:
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+        with self.lock:
+            self.file.write(line)
+            if not self.compressed:
+                self.file.flush()
+            self.count += 1
+
+    def close(self) -> None:
+        with self.lock:
+            self.file.close()
+
+    def __enter__(self) -> 'JsonLinesWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> Optional[bool]:
+        self.close()
+        return None
+
+class JsonLinesRecords:
+    """A written JSON Lines file as a sized, re-iterable sequence of records.
+
+    Records are read back from disk on every iteration, so a streamed run
+    never holds its businesses in memory; the length is the writer's count.
+    """
+
+    def __init__(self, path: str, count: int):
+        self.path = path
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Dict]:
+        with open_text(self.path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
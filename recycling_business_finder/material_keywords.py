@@ -0,0 +1,132 @@
+import re
+from typing import Dict, List, Optional
+
+# Single registry of material keywords shared by every extractor: the union
+# of the lists the extractors used to keep, spelled as they spelled them
+# (where they differed, as the website extractor did, since its keywords are
+# stored with each business). Matching ignores case but not number, so
+# plurals are listed as keywords of their own; results always use these
+# spellings.
+KEYWORD_REGISTRY = {
+    'plastic': ['plastic', 'plastics', 'PET', 'HDPE', 'LDPE', 'lldpe', 'PVC', 'PP', 'PS', 'PLA',
+                'polymer', 'polymers', 'polypropylene', 'polystyrene', 'polyethylene', 'polyvinyl',
+                'bioplastic', 'bioplastics'],
+    'metal': ['metal', 'metals', 'scrap metal', 'scrap', 'iron', 'steel', 'copper', 'aluminum',
+              'brass', 'bronze', 'zinc', 'tin', 'cans', 'wire', 'ingot', 'ingots', 'ferrous', 'non-ferrous'],
+    'paper': ['paper', 'cardboard', 'newspaper', 'newspapers', 'magazine', 'magazines', 'carton', 'cartons',
+              'corrugated', 'office paper', 'printing paper', 'phonebook', 'phonebooks', 'envelope', 'envelopes'],
+    'glass': ['glass', 'bottle', 'bottles', 'jar', 'jars', 'glassware', 'windscreen', 'windscreens',
+              'windshield', 'windshields', 'cullet'],
+    'electronics': ['electronics', 'electronic', 'electronic waste', 'e-waste', 'computers', 'computer',
+                    'phones', 'phone', 'laptop', 'laptops'],
+    'batteries': ['batteries', 'battery', 'accumulator', 'accumulators'],
+    'automotive': ['automotive', 'car parts', 'auto parts', 'car', 'cars', 'vehicle', 'vehicles'],
+    'organic': ['organic', 'organic waste', 'food waste', 'green waste', 'compost'],
+    'textile': ['textile', 'textiles', 'clothing', 'clothes', 'fabric', 'fabrics', 'garment', 'garments',
+                'apparel', 'wool', 'cotton', 'polyester', 'nylon', 'linen', 'denim', 'silk', 'leather'],
+    'hazardous': ['hazardous', 'chemical', 'chemicals', 'paint', 'paints', 'oil', 'oils'],
+    'general': ['recycling center', 'recycling centers', 'waste management', 'collection center',
+                'collection centers']
+}
+
+# Everyday words the old catalog matcher also used to categorise material
+# labels. In page text they mostly mean something else ("lead times", "book
+# a collection", "mail us"), so only label lookups use them.
+LABEL_KEYWORDS = {
+    'plastic': ['containers', 'packaging'],
+    'metal': ['lead'],
+    'paper': ['packaging', 'box', 'mail', 'book', 'document', 'catalog', 'receipt'],
+    'glass': ['container', 'window', 'mirror', 'pane'],
+    'textile': ['fashion']
+}
+
+# Categories that describe the kind of business rather than a material
+BUSINESS_TYPE_CATEGORIES = ('general',)
+
+class KeywordMatcher:
+    """Find every registry keyword in a text with one compiled regex pass.
+
+    Keywords only match as whole words, exactly as listed, so short keywords
+    such as "pp", "pet" or "car" do not match inside or as part of other
+    words ("carpet", "pets", "cares").
+    Matching is case-insensitive; results use the registry's spelling.
+    """
+
+    def __init__(self, registry: Dict[str, List[str]]):
+        self.registry = {category: list(keywords) for category, keywords in registry.items()}
+        # Lowercase form -> registry spelling
+        self.spellings = {}
+        for category_keywords in self.registry.values():
+            for kw in category_keywords:
+                self.spellings.setdefault(kw.lower(), kw)
+
+        keywords = sorted(self.spellings, key=len, reverse=True)
+        # Longest keywords first so "scrap metal" wins over "scrap" at the same
+        # position. Texts are lowercased up front, which is much faster than
+        # a case-insensitive pattern.
+        self.pattern = re.compile(
+            r'(?<!\w)(' + '|'.join(re.escape(kw) for kw in keywords) + r')(?!\w)'
+        )
+
+        # A multi-word match also implies the shorter keywords it contains,
+        # which the regex consumes without reporting separately. The
+        # substring test skips compiling a pattern for nearly every pair,
+        # which otherwise dominates import time.
+        self.implied = {
+            kw: [other for other in keywords
+                 if other != kw and other in kw
+                 and re.search(r'(?<!\w)' + re.escape(other) + r'(?!\w)', kw)]
+            for kw in keywords
+        }
+        self.keyword_count = len(keywords)
+        self.longest_keyword = max((len(kw) for kw in keywords), default=0)
+        self.keyword_categories = {}
+        for category, category_keywords in self.registry.items():
+            for kw in category_keywords:
+                self.keyword_categories.setdefault(kw.lower(), []).append(category)
+
+    def find_keywords(self, text: str, found: Optional[set] = None) -> set:
+        """Add every keyword present in text to found and return it"""
+        found = set() if found is None else found
+        for match in self.pattern.finditer(text.lower()):
+            keyword = match.group(1)
+            if keyword not in found:
+                found.add(keyword)
+                found.update(self.implied[keyword])
+                if len(found) == self.keyword_count:
+                    break
+        return found
+
+    def has_all_categories(self, found: set) -> bool:
+        """Whether found keywords already cover every category in the registry"""
+        categories = {category for kw in found for category in self.keyword_categories[kw]}
+        return len(categories) == len(self.registry)
+
+    def group(self, found: set) -> Dict[str, List[str]]:
+        """Group found (lowercase) keywords by category, in registry order and spelling"""
+        materials = {}
+        for category, keywords in self.registry.items():
+            matches = [kw for kw in keywords if kw.lower() in found]
+            if matches:
+                materials[category] = matches
+        return materials
+
+    def find(self, text: str) -> Dict[str, List[str]]:
+        """Return {category: [keywords]} for every category mentioned in text"""
+        return self.group(self.find_keywords(text))
+
+    def first_category(self, text: str) -> Optional[str]:
+        """Return the first category, in registry order, mentioned in text"""
+        materials = self.find(text)
+        return next(iter(materials), None)
+
+MATERIAL_MATCHER = KeywordMatcher({
+    category: keywords for category, keywords in KEYWORD_REGISTRY.items()
+    if category not in BUSINESS_TYPE_CATEGORIES
+})
+BUSINESS_TYPE_MATCHER = KeywordMatcher(KEYWORD_REGISTRY)
+# Categorises material labels, e.g. for the catalog, with the everyday words too
+LABEL_MATCHER = KeywordMatcher({
+    category: keywords + LABEL_KEYWORDS.get(category, [])
+    for category, keywords in MATERIAL_MATCHER.registry.items()
+})
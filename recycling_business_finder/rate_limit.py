@@ -0,0 +1,222 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import googlemaps
+
+# Google client methods that are rate limited, each with its own bucket
+GOOGLE_ENDPOINTS = ('geocode', 'places_nearby', 'place')
+
+# API statuses that mean the quota, not the request, is the problem
+QUOTA_STATUSES = ('OVER_QUERY_LIMIT', 'RESOURCE_EXHAUSTED')
+
+THROUGHPUT_WINDOW = 60  # Seconds of history behind the reported request rates
+
+def is_quota_error(error: Exception) -> bool:
+    """Whether a Google client error signals quota exhaustion rather than a bad request"""
+    if isinstance(error, googlemaps.exceptions.ApiError):
+        return error.status in QUOTA_STATUSES
+    if isinstance(error, googlemaps.exceptions.HTTPError):
+        return error.status_code == 429
+    return False
+
+class TokenBucket:
+    """Allow rate requests per second on average, in bursts of up to burst.
+
+    Every caller reserves a token and sleeps until it is due, so concurrent
+    threads are spaced out instead of racing. pause() holds back everyone
+    using the bucket, not just the thread that hit a quota error. A rate of
+    0 or less disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.burst = max(1.0, rate if burst is None else burst)
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = self.burst
+        self.updated = clock()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+        self.requests = 0
+        self.waited = 0.0
+        self.backoffs = 0
+        self.started = None
+        self.recent = deque()
+
+    def reserve(self) -> float:
+        """Take a token, returning how many seconds to wait before using it"""
+        with self.lock:
+            now = self.clock()
+            wait = 0.0
+            if self.rate > 0:
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                self.tokens -= 1
+                if self.tokens < 0:
+                    wait = -self.tokens / self.rate
+            wait = max(wait, self.paused_until - now)
+
+            if self.started is None:
+                self.started = now
+            self.requests += 1
+            self.waited += wait
+            self.recent.append(now + wait)
+            while self.recent and self.recent[0] < now - THROUGHPUT_WINDOW:
+                self.recent.popleft()
+            return wait
+
+    def acquire(self) -> None:
+        """Block until the next request may be sent"""
+        wait = self.reserve()
+        if wait > 0:
+            self.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request on this bucket for the next seconds"""
+        with self.lock:
+            self.paused_until = max(self.paused_until, self.clock() + seconds)
+            self.backoffs += 1
+
+    def throughput(self) -> float:
+        """Requests per second over the last THROUGHPUT_WINDOW seconds"""
+        with self.lock:
+            if self.started is None:
+                return 0.0
+            now = self.clock()
+            recent = sum(1 for sent in self.recent if now - THROUGHPUT_WINDOW <= sent <= now)
+            return recent / max(1.0, min(THROUGHPUT_WINDOW, now - self.started))
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'rate': self.rate,
+            'requests': self.requests,
+            'per_second': round(self.throughput(), 2),
+            'waited': round(self.waited, 3),
+            'backoffs': self.backoffs
+        }
+
+class RateLimiter:
+    """Token buckets shared by everything in the process, one per Google
+    endpoint and one per website host.
+
+    Google calls that fail with a quota error are retried with exponential
+    backoff and jitter, pausing the endpoint's bucket so other threads back
+    off as well. Processes that share a quota, such as batch workers, each
+    get a share of every rate.
+    """
+
+    def __init__(self, google_qps: Optional[float] = None, host_rate: Optional[float] = None,
+                 max_retries: Optional[int] = None, sleep: Callable[[float], None] = time.sleep,
+                 share: float = 1.0):
+        self.google_qps = float(os.getenv('GOOGLE_QPS', 50)) if google_qps is None else google_qps
+        self.host_rate = float(os.getenv('WEBSITE_HOST_RATE', 2)) if host_rate is None else host_rate
+        self.max_retries = int(os.getenv('QUOTA_MAX_RETRIES', 5)) if max_retries is None else max_retries
+        self.backoff_base = float(os.getenv('QUOTA_BACKOFF_BASE', 1))
+        self.backoff_max = float(os.getenv('QUOTA_BACKOFF_MAX', 32))
+        self.share = share
+        self.sleep = sleep
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+
+    def rate_for(self, key: str) -> float:
+        kind, name = key.split(':', 1)
+        if kind == 'host':
+            return self.host_rate * self.share
+        # GOOGLE_QPS_PLACE, GOOGLE_QPS_PLACES_NEARBY and GOOGLE_QPS_GEOCODE override GOOGLE_QPS
+        return float(os.getenv(f"GOOGLE_QPS_{name.upper()}") or self.google_qps) * self.share
+
+    def bucket(self, key: str) -> TokenBucket:
+        with self.lock:
+            if key not in self.buckets:
+                self.buckets[key] = TokenBucket(self.rate_for(key), sleep=self.sleep)
+            return self.buckets[key]
+
+    def wait_for_host(self, url: str) -> None:
+        """Block until the url's host may be sent another request"""
+        self.bucket(f"host:{urlsplit(url).netloc.lower()}").acquire()
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential delay for a retry, with half of it randomized so clients don't retry in lockstep"""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def call_google(self, endpoint: str, method: Callable, *args, **kwargs) -> Any:
+        """Call a Google client method within its endpoint's rate, retrying quota errors"""
+        bucket = self.bucket(f"google:{endpoint}")
+        attempt = 0
+        while True:
+            bucket.acquire()
+            try:
+                return method(*args, **kwargs)
+            except Exception as e:
+                if not is_quota_error(e) or attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                bucket.pause(delay)
+                attempt += 1
+                print(f"Google {endpoint} quota exceeded ({str(e)}), retry {attempt} in {delay:.1f}s")
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Current throughput and waiting per bucket"""
+        with self.lock:
+            buckets = dict(self.buckets)
+        return {key: bucket.stats() for key, bucket in sorted(buckets.items())}
+
+    def summary(self) -> str:
+        """One line per Google endpoint plus the website hosts combined"""
+        lines = []
+        host_requests = host_waited = 0
+        for key, stats in self.stats().items():
+            if key.startswith('host:'):
+                host_requests += stats['requests']
+                host_waited += stats['waited']
+                continue
+            lines.append(
+                f"{key}: {stats['requests']} requests, {stats['per_second']}/s "
+                f"(limit {stats['rate']:g}/s), waited {stats['waited']:.1f}s, {stats['backoffs']} backoffs"
+            )
+        if host_requests:
+            lines.append(f"websites: {host_requests} requests, waited {host_waited:.1f}s")
+        return "\n".join(lines)
+
+class RateLimitedClient:
+    """Wrap a googlemaps.Client so its Places and Geocoding calls go through a RateLimiter"""
+
+    def __init__(self, client: googlemaps.Client, limiter: RateLimiter):
+        self.client = client
+        self.limiter = limiter
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.client, name)
+        if name in GOOGLE_ENDPOINTS:
+            return partial(self.limiter.call_google, name, attribute)
+        return attribute
+
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+def shared_rate_limiter() -> RateLimiter:
+    """The process-wide limiter, created from the environment on first use"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter()
+        return _shared_limiter
+
+def init_worker_rate_limiter(workers: int) -> None:
+    """Give a batch worker process its 1/workers share of every rate limit.
+
+    Token buckets live in one process, so without this each of N workers
+    would send the full GOOGLE_QPS and the batch N times the quota.
+    """
+    global _shared_limiter
+    with _shared_lock:
+        _shared_limiter = RateLimiter(share=1 / max(1, workers))
@@ -1,14 +1,38 @@
+import asyncio
 import googlemaps
-from typing import List, Dict
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 from datetime import datetime
 import json
-import requests
-from bs4 import BeautifulSoup
+import logging
 import re
-from time import sleep
 import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .archive import ArchiveCrawler, ArchivingClient, ReplayClient, ResponseArchive
+from .cache import GeocodeCache, HttpCache, PlaceDetailsCache
+from .checkpoint import SearchCheckpoint
+from .gazetteer import lookup_location
+from .html_text import MaterialStream, extract_materials_from_html
+from .instrumentation import INSTRUMENTATION
+from .material_keywords import BUSINESS_TYPE_MATCHER, MATERIAL_MATCHER
+from .rate_limit import RateLimitedClient, RateLimiter, shared_rate_limiter
+from .geo import Bounds, MAX_NEARBY_RADIUS, bounds_around, bounds_center, bounds_radius, split_bounds, viewport_to_bounds
+from .website_crawler import WebsiteCrawler
+
+logger = logging.getLogger(__name__)
+
+PLACES_RESULT_CAP = 60  # A nearby search returns at most three pages of 20
 
 class RecyclingBusiness:
+    # Slots keep per-business memory down on large runs
+    __slots__ = (
+        'name', 'address', 'materials', 'website_materials', 'phone', 'website', 'rating',
+        'opening_hours', 'coordinates', 'place_id', 'service_keywords', 'address_components'
+    )
+
     def __init__(self, name: str, address: str):
         self.name = name
         self.address = address
@@ -25,24 +49,17 @@ class RecyclingBusiness:
 
     def analyze_business_type(self):
         """Analyze business name and description for material hints"""
-        name_lower = self.name.lower()
-        
-        material_indicators = {
-            'plastic': ['plastic', 'pet', 'polymer', 'hdpe', 'ldpe', 'pvc'],
-            'metal': ['metal', 'scrap', 'aluminum', 'steel', 'copper', 'iron'],
-            'paper': ['paper', 'cardboard', 'newspaper', 'magazine'],
-            'glass': ['glass', 'bottles'],
-            'electronics': ['electronic', 'e-waste', 'computer', 'phone', 'laptop'],
-            'batteries': ['battery', 'batteries', 'accumulator'],
-            'automotive': ['car', 'automotive', 'vehicle', 'auto parts'],
-            'organic': ['organic', 'compost', 'food waste', 'green waste'],
-            'textile': ['textile', 'clothing', 'fabric', 'clothes', 'garment'],
-            'general': ['recycling center', 'waste management', 'collection center']
-        }
-        
-        for material, indicators in material_indicators.items():
-            if any(indicator in name_lower for indicator in indicators):
-                self.materials.add(material)
+        self.materials.update(BUSINESS_TYPE_MATCHER.find(self.name))
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RecyclingBusiness':
+        """Rebuild a business from its to_dict form"""
+        business = cls(name=data['name'], address=data['address'])
+        for field in ('coordinates', 'place_id', 'website_materials', 'phone', 'website',
+                      'rating', 'opening_hours', 'service_keywords', 'address_components'):
+            setattr(business, field, data.get(field, getattr(business, field)))
+        business.materials = set(data.get('materials', ()))
+        return business
 
     def to_dict(self) -> Dict:
         """Convert business object to dictionary for JSON serialization"""
@@ -51,7 +68,7 @@ class RecyclingBusiness:
             'address': self.address,
             'coordinates': self.coordinates,
             'place_id': self.place_id,
-            'materials': list(self.materials),
+            'materials': sorted(self.materials),
             'website_materials': self.website_materials,
             'phone': self.phone,
             'website': self.website,
@@ -61,36 +78,131 @@ class RecyclingBusiness:
             'address_components': self.address_components
         }
 
+class BusinessFinisher:
+    """Apply website materials to businesses and hand each one on once complete.
+
+    Businesses without a website are finished as soon as they are added;
+    the rest wait, grouped by URL, for their website's analysis.
+    """
+
+    def __init__(self, finder: 'EnhancedRecyclingFinder', on_business: Optional[Callable] = None,
+                 checkpoint: Optional[SearchCheckpoint] = None, keep: bool = True):
+        self.finder = finder
+        self.on_business = on_business
+        self.checkpoint = checkpoint
+        # Without keep, taken businesses are cleared from the caller's list;
+        # the finisher only holds those still waiting for their website
+        self.keep = keep
+        self.pending: Dict[str, List[RecyclingBusiness]] = {}
+        self.added = 0
+        self.released = 0
+        self.lock = threading.Lock()
+
+    @property
+    def found(self) -> int:
+        """Businesses taken so far, including any cleared from the list"""
+        return self.released + self.added
+
+    def release(self, businesses: List[RecyclingBusiness]) -> None:
+        if not self.keep:
+            self.released += len(businesses)
+            businesses.clear()
+            self.added = 0
+
+    def restore(self, businesses: List[RecyclingBusiness]) -> None:
+        """Hand on businesses finished by an earlier, interrupted run"""
+        for business in businesses[self.added:]:
+            if self.on_business:
+                self.on_business(business)
+        self.added = len(businesses)
+        self.release(businesses)
+
+    def add(self, businesses: List[RecyclingBusiness]) -> None:
+        """Take the businesses appended since the last call"""
+        for business in businesses[self.added:]:
+            if business.website:
+                self.pending.setdefault(business.website, []).append(business)
+            else:
+                self.finish(business, {})
+        self.added = len(businesses)
+        self.release(businesses)
+
+    def finish(self, business: RecyclingBusiness, website_materials: Dict) -> None:
+        with self.lock:
+            self.finder.add_website_materials(business, website_materials)
+            if self.checkpoint:
+                self.checkpoint.record_business(business.to_dict())
+            if self.on_business:
+                self.on_business(business)
+
+    def finish_website(self, url: str, website_materials: Dict) -> None:
+        """Finish every business sharing a website once it has been analyzed"""
+        with self.lock:
+            waiting = self.pending.pop(url, [])
+        for business in waiting:
+            self.finish(business, website_materials)
+
+    def finish_remaining(self) -> None:
+        """Finish businesses whose website produced no result"""
+        for url in list(self.pending):
+            self.finish_website(url, {})
+
 class EnhancedRecyclingFinder:
-    def __init__(self, api_key):
-        self.client = googlemaps.Client(key=api_key)  # This is likely how it's currently implemented
+    def __init__(self, api_key, refresh_details: bool = False, rate_limiter: Optional[RateLimiter] = None,
+                 client=None, archive: Optional[ResponseArchive] = None, replay: Optional[bool] = None):
+        # ARCHIVE_MODE=record keeps every raw response in a ResponseArchive;
+        # ARCHIVE_MODE=replay answers every request from it, with no network
+        archive_mode = os.getenv('ARCHIVE_MODE', 'off').lower()
+        self.replaying = archive_mode == 'replay' if replay is None else replay
+        if archive is None and (self.replaying or archive_mode == 'record'):
+            archive = ResponseArchive()
+        self.archive = archive
+
+        if self.replaying:
+            # Nothing is sent anywhere, so no rate limit, per-endpoint
+            # GOOGLE_QPS_* overrides included, applies and nothing is retried
+            self.rate_limiter = None
+            self.client = ReplayClient(archive)
+        else:
+            if client is None:
+                client = googlemaps.Client(key=api_key, retry_over_query_limit=False)
+            if archive is not None:
+                client = ArchivingClient(client, archive)
+            # Quota errors are retried by the shared rate limiter, which backs off
+            # every thread at once, instead of by each client on its own. A client
+            # with the same methods as googlemaps.Client can stand in for Google.
+            self.rate_limiter = rate_limiter or shared_rate_limiter()
+            self.client = RateLimitedClient(client, self.rate_limiter)
         self.search_radius = int(os.getenv('SEARCH_RADIUS', 5000))
         self.max_results = int(os.getenv('MAX_RESULTS', 100))
-        # Define material keywords
-        self.material_keywords = {
-            'plastic': ['plastic', 'pet', 'hdpe', 'ldpe', 'pvc', 'pp', 'ps'],
-            'metal': ['metal', 'scrap metal', 'iron', 'steel', 'copper', 'aluminum'],
-            'paper': ['paper', 'cardboard', 'newspaper'],
-            'glass': ['glass', 'bottles'],
-            'electronics': ['electronic', 'e-waste', 'electronics'],
-            'batteries': ['battery', 'batteries'],
-            'automotive': ['car', 'vehicle', 'automotive'],
-            'organic': ['organic waste', 'food waste', 'compost'],
-            'textile': ['clothing', 'clothes', 'textile'],
-            'hazardous': ['hazardous']
-        }
+        self.details_workers = max(1, int(os.getenv('DETAILS_WORKERS', 8)))
+        self.search_mode = os.getenv('SEARCH_MODE', 'radius').lower()
+        self.tile_workers = max(1, int(os.getenv('TILE_WORKERS', 4)))
+        self.min_tile_radius = int(os.getenv('TILE_MIN_RADIUS', 500))
+        self.page_token_poll = 0.0 if self.replaying else float(os.getenv('PAGE_TOKEN_POLL_INTERVAL', 0.5))
+        self.page_token_timeout = float(os.getenv('PAGE_TOKEN_TIMEOUT', 10))
+        # HTTP_CACHE_MAX_BYTES=0 turns the website cache off; a replay reads
+        # pages and details from the archive only
+        self.http_cache = HttpCache() if int(os.getenv('HTTP_CACHE_MAX_BYTES', 1)) > 0 and not self.replaying else None
+        if self.replaying:
+            self.crawler = ArchiveCrawler(archive)
+        else:
+            self.crawler = WebsiteCrawler(cache=self.http_cache, rate_limiter=self.rate_limiter, archive=archive)
+        # DETAILS_CACHE_MAX_AGE=0 turns the details cache off; refresh_details
+        # skips cached entries but still stores what it fetches
+        self.details_cache = PlaceDetailsCache() if float(os.getenv('DETAILS_CACHE_MAX_AGE', 1)) > 0 and not self.replaying else None
+        self.refresh_details = refresh_details or os.getenv('REFRESH_DETAILS', '').lower() in ('1', 'true', 'yes')
+        self.geocode_cache = GeocodeCache()
+        self.material_keywords = MATERIAL_MATCHER.registry
 
     def extract_materials_from_text(self, text: str) -> Dict[str, List[str]]:
         """Extract material keywords from text."""
-        materials = {}
-        text = text.lower()
-        
-        for category, keywords in self.material_keywords.items():
-            found_keywords = [kw for kw in keywords if kw in text]
-            if found_keywords:
-                materials[category] = found_keywords
-                
-        return materials
+        return MATERIAL_MATCHER.find(text)
+
+    def extract_website_materials(self, html: str) -> Dict[str, List[str]]:
+        """Extract recycling materials from the HTML of a business website"""
+        with INSTRUMENTATION.span('extract'):
+            return extract_materials_from_html(html)
 
     def analyze_website_content(self, url: str) -> Dict:
         """Analyze business website for recycling materials information"""
@@ -98,137 +210,432 @@ class EnhancedRecyclingFinder:
             return {}
             
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            materials = {
-                'plastic': ['plastic', 'PET', 'HDPE', 'PVC', 'LDPE', 'PP', 'PS'],
-                'metal': ['metal', 'aluminum', 'steel', 'copper', 'iron', 'scrap metal'],
-                'paper': ['paper', 'cardboard', 'newspaper', 'magazine'],
-                'glass': ['glass', 'bottles'],
-                'electronics': ['electronics', 'e-waste', 'computers', 'phones', 'electronic waste'],
-                'batteries': ['batteries', 'battery'],
-                'automotive': ['automotive', 'car parts', 'vehicle'],
-                'organic': ['organic waste', 'compost', 'food waste'],
-                'textile': ['textile', 'clothing', 'fabric', 'clothes'],
-                'hazardous': ['hazardous', 'chemical', 'paint', 'oil']
-            }
-            
-            found_materials = {}
-            text_content = soup.get_text().lower()
-            
-            for category, keywords in materials.items():
-                matches = []
-                for keyword in keywords:
-                    if keyword.lower() in text_content:
-                        matches.append(keyword)
-                if matches:
-                    found_materials[category] = matches
-                    
-            return found_materials
-            
+            stream = MaterialStream()
+            html = self.crawler.fetch(url, on_text=stream.feed)
+            with INSTRUMENTATION.span('extract'):
+                return stream.result(html)
         except Exception as e:
             print(f"Error analyzing website {url}: {str(e)}")
             return {}
 
-    def search_businesses(self, location: str) -> List[RecyclingBusiness]:
-        """Search for recycling businesses with enhanced material analysis"""
+    def website_callbacks(self, on_result: Optional[Callable[[str, Dict], None]] = None) -> Dict:
+        """Crawler callbacks that match each page while it downloads and analyze it once done"""
+        streams = {}
+
+        def open_page(url):
+            streams[url] = MaterialStream()
+            return streams[url].feed
+
+        def analyze(url, html):
+            stream = streams.pop(url, None) or MaterialStream()
+            try:
+                with INSTRUMENTATION.span('extract'):
+                    materials = stream.result(html) if html else {}
+            except Exception as e:
+                print(f"Error analyzing website {url}: {str(e)}")
+                materials = {}
+            if on_result:
+                on_result(url, materials)
+            return materials
+
+        return {'on_page': analyze, 'open_page': open_page}
+
+    def analyze_websites(self, urls: List[str],
+                         on_result: Optional[Callable[[str, Dict], None]] = None) -> Dict[str, Dict]:
+        """Crawl several business websites concurrently and analyze each one.
+
+        Pages are matched in the crawler's threads while they download, so
+        only the extracted materials are kept. on_result(url, materials) is
+        called as soon as each site is done.
+        """
+        return self.crawler.crawl(urls, **self.website_callbacks(on_result))
+
+    async def analyze_websites_async(self, urls: List[str],
+                                     on_result: Optional[Callable[[str, Dict], None]] = None) -> Dict[str, Dict]:
+        """analyze_websites for callers that already run an event loop"""
+        return await self.crawler.crawl_async(urls, **self.website_callbacks(on_result))
+
+    def get_place_details(self, place: Dict) -> Optional[Dict]:
+        """Fetch Place Details for a single place, returning None on failure"""
         try:
-            # Geocode the location
+            if self.details_cache:
+                cached = self.details_cache.get(place['place_id'], refresh=self.refresh_details)
+                if cached is not None:
+                    INSTRUMENTATION.count('details_cache_hits')
+                    if self.archive:
+                        # Archive cached details too, or a replay would miss them
+                        self.archive.put_json('details', place['place_id'], {'result': cached})
+                    return cached
+
+            with INSTRUMENTATION.span('details'):
+                place_details = self.client.place(place['place_id'])['result']
+            if self.details_cache:
+                self.details_cache.put(place['place_id'], place_details)
+            return place_details
+        except Exception as e:
+            print(f"Error processing place {place.get('name', 'Unknown')}: {str(e)}")
+            return None
+
+    def fetch_place_details(self, places: List[Dict], executor: Optional[ThreadPoolExecutor] = None) -> List[Optional[Dict]]:
+        """Fetch Place Details for several places concurrently, preserving their order"""
+        if executor is None or len(places) <= 1:
+            return [self.get_place_details(place) for place in places]
+        return list(executor.map(self.get_place_details, places))
+
+    def build_business(self, place: Dict, place_details: Dict) -> RecyclingBusiness:
+        """Build a RecyclingBusiness from a nearby search result and its details"""
+        business = RecyclingBusiness(
+            name=place.get('name', 'Unknown'),
+            address=place_details.get('formatted_address', 'No address')
+        )
+
+        # Set additional attributes
+        business.coordinates = {
+            'lat': place['geometry']['location']['lat'],
+            'lng': place['geometry']['location']['lng']
+        }
+        business.place_id = place['place_id']
+        business.phone = place_details.get('formatted_phone_number')
+        business.website = place_details.get('website')
+        business.rating = place.get('rating')
+        # The same weekday_text lines repeat across a city, so share one copy
+        business.opening_hours = [
+            sys.intern(hours) for hours in place_details.get('opening_hours', {}).get('weekday_text', [])
+        ]
+
+        # Logged lazily: per-business console output would be timed as stage work
+        logger.debug("Processing business: %s", business.name)
+
+        # Extract materials from place details
+        place_materials = self.extract_materials_from_text(
+            str(place_details).lower()
+        )
+        logger.debug("Place materials found for %s: %s", business.name, place_materials)
+
+        business.materials = list(place_materials.keys())
+        business.website_materials = place_materials
+
+        return business
+
+    def add_website_materials(self, business: RecyclingBusiness, website_materials: Dict) -> None:
+        """Combine materials found on the business website with those from its place details"""
+        logger.debug("Website materials found for %s: %s", business.name, website_materials)
+        # Sorted, so the record and its content hash do not depend on set order
+        business.materials = sorted(set(website_materials) | set(business.website_materials))
+        business.website_materials = {
+            **website_materials,
+            **business.website_materials
+        }
+
+    def resolve_location(self, location: str) -> Optional[Dict]:
+        """Resolve "city, country" to {'lat', 'lng', 'bounds'}, trying the gazetteer
+        and the geocode cache before calling the Geocoding API"""
+        if self.replaying:
+            resolved = self.archive.get_json('location', location)
+            if resolved:
+                resolved['bounds'] = tuple(resolved['bounds']) if resolved['bounds'] else None
+                return resolved
+        resolved = self._resolve_location(location)
+        if self.archive and resolved and not self.replaying:
+            self.archive.put_json('location', location, resolved)
+        return resolved
+
+    def _resolve_location(self, location: str) -> Optional[Dict]:
+        coordinates = lookup_location(location)
+        if coordinates:
+            INSTRUMENTATION.count('gazetteer_hits')
+            return {'lat': coordinates[0], 'lng': coordinates[1], 'bounds': None}
+
+        cached = self.geocode_cache.get(location)
+        if cached:
+            INSTRUMENTATION.count('geocode_cache_hits')
+            return cached
+
+        with INSTRUMENTATION.span('geocode'):
             geocode_result = self.client.geocode(location)
-            
-            if not geocode_result:
-                print(f"Could not find location: {location}")
-                return []
-            
-            lat = geocode_result[0]['geometry']['location']['lat']
-            lng = geocode_result[0]['geometry']['location']['lng']
-            
-            print(f"\nSearch center coordinates: {lat}, {lng}")
-            
-            businesses = []
-            search_query = {
-                'location': (lat, lng),
-                'radius': self.search_radius,
-                'keyword': 'recycling',
-                'type': 'establishment'
-            }
-            
-            # Get first page
+        if not geocode_result:
+            return None
+
+        geometry = geocode_result[0]['geometry']
+        resolved = {
+            'lat': geometry['location']['lat'],
+            'lng': geometry['location']['lng'],
+            'bounds': viewport_to_bounds(geometry['viewport']) if 'viewport' in geometry else None
+        }
+        self.geocode_cache.put(location, resolved['lat'], resolved['lng'], resolved['bounds'])
+        return resolved
+
+    def add_businesses(self, places: List[Dict], businesses: List[RecyclingBusiness],
+                       executor: Optional[ThreadPoolExecutor] = None, released: int = 0) -> None:
+        """Fetch details for places and append the resulting businesses, stopping at max_results.
+
+        released counts businesses found earlier that are no longer in the list.
+        """
+        index = 0
+        while index < len(places) and released + len(businesses) < self.max_results:
+            # Only request as many details as are still needed so the
+            # max_results cutoff stays exact
+            batch = places[index:index + self.max_results - released - len(businesses)]
+            index += len(batch)
+
+            for place, place_details in zip(batch, self.fetch_place_details(batch, executor)):
+                if place_details is None:
+                    continue
+                try:
+                    businesses.append(self.build_business(place, place_details))
+                except Exception as e:
+                    print(f"Error processing place {place.get('name', 'Unknown')}: {str(e)}")
+
+    def nearby_page(self, **search_query) -> Dict:
+        """Request the first page of a nearby search"""
+        with INSTRUMENTATION.span('nearby_page'):
             places_result = self.client.places_nearby(**search_query)
-            
+        INSTRUMENTATION.count('nearby_results', len(places_result.get('results', [])))
+        return places_result
+
+    def fetch_next_page(self, page_token: str, stop: Optional[threading.Event] = None) -> Dict:
+        """Fetch the page behind next_page_token as soon as Google makes it valid.
+
+        A fresh token is rejected with INVALID_REQUEST for a short while, so
+        the request is retried every PAGE_TOKEN_POLL_INTERVAL seconds until
+        PAGE_TOKEN_TIMEOUT instead of always waiting a fixed two seconds.
+        """
+        stop = stop or threading.Event()
+        deadline = time.monotonic() + self.page_token_timeout
+        with INSTRUMENTATION.span('nearby_page'):
             while True:
-                # Process current page results
-                if 'results' in places_result:
-                    print(f"Processing page with {len(places_result['results'])} results")
-                    
-                    for place in places_result['results']:
-                        try:
-                            place_details = self.client.place(place['place_id'])['result']
-                            
-                            business = RecyclingBusiness(
-                                name=place.get('name', 'Unknown'),
-                                address=place_details.get('formatted_address', 'No address')
-                            )
-                            
-                            # Set additional attributes
-                            business.coordinates = {
-                                'lat': place['geometry']['location']['lat'],
-                                'lng': place['geometry']['location']['lng']
-                            }
-                            business.place_id = place['place_id']
-                            business.phone = place_details.get('formatted_phone_number')
-                            business.website = place_details.get('website')
-                            business.rating = place.get('rating')
-                            business.opening_hours = place_details.get('opening_hours', {}).get('weekday_text', [])
-                            
-                            # Debug print
-                            print(f"Processing business: {business.name}")
-                            
-                            # Analyze website content
-                            website_materials = self.analyze_website_content(business.website)
-                            print(f"Website materials found: {website_materials}")
-                            
-                            # Extract materials from place details
-                            place_materials = self.extract_materials_from_text(
-                                str(place_details).lower()
-                            )
-                            print(f"Place materials found: {place_materials}")
-                            
-                            # Combine materials
-                            all_materials = set(website_materials.keys()) | set(place_materials.keys())
-                            business.materials = list(all_materials)
-                            business.website_materials = {
-                                **website_materials,
-                                **place_materials
-                            }
-                            
-                            businesses.append(business)
-                            
-                            # Check if we've reached max_results
-                            if len(businesses) >= self.max_results:
-                                print(f"Reached maximum results limit: {self.max_results}")
-                                return businesses
-                                
-                        except Exception as e:
-                            print(f"Error processing place {place.get('name', 'Unknown')}: {str(e)}")
-                            continue
-                
-                # Check for next page
-                if 'next_page_token' in places_result:
+                if stop.wait(self.page_token_poll):
+                    return {}
+                try:
+                    places_result = self.client.places_nearby(page_token=page_token)
+                    break
+                except googlemaps.exceptions.ApiError as e:
+                    if e.status != 'INVALID_REQUEST' or time.monotonic() >= deadline:
+                        raise
+                    INSTRUMENTATION.count('page_token_retries')
+        INSTRUMENTATION.count('nearby_results', len(places_result.get('results', [])))
+        return places_result
+
+    def iter_nearby_pages(self, search_query: Dict,
+                          checkpoint: Optional[SearchCheckpoint] = None) -> Iterator[List[Dict]]:
+        """Yield nearby search result pages while a background thread follows next_page_token.
+
+        The next page is requested while the caller is still processing the
+        current one. Closing the iterator stops the producer. Pages saved in
+        a checkpoint are replayed first and paging resumes from the saved
+        token, or from the first page if that token has expired.
+        """
+        pages = queue.Queue()
+        stop = threading.Event()
+
+        def first_result():
+            if not (checkpoint and checkpoint.pages):
+                return self.nearby_page(**search_query)
+            for results in list(checkpoint.pages):
+                pages.put(results)
+            if checkpoint.pages_done:
+                return None
+            try:
+                return self.fetch_next_page(checkpoint.next_page_token, stop)
+            except googlemaps.exceptions.ApiError as e:
+                print(f"Saved page token was rejected ({str(e)}), restarting the nearby search")
+                return self.nearby_page(**search_query)
+
+        def produce():
+            try:
+                places_result = first_result()
+                while places_result is not None and not stop.is_set():
+                    if checkpoint:
+                        checkpoint.record_page(places_result.get('results', []), places_result.get('next_page_token'))
+                    pages.put(places_result.get('results', []))
+                    if 'next_page_token' not in places_result:
+                        print("No more pages available")
+                        break
                     print("Getting next page of results...")
-                    sleep(2)  # Wait 2 seconds before requesting next page (API requirement)
-                    places_result = self.client.places_nearby(
-                        page_token=places_result['next_page_token']
-                    )
+                    try:
+                        places_result = self.fetch_next_page(places_result['next_page_token'], stop)
+                    except Exception as e:
+                        # Keep the pages we already have
+                        print(f"Error getting next page of results: {str(e)}")
+                        break
+            except Exception as e:
+                pages.put(e)
+            finally:
+                pages.put(None)
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        try:
+            while True:
+                page = pages.get()
+                if page is None:
+                    return
+                if isinstance(page, Exception):
+                    raise page
+                yield page
+        finally:
+            stop.set()
+
+    def search_tile(self, bounds: Bounds) -> Tuple[List[Dict], bool]:
+        """Run a paged nearby search covering one tile.
+
+        Returns the places found and whether the tile hit the Places result
+        cap, meaning it may hold more businesses than were returned. A failed
+        request ends the tile with the places fetched so far, so one tile's
+        error never discards the others.
+        """
+        lat, lng = bounds_center(bounds)
+        places = []
+        try:
+            places_result = self.nearby_page(
+                location=(lat, lng),
+                radius=max(1, min(MAX_NEARBY_RADIUS, int(bounds_radius(bounds)))),
+                keyword='recycling',
+                type='establishment'
+            )
+            places.extend(places_result.get('results', []))
+
+            while 'next_page_token' in places_result:
+                places_result = self.fetch_next_page(places_result['next_page_token'])
+                places.extend(places_result.get('results', []))
+        except Exception as e:
+            INSTRUMENTATION.count('tile_errors')
+            print(f"Error searching tile {bounds} after {len(places)} places: {str(e)}")
+
+        return places, len(places) >= PLACES_RESULT_CAP
+
+    def search_tiles(self, bounds: Bounds) -> List[Dict]:
+        """Cover a bounding box with nearby searches, splitting saturated tiles into quadrants.
+
+        Each level of tiles is queried concurrently and the results are
+        merged in tile order, de-duplicated by place_id.
+        """
+        places_by_id = {}
+        tiles = [bounds]
+
+        with ThreadPoolExecutor(max_workers=self.tile_workers) as executor:
+            while tiles:
+                print(f"Searching {len(tiles)} tiles")
+                next_tiles = []
+                for tile, (places, saturated) in zip(tiles, executor.map(self.search_tile, tiles)):
+                    for place in places:
+                        places_by_id.setdefault(place['place_id'], place)
+                    if saturated and bounds_radius(tile) / 2 >= self.min_tile_radius:
+                        next_tiles.extend(split_bounds(tile))
+                tiles = next_tiles
+
+        return list(places_by_id.values())
+
+    def search_businesses(self, location: str, coordinates: Optional[Tuple[float, float]] = None,
+                          bounds: Optional[Bounds] = None, tiled: Optional[bool] = None,
+                          on_business: Optional[Callable[[RecyclingBusiness], None]] = None,
+                          checkpoint: Optional[SearchCheckpoint] = None,
+                          keep_businesses: bool = True) -> List[RecyclingBusiness]:
+        """Search for recycling businesses with enhanced material analysis.
+
+        Explicit coordinates, or a (south, west, north, east) bounding box,
+        skip location lookup entirely. Tiled mode (SEARCH_MODE=tiled) covers
+        the whole area with adaptive tiles instead of a single nearby search.
+        on_business is called with each business as soon as it is complete:
+        right after its details for businesses without a website, otherwise
+        once the website has been analyzed. Calls never overlap.
+
+        With a checkpoint, the location, result pages and finished businesses
+        are recorded as the search goes and a previous run's progress is
+        reused, so a failed search can be resumed.
+
+        With keep_businesses=False, businesses are only handed to
+        on_business and dropped once finished, so memory does not grow with
+        the number found; the returned list is then empty.
+        """
+        if self.details_cache:
+            self.details_cache.reset_stats()
+        if tiled is None:
+            tiled = self.search_mode == 'tiled'
+
+        try:
+            radius = self.search_radius
+            area = bounds
+            if checkpoint and checkpoint.location:
+                saved = checkpoint.location
+                lat, lng, radius = saved['lat'], saved['lng'], saved['radius']
+                area = tuple(saved['bounds']) if saved['bounds'] else None
+            elif coordinates:
+                lat, lng = coordinates
+            elif bounds:
+                lat, lng = bounds_center(bounds)
+                radius = min(MAX_NEARBY_RADIUS, int(bounds_radius(bounds)))
+            else:
+                resolved = self.resolve_location(location)
+
+                if not resolved:
+                    print(f"Could not find location: {location}")
+                    return []
+
+                lat, lng = resolved['lat'], resolved['lng']
+                area = resolved['bounds']
+
+            if checkpoint and not checkpoint.location:
+                checkpoint.record_location({'lat': lat, 'lng': lng, 'bounds': area, 'radius': radius})
+            
+            print(f"\nSearch center coordinates: {lat}, {lng}")
+            
+            # Businesses finished before an interruption are not fetched again
+            businesses = [RecyclingBusiness.from_dict(record) for record in checkpoint.businesses.values()] if checkpoint else []
+            seen = {business.place_id for business in businesses}
+            finisher = BusinessFinisher(self, on_business, checkpoint, keep=keep_businesses)
+            finisher.restore(businesses)
+
+            def unseen(places):
+                fresh = [place for place in places if place['place_id'] not in seen]
+                seen.update(place['place_id'] for place in fresh)
+                return fresh
+
+            with ThreadPoolExecutor(max_workers=self.details_workers) as executor:
+                if tiled:
+                    if checkpoint and checkpoint.places is not None:
+                        places = checkpoint.places
+                    else:
+                        places = self.search_tiles(area or bounds_around(lat, lng, self.search_radius))
+                        if checkpoint:
+                            checkpoint.record_places(places)
+                    print(f"Tiled search found {len(places)} unique places")
+                    self.add_businesses(unseen(places), businesses, executor, finisher.released)
+                    finisher.add(businesses)
                 else:
-                    print("No more pages available")
-                    break
+                    search_query = {
+                        'location': (lat, lng),
+                        'radius': radius,
+                        'keyword': 'recycling',
+                        'type': 'establishment'
+                    }
+
+                    for page_results in self.iter_nearby_pages(search_query, checkpoint):
+                        if finisher.found >= self.max_results:
+                            break
+                        # Process current page results while the next one is fetched
+                        if page_results:
+                            print(f"Processing page with {len(page_results)} results")
+                        self.add_businesses(unseen(page_results), businesses, executor, finisher.released)
+                        finisher.add(businesses)
+
+                        if finisher.found >= self.max_results:
+                            break
+
+            # Check if we've reached max_results
+            if finisher.found >= self.max_results:
+                print(f"Reached maximum results limit: {self.max_results}")
+
+            # Crawl all business websites concurrently once details are in
+            self.analyze_websites(list(finisher.pending), on_result=finisher.finish_website)
+            finisher.finish_remaining()
             
-            print(f"Total businesses found: {len(businesses)}")
+            print(f"Total businesses found: {finisher.found}")
+            if self.details_cache:
+                stats = self.details_cache.stats()
+                print(f"Place details cache: {stats['hits']} hits, {stats['misses']} misses")
+            if self.rate_limiter:
+                print(f"Request rates:\n{self.rate_limiter.summary()}")
             return businesses
             
         except Exception as e:
@@ -238,6 +645,14 @@ class EnhancedRecyclingFinder:
                 print(f"Response body: {e.response.text}")
             return []
 
+    async def search_businesses_async(self, location: str, **kwargs) -> List[RecyclingBusiness]:
+        """search_businesses for async callers.
+
+        The search blocks on Google requests and thread pools, so it runs in
+        a worker thread and the caller's event loop stays responsive.
+        """
+        return await asyncio.to_thread(self.search_businesses, location, **kwargs)
+
 def main():
     # Replace with your Google API key
     GOOGLE_API_KEY = 'YOUR-API-KEY-HERE'
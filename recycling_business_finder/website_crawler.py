@@ -0,0 +1,218 @@
+import asyncio
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cache import HttpCache, decode_body, incremental_decoder
+from .instrumentation import INSTRUMENTATION, CallbackTimer
+from .rate_limit import RateLimiter
+
+TEXT_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+CHARSET_PATTERN = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+
+# Response headers kept with archived pages
+ARCHIVED_HEADERS = ('Content-Type', 'Content-Length', 'Content-Encoding', 'ETag', 'Last-Modified')
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+def is_text_content(content_type: str) -> bool:
+    """Whether a Content-Type header names a page worth scanning for text"""
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    return not media_type or media_type in TEXT_CONTENT_TYPES
+
+def deliver(text: str, on_text: Optional[Callable[[str], Any]]) -> str:
+    """Hand text to an on_text callback, if any, and return it"""
+    if on_text and text:
+        on_text(text)
+    return text
+
+class WebsiteCrawler:
+    """Fetch business websites over pooled keep-alive connections.
+
+    The asynchronous crawl bounds both the total number of requests in flight
+    and the number of requests sent to any single host. With a rate limiter,
+    each host also gets at most WEBSITE_HOST_RATE requests per second.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, per_host: Optional[int] = None,
+                 timeout: float = 10, cache: Optional[HttpCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None, archive=None):
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        # A ResponseArchive keeps a copy of every page for offline replay
+        self.archive = archive
+        self.max_concurrency = max(1, max_concurrency or int(os.getenv('CRAWL_CONCURRENCY', 16)))
+        self.per_host = max(1, per_host or int(os.getenv('CRAWL_PER_HOST', 2)))
+        self.timeout = timeout
+        self.max_bytes = int(os.getenv('WEBSITE_MAX_BYTES', 512 * 1024))
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept-Encoding': 'gzip, deflate'
+        })
+        adapter = HTTPAdapter(pool_connections=self.max_concurrency, pool_maxsize=self.max_concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def fetch(self, url: str, on_text: Optional[Callable[[str], Any]] = None) -> str:
+        """Fetch a single page and return its decoded text, going through the cache if set.
+
+        on_text, if given, receives the text in pieces as the body downloads.
+        Its time counts toward the extract stage rather than crawl.
+        """
+        extract = INSTRUMENTATION.callback_timer('extract')
+        try:
+            return self.download(url, extract.wrap(on_text), extract)
+        finally:
+            extract.record()
+
+    def download(self, url: str, on_text: Optional[Callable[[str], Any]] = None,
+                 extract: Optional[CallbackTimer] = None) -> str:
+        """fetch without the extract timing; extract is the timer wrapping on_text"""
+        cached = self.cache.get(url) if self.cache else None
+        if cached and self.cache.is_fresh(cached):
+            INSTRUMENTATION.count('crawl_cache_hits')
+            self.record(url, cached['body'], cached['encoding'])
+            return deliver(self.cache.decode(cached), on_text)
+
+        headers = {}
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        if self.rate_limiter:
+            self.rate_limiter.wait_for_host(url)
+        with INSTRUMENTATION.span('crawl', exclude=extract):
+            response = self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
+            try:
+                if cached and response.status_code == 304:
+                    self.cache.refresh(url)
+                    INSTRUMENTATION.count('crawl_not_modified')
+                    self.record(url, cached['body'], cached['encoding'])
+                    return deliver(self.cache.decode(cached), on_text)
+
+                # Use the declared charset only; sniffing undeclared ones is expensive
+                content_type = response.headers.get('Content-Type', '')
+                match = CHARSET_PATTERN.search(content_type)
+                encoding = match.group(1) if match else None
+
+                # Only text pages are read, and only up to max_bytes of them, so
+                # PDFs, images and huge pages cost no more than their headers
+                body = b''
+                if is_text_content(content_type):
+                    if on_text:
+                        # Chunks are decoded and handed on while the rest downloads
+                        decoder = incremental_decoder(encoding)
+                        body = self.read_body(response, lambda chunk: deliver(decoder.decode(chunk), on_text))
+                        deliver(decoder.decode(b'', final=True), on_text)
+                    else:
+                        body = self.read_body(response)
+            finally:
+                response.close()
+        INSTRUMENTATION.count('crawl_bytes', len(body))
+        self.record(url, body, encoding, response.headers, response.status_code)
+
+        if self.cache and response.ok:
+            self.cache.put(
+                url,
+                body,
+                encoding=encoding,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified')
+            )
+        return decode_body(body, encoding)
+
+    def record(self, url: str, body: bytes, encoding: Optional[str],
+               headers: Optional[Mapping[str, str]] = None, status: int = 200) -> None:
+        """Archive a page's raw body with its status, headers and the charset it was decoded with"""
+        if self.archive:
+            self.archive.put('website', url, body, meta={
+                'status': status,
+                'encoding': encoding,
+                'headers': {name: headers[name] for name in ARCHIVED_HEADERS if headers and name in headers}
+            })
+
+    def read_body(self, response: requests.Response,
+                  on_chunk: Optional[Callable[[bytes], Any]] = None) -> bytes:
+        """Read at most max_bytes of a streamed (and transparently gunzipped) body,
+        passing each chunk to on_chunk as it arrives"""
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            chunk = chunk[:self.max_bytes - size]
+            chunks.append(chunk)
+            size += len(chunk)
+            if on_chunk:
+                on_chunk(chunk)
+            if size >= self.max_bytes:
+                break
+        return b''.join(chunks)
+
+    def _fetch_quietly(self, url: str, on_text: Optional[Callable[[str], Any]] = None) -> Optional[str]:
+        try:
+            return self.fetch(url, on_text)
+        except Exception as e:
+            print(f"Error fetching website {url}: {str(e)}")
+            return None
+
+    async def crawl_async(self, urls: Iterable[str],
+                          on_page: Optional[Callable[[str, Optional[str]], Any]] = None,
+                          open_page: Optional[Callable[[str], Callable[[str], Any]]] = None) -> Dict[str, Any]:
+        """Fetch all urls concurrently, returning {url: text or None}.
+
+        on_page(url, text) is called in the fetching thread as soon as each
+        page arrives (text is None if the fetch failed), and its return value
+        is kept instead of the page text. open_page(url), if given, is called
+        before each fetch and returns a callback that receives the page text
+        in pieces while it downloads.
+        """
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        if not unique_urls:
+            return {}
+
+        loop = asyncio.get_running_loop()
+        global_limit = asyncio.Semaphore(self.max_concurrency)
+        host_limits = {}
+
+        def fetch_page(url):
+            page = self._fetch_quietly(url, open_page(url) if open_page else None)
+            return on_page(url, page) if on_page else page
+
+        async def fetch_one(url, executor):
+            host = urlsplit(url).netloc.lower()
+            host_limit = host_limits.setdefault(host, asyncio.Semaphore(self.per_host))
+            async with host_limit, global_limit:
+                return await loop.run_in_executor(executor, fetch_page, url)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(unique_urls))) as executor:
+            pages = await asyncio.gather(*(fetch_one(url, executor) for url in unique_urls))
+
+        return dict(zip(unique_urls, pages))
+
+    def crawl(self, urls: Iterable[str],
+              on_page: Optional[Callable[[str, Optional[str]], Any]] = None,
+              open_page: Optional[Callable[[str], Callable[[str], Any]]] = None) -> Dict[str, Any]:
+        """Synchronous wrapper around crawl_async.
+
+        asyncio.run refuses to start inside a running event loop, so a call
+        from such a thread runs the crawl on its own loop in a helper thread
+        instead. Async code should await crawl_async directly.
+        """
+        crawl = self.crawl_async(urls, on_page, open_page)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(crawl)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, crawl).result()
+
+    def close(self) -> None:
+        self.session.close()
@@ -17,7 +17,8 @@ CREATE TABLE recycling.Businesses (
     DeletedAt DATETIME2 NULL,
     DeletedBy NVARCHAR(128) NULL,
     SearchVector NVARCHAR(MAX),
-    ServiceKeywords NVARCHAR(MAX)
+    ServiceKeywords NVARCHAR(MAX),
+    ContentHash CHAR(64)  -- SHA-256 of the business record, used by delta loads
 )
 """
 
@@ -81,4 +82,50 @@ CREATE TABLE recycling.Materials (
     CO2Savings DECIMAL(10, 2),
     CONSTRAINT UQ_Description UNIQUE (Description)
 )
-"""
\ No newline at end of file
+"""
+SCHEMA_VERSION_TABLE = """
+CREATE TABLE recycling.SchemaVersion (
+    Version INT PRIMARY KEY,
+    Description NVARCHAR(255) NOT NULL,
+    AppliedAt DATETIME2 DEFAULT SYSUTCDATETIME()
+)
+"""
+
+# Secondary Index Definitions (applied through migrations.py)
+
+BUSINESS_PLACE_ID_INDEX = """
+CREATE UNIQUE INDEX UX_Businesses_PlaceID
+ON recycling.Businesses (PlaceID)
+WHERE PlaceID IS NOT NULL
+"""
+
+BUSINESS_LOCATION_INDEX = """
+CREATE INDEX IX_Businesses_Location
+ON recycling.Businesses (Latitude, Longitude)
+INCLUDE (IsActive, Name, PlaceID)
+"""
+
+ADDRESS_COMPONENT_BUSINESS_INDEX = """
+CREATE INDEX IX_AddressComponents_BusinessID
+ON recycling.AddressComponents (BusinessID)
+"""
+
+BUSINESS_HOURS_BUSINESS_INDEX = """
+CREATE INDEX IX_BusinessHours_BusinessID
+ON recycling.BusinessHours (BusinessID)
+"""
+
+BUSINESS_SERVICES_BUSINESS_INDEX = """
+CREATE INDEX IX_BusinessServices_BusinessID
+ON recycling.BusinessServices (BusinessID)
+"""
+
+BUSINESS_MATERIALS_MATERIAL_INDEX = """
+CREATE INDEX IX_BusinessMaterials_MaterialID
+ON recycling.BusinessMaterials (MaterialID, BusinessID)
+"""
+
+MATERIALS_CATEGORY_INDEX = """
+CREATE INDEX IX_Materials_CategoryName
+ON recycling.Materials (CategoryName)
+"""
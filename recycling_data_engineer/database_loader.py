@@ -0,0 +1,367 @@
+import os
+import sys
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import bindparam, create_engine, text
+from sqlalchemy.engine import URL, Engine
+
+from .database_definitions import (
+    ADDRESS_COMPONENT_TABLE,
+    BUSINESS_HOURS_TABLE,
+    BUSINESS_MATERIALS_TABLE,
+    BUSINESS_SERVICES_TABLE,
+    BUSINESS_TABLE,
+    MATERIALS_TABLE
+)
+from .existing_materials import EXISTING_MATERIALS
+from .migrations import migrate, sqlite_ddl
+from .reporting_engineer import (
+    BUSINESS_CHILD_TABLES,
+    SERVICE_NAME,
+    SOFT_DELETE_USER,
+    business_material_matches,
+    content_hash,
+    content_hashes,
+    iter_json_records,
+    parse_opening_hours,
+    service_description
+)
+from .seed_materials import generate_materials_seed_sql
+
+# Table definitions in dependency order
+ALL_TABLES = [
+    MATERIALS_TABLE,
+    BUSINESS_TABLE,
+    ADDRESS_COMPONENT_TABLE,
+    BUSINESS_HOURS_TABLE,
+    BUSINESS_MATERIALS_TABLE,
+    BUSINESS_SERVICES_TABLE
+]
+
+def database_url_from_env() -> URL:
+    """Build the database URL from DATABASE_URL or the DB_* settings in .env"""
+    if os.getenv('DATABASE_URL'):
+        return os.getenv('DATABASE_URL')
+    return URL.create(
+        'mssql+pyodbc',
+        username=os.getenv('DB_USERNAME'),
+        password=os.getenv('DB_PASSWORD'),
+        host=os.getenv('DB_SERVER'),
+        database=os.getenv('DB_DATABASE'),
+        query={'driver': os.getenv('DB_DRIVER', 'ODBC Driver 18 for SQL Server')}
+    )
+
+def batched(records: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def unique_places(batch: List[Dict]) -> List[Dict]:
+    """Keep one record per place within a batch; the last record wins"""
+    return list({record['place_id']: record for record in batch if record.get('place_id')}.values())
+
+def business_params(business: Dict) -> Dict:
+    """Bind parameters for a business's row in Businesses"""
+    return {
+        'name': business['name'],
+        'address': business['address'],
+        'lat': business['coordinates']['lat'],
+        'lng': business['coordinates']['lng'],
+        'phone': business.get('phone') or None,
+        'website': business.get('website') or None,
+        'rating': business.get('rating') or None,
+        'place_id': business['place_id'],
+        'service_keywords': ','.join(business.get('service_keywords', [])),
+        'content_hash': content_hash(business)
+    }
+
+class DatabaseLoader:
+    """Load businesses straight into the database with batched parameterized inserts.
+
+    SQL Server connections use pyodbc's fast_executemany through a pooled
+    SQLAlchemy engine. SQLite works too, with the schema built from
+    database_definitions, so loads can be tested and benchmarked locally.
+    """
+
+    def __init__(self, url=None, batch_size: Optional[int] = None, pool_size: Optional[int] = None,
+                 engine: Optional[Engine] = None):
+        self.batch_size = max(1, batch_size or int(os.getenv('DB_BATCH_SIZE', 500)))
+        if engine is None:
+            url = url or database_url_from_env()
+            if str(url).startswith('sqlite'):
+                engine = create_engine(url)
+            else:
+                engine = create_engine(
+                    url,
+                    fast_executemany=True,
+                    pool_size=pool_size or int(os.getenv('DB_POOL_SIZE', 5)),
+                    pool_pre_ping=True
+                )
+        self.engine = engine
+        self.is_sqlite = engine.dialect.name == 'sqlite'
+        # SQLite has no schemas, so its tables live unqualified
+        self.prefix = '' if self.is_sqlite else 'recycling.'
+
+    def table(self, name: str) -> str:
+        return f"{self.prefix}{name}"
+
+    def create_schema(self, indexes: bool = True) -> None:
+        """Create the tables in a local SQLite database, then migrate it to the latest version"""
+        if not self.is_sqlite:
+            raise ValueError("create_schema only builds local SQLite databases; "
+                             "SQL Server schemas are managed with database_definitions and migrations")
+        with self.engine.begin() as connection:
+            for ddl in ALL_TABLES:
+                connection.exec_driver_sql(sqlite_ddl(ddl))
+        if indexes:
+            migrate(self.engine)
+
+    def seed_materials(self) -> None:
+        """Load the material catalog with its fixed MaterialIDs"""
+        with self.engine.begin() as connection:
+            if self.is_sqlite:
+                self.remap_materials(connection)
+                connection.execute(
+                    # Updates existing rows like the SQL Server seed's MERGE does
+                    text("INSERT INTO Materials (MaterialID, CategoryName, Description, CO2Savings) "
+                         "VALUES (:MaterialID, :CategoryName, :Description, :CO2Savings) "
+                         "ON CONFLICT(MaterialID) DO UPDATE SET CategoryName = excluded.CategoryName, "
+                         "Description = excluded.Description, CO2Savings = excluded.CO2Savings"),
+                    EXISTING_MATERIALS
+                )
+            else:
+                connection.exec_driver_sql(generate_materials_seed_sql())
+
+    def remap_materials(self, connection) -> Dict[int, int]:
+        """Move existing materials off the catalog's fixed IDs, as the SQL Server seed script does.
+
+        A material whose Description is in the catalog under another ID
+        takes the catalog's ID; any other material on a catalog ID gets a
+        new one. BusinessMaterials rows follow their material. Returns
+        {old ID: new ID}.
+        """
+        catalog_ids = {mat['Description']: mat['MaterialID'] for mat in EXISTING_MATERIALS}
+        catalog_descriptions = {mat['MaterialID']: mat['Description'] for mat in EXISTING_MATERIALS}
+        rows = connection.execute(text(f"SELECT MaterialID, Description FROM {self.table('Materials')}")).all()
+        next_id = max([material_id for material_id, _ in rows] + list(catalog_descriptions)) + 1
+
+        moves = {}
+        for material_id, description in rows:
+            if catalog_descriptions.get(material_id) == description:
+                continue
+            if description in catalog_ids:
+                moves[material_id] = catalog_ids[description]
+            elif material_id in catalog_descriptions:
+                moves[material_id] = next_id
+                next_id += 1
+        if not moves:
+            return moves
+
+        # Park the moved rows on negative IDs first so no move collides with another
+        for step in ({old: -old for old in moves}, {-old: new for old, new in moves.items()}):
+            for table in ('Materials', 'BusinessMaterials'):
+                connection.execute(
+                    text(f"UPDATE {self.table(table)} SET MaterialID = :new WHERE MaterialID = :old"),
+                    [{'old': old, 'new': new} for old, new in step.items()]
+                )
+        return moves
+
+    def load(self, records: Iterable[Dict]) -> int:
+        """Insert businesses and their hours, materials and services, returning how many were loaded"""
+        loaded = 0
+        for batch in batched(records, self.batch_size):
+            batch = unique_places(batch)
+            if batch:
+                with self.engine.begin() as connection:
+                    self.insert_businesses(connection, batch)
+                    self.insert_children(connection, batch, self.business_ids(connection, batch))
+                loaded += len(batch)
+                print(f"Loaded {loaded} businesses")
+        return loaded
+
+    def fetch_content_hashes(self, place_ids: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """Return {PlaceID: ContentHash} for active businesses, optionally only the given places"""
+        query = f"SELECT PlaceID, ContentHash FROM {self.table('Businesses')} WHERE IsActive = 1"
+        with self.engine.connect() as connection:
+            if place_ids is None:
+                return dict(connection.execute(text(query)).all())
+            hashes = {}
+            for chunk in batched(place_ids, self.batch_size):
+                hashes.update(connection.execute(
+                    text(query + " AND PlaceID IN :place_ids").bindparams(bindparam('place_ids', expanding=True)),
+                    {'place_ids': chunk}
+                ).all())
+            return hashes
+
+    def upsert(self, records: Iterable[Dict], existing_hashes: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+        """Load only new or changed businesses, keyed by PlaceID and compared by content hash.
+
+        existing_hashes ({PlaceID: ContentHash}) describes what the previous
+        load of this area stored; businesses in it that are missing from
+        records are soft-deleted. Without it, stored hashes are looked up per
+        batch and nothing is deleted.
+        """
+        stats = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'deleted': 0}
+        seen = set()
+        for batch in batched(records, self.batch_size):
+            batch = unique_places(batch)
+            seen.update(business['place_id'] for business in batch)
+            known = existing_hashes if existing_hashes is not None else \
+                self.fetch_content_hashes(business['place_id'] for business in batch)
+            changed = [business for business in batch if known.get(business['place_id']) != content_hash(business)]
+            stats['unchanged'] += len(batch) - len(changed)
+            if not changed:
+                continue
+
+            with self.engine.begin() as connection:
+                # Stored rows are updated in place, even if soft-deleted or
+                # outside existing_hashes; everything else is inserted
+                stored = self.business_ids(connection, changed)
+                updates = [business for business in changed if business['place_id'] in stored]
+                inserts = [business for business in changed if business['place_id'] not in stored]
+                if updates:
+                    connection.execute(
+                        text(f"UPDATE {self.table('Businesses')} SET "
+                             "Name = :name, FormattedAddress = :address, Latitude = :lat, Longitude = :lng, "
+                             "PhoneNumber = :phone, Website = :website, Rating = :rating, "
+                             "ServiceKeywords = :service_keywords, ContentHash = :content_hash, "
+                             "IsActive = 1, DeletedAt = NULL, DeletedBy = NULL, LastUpdated = CURRENT_TIMESTAMP "
+                             "WHERE PlaceID = :place_id"),
+                        [business_params(business) for business in updates]
+                    )
+                    updated_ids = [stored[business['place_id']] for business in updates]
+                    for table in BUSINESS_CHILD_TABLES:
+                        connection.execute(
+                            text(f"DELETE FROM {self.table(table)} WHERE BusinessID IN :business_ids")
+                            .bindparams(bindparam('business_ids', expanding=True)),
+                            {'business_ids': updated_ids}
+                        )
+                if inserts:
+                    self.insert_businesses(connection, inserts)
+                self.insert_children(connection, changed, self.business_ids(connection, changed))
+
+            stats['updated'] += len(updates)
+            stats['inserted'] += len(inserts)
+
+        if existing_hashes is not None:
+            missing = [place_id for place_id in existing_hashes if place_id not in seen]
+            stats['deleted'] = self.soft_delete(missing)
+
+        print(f"Upserted businesses: {stats}")
+        return stats
+
+    def soft_delete(self, place_ids: List[str]) -> int:
+        """Mark businesses inactive through IsActive/DeletedAt, returning how many changed"""
+        deleted = 0
+        for chunk in batched(place_ids, self.batch_size):
+            with self.engine.begin() as connection:
+                deleted += connection.execute(
+                    text(f"UPDATE {self.table('Businesses')} "
+                         "SET IsActive = 0, DeletedAt = CURRENT_TIMESTAMP, DeletedBy = :deleted_by "
+                         "WHERE IsActive = 1 AND PlaceID IN :place_ids")
+                    .bindparams(bindparam('place_ids', expanding=True)),
+                    {'deleted_by': SOFT_DELETE_USER, 'place_ids': chunk}
+                ).rowcount
+        return deleted
+
+    def insert_businesses(self, connection, batch: List[Dict]) -> None:
+        connection.execute(
+            text(f"INSERT INTO {self.table('Businesses')} "
+                 "(Name, FormattedAddress, Latitude, Longitude, PhoneNumber, Website, Rating, PlaceID, "
+                 "ServiceKeywords, ContentHash) "
+                 "VALUES (:name, :address, :lat, :lng, :phone, :website, :rating, :place_id, "
+                 ":service_keywords, :content_hash)"),
+            [business_params(business) for business in batch]
+        )
+
+    def business_ids(self, connection, batch: List[Dict]) -> Dict[str, int]:
+        """Map the batch's places to their BusinessIDs"""
+        return dict(connection.execute(
+            text(f"SELECT PlaceID, MAX(BusinessID) FROM {self.table('Businesses')} "
+                 "WHERE PlaceID IN :place_ids GROUP BY PlaceID").bindparams(bindparam('place_ids', expanding=True)),
+            {'place_ids': [business['place_id'] for business in batch]}
+        ).all())
+
+    def insert_children(self, connection, batch: List[Dict], business_ids: Dict[str, int]) -> None:
+        addresses, hours, materials, services = [], [], [], []
+        for business in batch:
+            business_id = business_ids[business['place_id']]
+            components = business.get('address_components', {})
+            addresses.append({
+                'business_id': business_id,
+                'street': components.get('route') or None,
+                'city': components.get('postal_town', ''),
+                'state': components.get('administrative_area_level_1', ''),
+                'postal_code': components.get('postal_code', ''),
+                'country': components.get('country', '')
+            })
+            for day_num, open_time, close_time, is_closed in parse_opening_hours(business.get('opening_hours', [])):
+                hours.append({
+                    'business_id': business_id,
+                    'day': day_num,
+                    'open_time': open_time,
+                    'close_time': close_time,
+                    'is_closed': 1 if is_closed else 0
+                })
+            for material_id, category, description in business_material_matches(business):
+                materials.append({
+                    'business_id': business_id,
+                    'material_id': material_id,
+                    'category': category,
+                    'description': description
+                })
+            services.append({
+                'business_id': business_id,
+                'service_name': SERVICE_NAME,
+                'description': service_description(business)
+            })
+
+        statements = [
+            (f"INSERT INTO {self.table('AddressComponents')} "
+             "(BusinessID, StreetAddress, City, State, PostalCode, Country) "
+             "VALUES (:business_id, :street, :city, :state, :postal_code, :country)", addresses),
+            (f"INSERT INTO {self.table('BusinessHours')} "
+             "(BusinessID, DayOfWeek, OpenTime, CloseTime, IsClosed) "
+             "VALUES (:business_id, :day, :open_time, :close_time, :is_closed)", hours),
+            (f"INSERT INTO {self.table('BusinessMaterials')} "
+             "(BusinessID, MaterialID, CategoryName, Description, IsVerified) "
+             "VALUES (:business_id, :material_id, :category, :description, 1)", materials),
+            (f"INSERT INTO {self.table('BusinessServices')} "
+             "(BusinessID, ServiceName, Description) "
+             "VALUES (:business_id, :service_name, :description)", services)
+        ]
+        for statement, rows in statements:
+            if rows:
+                connection.execute(text(statement), rows)
+
+def load_json_file(json_file: str, previous_file: Optional[str] = None) -> Dict[str, int]:
+    """Load a results file into the database configured by the environment."""
+    loader = DatabaseLoader()
+    if loader.is_sqlite:
+        loader.create_schema()
+    loader.seed_materials()
+
+    # A previous run's JSON for the same area lets businesses that
+    # disappeared since then be soft-deleted
+    existing_hashes = content_hashes(iter_json_records(previous_file)) if previous_file else None
+    return loader.upsert(iter_json_records(json_file), existing_hashes)
+
+def main():
+    try:
+        if len(sys.argv) not in (2, 3):
+            print("Usage: python -m recycling_data_engineer.database_loader <businesses.json|jsonl> [previous.json]")
+            sys.exit(1)
+
+        stats = load_json_file(sys.argv[1], sys.argv[2] if len(sys.argv) == 3 else None)
+        print(f"Loaded businesses into the database: {stats}")
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
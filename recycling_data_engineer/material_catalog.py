@@ -0,0 +1,103 @@
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .existing_materials import EXISTING_MATERIALS
+from recycling_business_finder.material_keywords import LABEL_MATCHER, KeywordMatcher
+
+# Generic catalog entries used when a keyword names a category but no specific material
+CATEGORY_FALLBACKS = {
+    'plastic': 'Mixed Plastics',
+    'paper': 'Mixed Paper (general)'
+}
+
+# Metal keywords that fall back to the generic metal entry
+MIXED_METAL_KEYWORDS = ('iron', 'steel')
+
+# Results each catalog remembers per lookup; the same few keyword sets
+# repeat across a city, but a long run must not grow the memos forever
+MATCH_CACHE_SIZE = 4096
+
+class MaterialCatalog:
+    """Precomputed lookups for matching business materials against the catalog.
+
+    Built once per catalog: descriptions are indexed by their lowercase form,
+    registry keywords by category, and match results are kept in LRU caches
+    of MATCH_CACHE_SIZE entries each.
+    """
+
+    def __init__(self, materials: List[Dict], matcher: KeywordMatcher = LABEL_MATCHER):
+        self.materials = materials
+        self.matcher = matcher
+
+        self.by_description = {}
+        for mat in materials:
+            self.by_description.setdefault(mat['Description'].lower(), (mat['CategoryName'], mat['Description']))
+        self.ids = {mat['Description']: mat['MaterialID'] for mat in materials if 'MaterialID' in mat}
+        self.category_names = {mat['CategoryName'] for mat in materials}
+
+        # Keyword -> first category in registry order, the same answer
+        # matcher.first_category gives for a bare keyword
+        self.keyword_categories = {}
+        for category, keywords in matcher.registry.items():
+            for keyword in keywords:
+                self.keyword_categories.setdefault(keyword.lower(), category)
+
+        self._first_category = lru_cache(maxsize=MATCH_CACHE_SIZE)(matcher.first_category)
+        self._best_match = lru_cache(maxsize=MATCH_CACHE_SIZE)(self._find_best_match)
+        self._match = lru_cache(maxsize=MATCH_CACHE_SIZE)(self._find_matches)
+
+    def category_of(self, material: str) -> Optional[str]:
+        """Return the first material category mentioned in a keyword or phrase"""
+        key = material.lower()
+        if key in self.keyword_categories:
+            return self.keyword_categories[key]
+        return self._first_category(material)
+
+    def best_match(self, material: str, category: str) -> Optional[Tuple[str, str]]:
+        """Return (CategoryName, Description) for a material keyword, or None"""
+        if not material:
+            return None
+        return self._best_match(material, category)
+
+    def _find_best_match(self, material: str, category: str) -> Optional[Tuple[str, str]]:
+        material_lower = material.lower()
+        match = self.by_description.get(material_lower)
+        if match is None and category in self.category_names:
+            if category == 'metal' and material_lower in MIXED_METAL_KEYWORDS:
+                match = ('metal', 'Mixed Metals')
+            elif category in CATEGORY_FALLBACKS:
+                match = (category, CATEGORY_FALLBACKS[category])
+        return match
+
+    def match(self, materials: Iterable[str], website_materials: Dict[str, List[str]]) -> List[Tuple[str, str]]:
+        """Return the distinct (CategoryName, Description) pairs for a business's materials"""
+        return list(self._match(
+            tuple(materials),
+            tuple((category, tuple(keywords)) for category, keywords in website_materials.items())
+        ))
+
+    def _find_matches(self, materials: Tuple[str, ...], website_materials: Tuple) -> Tuple[Tuple[str, str], ...]:
+        matched = set()
+        for material in materials:
+            category = self.category_of(material)
+            if category:
+                match = self.best_match(material, category)
+                if match:
+                    matched.add(match)
+        for category, keywords in website_materials:
+            for material in keywords:
+                match = self.best_match(material, category)
+                if match:
+                    matched.add(match)
+
+        return tuple(matched)
+
+    def material_matches(self, materials: Iterable[str], website_materials: Dict[str, List[str]]) -> List[Tuple[int, str, str]]:
+        """Return sorted (MaterialID, CategoryName, Description) for the matched catalog entries"""
+        return sorted(
+            (self.ids[description], category, description)
+            for category, description in self.match(materials, website_materials)
+            if description in self.ids
+        )
+
+DEFAULT_CATALOG = MaterialCatalog(EXISTING_MATERIALS)
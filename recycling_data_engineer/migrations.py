@@ -0,0 +1,178 @@
+import re
+import sys
+from typing import List, Optional, Tuple
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Engine
+
+from .database_definitions import (
+    ADDRESS_COMPONENT_BUSINESS_INDEX,
+    BUSINESS_HOURS_BUSINESS_INDEX,
+    BUSINESS_LOCATION_INDEX,
+    BUSINESS_MATERIALS_MATERIAL_INDEX,
+    BUSINESS_PLACE_ID_INDEX,
+    BUSINESS_SERVICES_BUSINESS_INDEX,
+    MATERIALS_CATEGORY_INDEX,
+    SCHEMA_VERSION_TABLE
+)
+
+SCHEMA = 'recycling'
+
+# T-SQL to SQLite type and syntax translations, applied in order
+SQLITE_REPLACEMENTS = [
+    (r'CREATE TABLE recycling\.', 'CREATE TABLE IF NOT EXISTS '),
+    (r'recycling\.', ''),
+    (r'INT IDENTITY\(1,1\) PRIMARY KEY|INT PRIMARY KEY IDENTITY\(1,1\)', 'INTEGER PRIMARY KEY AUTOINCREMENT'),
+    (r'INT FOREIGN KEY REFERENCES', 'INTEGER REFERENCES'),
+    (r'N?(VAR)?CHAR\((\d+|MAX)\)', 'TEXT'),
+    (r'DATETIME2', 'TEXT'),
+    (r'SYSUTCDATETIME\(\)', 'CURRENT_TIMESTAMP'),
+    (r'DECIMAL\(\d+, \d+\)', 'REAL'),
+    (r'\b(TINYINT|BIT|INT)\b', 'INTEGER'),
+    (r'\bTIME\b', 'TEXT'),
+    # SQLite has no included columns; appending them to the key still covers the query
+    (r'\)\s*INCLUDE \(([^)]*)\)', r', \1)')
+]
+
+def sqlite_ddl(ddl: str) -> str:
+    """Translate a T-SQL statement from database_definitions into SQLite"""
+    for pattern, replacement in SQLITE_REPLACEMENTS:
+        ddl = re.sub(pattern, replacement, ddl)
+    return ddl
+
+# PlaceIDs held by more than one row, left behind by repeated plain inserts
+DUPLICATE_PLACE_IDS = """
+SELECT PlaceID FROM recycling.Businesses
+WHERE PlaceID IS NOT NULL
+GROUP BY PlaceID
+HAVING COUNT(*) > 1
+ORDER BY PlaceID
+"""
+
+# Conflicting values listed in a failed precondition's error
+MAX_LISTED_CONFLICTS = 20
+
+class Migration:
+    """One schema version: columns to add, statements to run, then indexes to create.
+
+    Each step checks the live schema first, so re-running a migration against
+    a database that already has its columns or indexes is harmless. A
+    precondition is a (query, problem) pair; if the query returns any rows
+    the migration fails and lists them, leaving the data for an operator to
+    resolve.
+    """
+
+    def __init__(self, version: int, description: str,
+                 columns: Optional[List[Tuple[str, str, str]]] = None,
+                 statements: Optional[List[str]] = None,
+                 indexes: Optional[List[Tuple[str, str, str]]] = None,
+                 preconditions: Optional[List[Tuple[str, str]]] = None):
+        self.version = version
+        self.description = description
+        self.preconditions = preconditions or []
+        self.columns = columns or []        # (table, column, type)
+        self.statements = statements or []
+        self.indexes = indexes or []        # (table, index name, CREATE INDEX statement)
+
+MIGRATIONS = [
+    Migration(
+        1,
+        "Add Businesses.ContentHash for delta loads",
+        columns=[('Businesses', 'ContentHash', 'CHAR(64)')]
+    ),
+    Migration(
+        2,
+        "Index PlaceID",
+        preconditions=[(DUPLICATE_PLACE_IDS, "PlaceIDs held by more than one Businesses row")],
+        indexes=[('Businesses', 'UX_Businesses_PlaceID', BUSINESS_PLACE_ID_INDEX)]
+    ),
+    Migration(
+        3,
+        "Index business locations, foreign keys and material lookups",
+        indexes=[
+            ('Businesses', 'IX_Businesses_Location', BUSINESS_LOCATION_INDEX),
+            ('AddressComponents', 'IX_AddressComponents_BusinessID', ADDRESS_COMPONENT_BUSINESS_INDEX),
+            ('BusinessHours', 'IX_BusinessHours_BusinessID', BUSINESS_HOURS_BUSINESS_INDEX),
+            ('BusinessServices', 'IX_BusinessServices_BusinessID', BUSINESS_SERVICES_BUSINESS_INDEX),
+            ('BusinessMaterials', 'IX_BusinessMaterials_MaterialID', BUSINESS_MATERIALS_MATERIAL_INDEX),
+            ('Materials', 'IX_Materials_CategoryName', MATERIALS_CATEGORY_INDEX)
+        ]
+    )
+]
+
+def applied_versions(engine: Engine) -> List[int]:
+    """Return the schema versions already recorded in SchemaVersion"""
+    is_sqlite = engine.dialect.name == 'sqlite'
+    schema = None if is_sqlite else SCHEMA
+    with engine.connect() as connection:
+        if not inspect(connection).has_table('SchemaVersion', schema=schema):
+            return []
+        table = 'SchemaVersion' if is_sqlite else f'{SCHEMA}.SchemaVersion'
+        return sorted(connection.execute(text(f"SELECT Version FROM {table}")).scalars())
+
+def migrate(engine: Engine, target: Optional[int] = None) -> List[int]:
+    """Apply every pending migration up to target in its own transaction, returning the versions applied"""
+    is_sqlite = engine.dialect.name == 'sqlite'
+    schema = None if is_sqlite else SCHEMA
+    prefix = '' if is_sqlite else f'{SCHEMA}.'
+
+    def translate(statement):
+        return sqlite_ddl(statement) if is_sqlite else statement
+
+    with engine.begin() as connection:
+        if not inspect(connection).has_table('SchemaVersion', schema=schema):
+            connection.exec_driver_sql(translate(SCHEMA_VERSION_TABLE))
+
+    done = set(applied_versions(engine))
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version in done or (target is not None and migration.version > target):
+            continue
+
+        with engine.begin() as connection:
+            for query, problem in migration.preconditions:
+                conflicts = [str(value) for value in connection.exec_driver_sql(translate(query)).scalars()]
+                if conflicts:
+                    listed = ', '.join(conflicts[:MAX_LISTED_CONFLICTS])
+                    more = f" and {len(conflicts) - MAX_LISTED_CONFLICTS} more" if len(conflicts) > MAX_LISTED_CONFLICTS else ''
+                    raise ValueError(
+                        f"Migration {migration.version} ({migration.description}) cannot run: "
+                        f"{len(conflicts)} {problem}: {listed}{more}"
+                    )
+
+            inspector = inspect(connection)
+            for table, column, column_type in migration.columns:
+                existing = {col['name'] for col in inspector.get_columns(table, schema=schema)}
+                if column not in existing:
+                    connection.exec_driver_sql(
+                        translate(f"ALTER TABLE {prefix}{table} ADD {column} {column_type}")
+                    )
+            for statement in migration.statements:
+                connection.exec_driver_sql(translate(statement))
+            for table, name, ddl in migration.indexes:
+                if name not in {index['name'] for index in inspector.get_indexes(table, schema=schema)}:
+                    connection.exec_driver_sql(translate(ddl))
+            connection.execute(
+                text(f"INSERT INTO {prefix}SchemaVersion (Version, Description) VALUES (:version, :description)"),
+                {'version': migration.version, 'description': migration.description}
+            )
+
+        print(f"Applied migration {migration.version}: {migration.description}")
+        applied.append(migration.version)
+    return applied
+
+def main():
+    try:
+        # Imported here because the loader itself builds on this module
+        from .database_loader import database_url_from_env
+
+        target = int(sys.argv[1]) if len(sys.argv) > 1 else None
+        applied = migrate(create_engine(database_url_from_env()), target)
+        print(f"Applied {len(applied)} migrations" if applied else "Schema is up to date")
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
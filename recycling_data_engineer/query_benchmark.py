@@ -0,0 +1,129 @@
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, Iterator, List, Tuple
+
+from sqlalchemy import text
+
+from .database_loader import DatabaseLoader
+from .existing_materials import EXISTING_MATERIALS
+from recycling_business_finder.material_keywords import MATERIAL_MATCHER
+
+# Synthetic businesses are scattered over roughly the area of Greater London
+CENTER = (51.5074, -0.1278)
+SPREAD = 0.25
+
+# Typical API lookups, each taking its parameters from the synthetic dataset
+QUERIES = {
+    'by_place_id': """
+        SELECT BusinessID, Name, ContentHash FROM Businesses
+        WHERE PlaceID = :place_id
+    """,
+    'by_material': """
+        SELECT b.BusinessID, b.Name FROM BusinessMaterials m
+        JOIN Businesses b ON b.BusinessID = m.BusinessID
+        WHERE m.MaterialID = :material_id AND b.IsActive = 1
+    """,
+    'by_bounding_box': """
+        SELECT PlaceID, Name, Latitude, Longitude FROM Businesses
+        WHERE Latitude BETWEEN :south AND :north
+        AND Longitude BETWEEN :west AND :east
+        AND IsActive = 1
+    """
+}
+
+def synthetic_businesses(count: int, seed: int = 0) -> Iterator[Dict]:
+    """Yield reproducible business records shaped like the finder's output"""
+    rng = random.Random(seed)
+    categories = list(MATERIAL_MATCHER.registry)
+    for i in range(count):
+        materials = rng.sample(categories, rng.randint(1, 3))
+        yield {
+            'name': f"Synthetic Recycling {i}",
+            'address': f"{i} Synthetic Street, London",
+            'coordinates': {
+                'lat': round(CENTER[0] + rng.uniform(-SPREAD, SPREAD), 7),
+                'lng': round(CENTER[1] + rng.uniform(-SPREAD, SPREAD), 7)
+            },
+            'place_id': f"synthetic-{i}",
+            'materials': materials,
+            'website_materials': {
+                category: MATERIAL_MATCHER.registry[category][:2] for category in materials
+            },
+            'phone': None,
+            'website': None,
+            'rating': round(rng.uniform(1, 5), 1),
+            'opening_hours': ['Monday: 9:00 AM – 5:00 PM', 'Sunday: Closed'],
+            'service_keywords': [],
+            'address_components': {'postal_town': 'London', 'country': 'United Kingdom'}
+        }
+
+def query_parameters(count: int, samples: int, seed: int = 1) -> Dict[str, List[Dict]]:
+    """Random parameters for each query in QUERIES"""
+    rng = random.Random(seed)
+    material_ids = [mat['MaterialID'] for mat in EXISTING_MATERIALS]
+    boxes = []
+    for _ in range(samples):
+        # Roughly a 1km square somewhere in the dataset's area
+        lat = CENTER[0] + rng.uniform(-SPREAD, SPREAD)
+        lng = CENTER[1] + rng.uniform(-SPREAD, SPREAD)
+        boxes.append({'south': lat - 0.0045, 'north': lat + 0.0045, 'west': lng - 0.0072, 'east': lng + 0.0072})
+    return {
+        'by_place_id': [{'place_id': f"synthetic-{rng.randrange(count)}"} for _ in range(samples)],
+        'by_material': [{'material_id': rng.choice(material_ids)} for _ in range(samples)],
+        'by_bounding_box': boxes
+    }
+
+def build_database(path: str, count: int, indexes: bool) -> DatabaseLoader:
+    """Load the synthetic dataset into a SQLite database, with or without the migrated indexes"""
+    loader = DatabaseLoader(f"sqlite:///{path}", batch_size=1000)
+    loader.create_schema(indexes=indexes)
+    loader.seed_materials()
+    loader.load(synthetic_businesses(count))
+    return loader
+
+def time_queries(loader: DatabaseLoader, parameters: Dict[str, List[Dict]]) -> Dict[str, float]:
+    """Average seconds per execution of each query"""
+    timings = {}
+    with loader.engine.connect() as connection:
+        for name, query in QUERIES.items():
+            statement = text(query)
+            start = time.perf_counter()
+            for params in parameters[name]:
+                connection.execute(statement, params).all()
+            timings[name] = (time.perf_counter() - start) / len(parameters[name])
+    return timings
+
+def query_plan(loader: DatabaseLoader, name: str, params: Dict) -> str:
+    """SQLite's query plan for one of QUERIES"""
+    with loader.engine.connect() as connection:
+        rows = connection.execute(text(f"EXPLAIN QUERY PLAN {QUERIES[name]}"), params).all()
+    return "\n".join(row[-1] for row in rows)
+
+def run_benchmark(count: int = 20000, samples: int = 200) -> Dict[str, Tuple[float, float]]:
+    """Time every query without and with the indexes, returning {query: (before, after)} in seconds"""
+    parameters = query_parameters(count, samples)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        timings = []
+        for indexes in (False, True):
+            loader = build_database(os.path.join(directory, f"bench_{indexes}.db"), count, indexes)
+            timings.append(time_queries(loader, parameters))
+            loader.engine.dispose()
+        for name in QUERIES:
+            results[name] = (timings[0][name], timings[1][name])
+    return results
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    results = run_benchmark(count)
+
+    print(f"\nQuery timings over {count} synthetic businesses (ms per query)")
+    print(f"{'query':<18}{'no indexes':>12}{'indexed':>12}{'speedup':>10}")
+    for name, (before, after) in results.items():
+        print(f"{name:<18}{before * 1000:>12.3f}{after * 1000:>12.3f}{before / after:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,22 @@
 import os
+import sys
 import json
-from datetime import datetime
-from dotenv import load_dotenv
-from typing import Dict, List, Tuple, Optional
+import hashlib
+import logging
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 from .database_definitions import *
 from .existing_materials import EXISTING_MATERIALS
+from .material_catalog import DEFAULT_CATALOG, MaterialCatalog
+from recycling_business_finder.geo import Bounds
+from recycling_business_finder.instrumentation import INSTRUMENTATION
+from recycling_business_finder.json_lines import open_text
+
+logger = logging.getLogger(__name__)
+
+# Catalog MaterialIDs by Description, so inserts need no lookup against recycling.Materials
+MATERIAL_IDS = DEFAULT_CATALOG.ids
 
 def clean_time_string(time_str: str) -> str:
     """Clean and normalize time string"""
@@ -19,299 +31,458 @@ def clean_time_string(time_str: str) -> str:
     
     return time_str
 
+DAYS_MAP = {
+    'Monday': 1, 'Tuesday': 2, 'Wednesday': 3, 'Thursday': 4,
+    'Friday': 5, 'Saturday': 6, 'Sunday': 0
+}
+
+def time_pattern(name: str) -> str:
+    """Regex for one clock time such as "9:00 AM", "9 pm", "17:30" or "9:00 AM AM", with named groups"""
+    return (rf'(?P<{name}_hour>\d{{1,2}})(?::(?P<{name}_minute>\d{{2}}))?'
+            rf'(?:\s*(?P<{name}_meridiem>[AaPp])\.?\s*[Mm]\.?(?:\s*[AaPp]\.?\s*[Mm]\.?)*)?')
+
+# Google separates times with an en dash, often padded with thin or
+# no-break spaces, which \s matches along with ordinary spaces
+TIME_PATTERN = re.compile(rf'\s*{time_pattern("time")}\s*')
+RANGE_PATTERN = re.compile(rf'\s*{time_pattern("open")}\s*[–—-]\s*{time_pattern("close")}\s*')
+DAY_PATTERN = re.compile(r'\s*(\w+)\s*:\s*(.*?)\s*', re.DOTALL)
+RANGE_SEPARATOR = re.compile(r'\s*,\s*')
+
+def to_minutes(hour: str, minute: Optional[str], meridiem: Optional[str]) -> Optional[int]:
+    """Minutes after midnight for a clock time; without a meridiem the hour is on the 24-hour clock"""
+    hour, minute = int(hour), int(minute or 0)
+    if minute > 59:
+        return None
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        return (hour % 12 + (12 if meridiem.upper() == 'P' else 0)) * 60 + minute
+    if hour == 24 and minute == 0:
+        return 24 * 60 - 1
+    return hour * 60 + minute if hour < 24 else None
+
+def format_minutes(minutes: int) -> str:
+    """SQL TIME literal for minutes after midnight; 23:59 stands for end of day"""
+    if minutes == 24 * 60 - 1:
+        return '23:59:59'
+    return f"{minutes // 60:02d}:{minutes % 60:02d}:00"
+
 def convert_time_format(time_str: str) -> Optional[str]:
     """Convert 12-hour time format to 24-hour SQL format"""
     if not time_str:
         return None
-    
-    try:
-        # Clean the time string
-        time_str = clean_time_string(time_str)
-        
-        # Add AM/PM if missing
-        if ' AM' not in time_str and ' PM' not in time_str:
-            hour = int(time_str.split(':')[0])
-            time_str = f"{time_str} {'AM' if hour < 12 else 'PM'}"
-        
-        # Parse and convert to 24-hour format
-        parsed_time = datetime.strptime(time_str, '%I:%M %p')
-        return parsed_time.strftime('%H:%M:00')
-    except ValueError as e:
-        print(f"Time conversion error for '{time_str}': {str(e)}")
+
+    match = TIME_PATTERN.fullmatch(time_str)
+    minutes = to_minutes(match['time_hour'], match['time_minute'], match['time_meridiem']) if match else None
+    if minutes is None:
+        logger.warning("Could not convert time %r", time_str)
+        return None
+    return format_minutes(minutes)
+
+def parse_time_range(times: str) -> Optional[Tuple[str, str]]:
+    """Parse "9:00 AM – 5:00 PM" style ranges into SQL open and close times.
+
+    A time missing its AM/PM takes the other time's, unless that would put
+    the opening after the closing ("9 – 5 PM" opens at 9 AM, "11 – 1 AM"
+    at 11 PM). Ranges without any AM/PM are read as 24-hour times.
+    """
+    match = RANGE_PATTERN.fullmatch(times)
+    if not match:
         return None
 
+    open_meridiem, close_meridiem = match['open_meridiem'], match['close_meridiem']
+    flip = {'A': 'P', 'P': 'A'}
+    if close_meridiem and not open_meridiem:
+        close_minutes = to_minutes(match['close_hour'], match['close_minute'], close_meridiem)
+        open_meridiem = close_meridiem.upper()
+        open_minutes = to_minutes(match['open_hour'], match['open_minute'], open_meridiem)
+        if open_minutes is not None and close_minutes is not None and open_minutes > close_minutes:
+            open_meridiem = flip[open_meridiem]
+    elif open_meridiem and not close_meridiem:
+        open_minutes = to_minutes(match['open_hour'], match['open_minute'], open_meridiem)
+        close_meridiem = open_meridiem.upper()
+        close_minutes = to_minutes(match['close_hour'], match['close_minute'], close_meridiem)
+        if open_minutes is not None and close_minutes is not None and close_minutes <= open_minutes:
+            close_meridiem = flip[close_meridiem]
+
+    open_minutes = to_minutes(match['open_hour'], match['open_minute'], open_meridiem)
+    close_minutes = to_minutes(match['close_hour'], match['close_minute'], close_meridiem)
+    if open_minutes is None or close_minutes is None:
+        return None
+    return format_minutes(open_minutes), format_minutes(close_minutes)
+
+@lru_cache(maxsize=4096)
+def parse_hours_line(hour: str) -> Tuple[Tuple, ...]:
+    """Parse one weekday_text line into (day, open, close, is_closed) rows, one per time range.
+
+    Cities repeat the same few lines thousands of times, so results (and
+    their warnings) are cached on the raw string.
+    """
+    match = DAY_PATTERN.fullmatch(hour)
+    day_num = DAYS_MAP.get(match[1].capitalize()) if match else None
+    if day_num is None:
+        logger.warning("Error parsing hours: %r has no recognised day", hour)
+        return ()
+
+    times = match[2]
+    if times.lower() == 'closed':
+        return ((day_num, None, None, True),)
+    if times.lower() == 'open 24 hours':
+        return ((day_num, '00:00:00', '23:59:59', False),)
+
+    rows = []
+    for time_range in RANGE_SEPARATOR.split(times):
+        parsed = parse_time_range(time_range)
+        if parsed:
+            rows.append((day_num, parsed[0], parsed[1], False))
+        else:
+            logger.warning("Could not parse times %r in %r", time_range, hour)
+    return tuple(rows)
+
+@INSTRUMENTATION.timed('hours_parse')
 def parse_opening_hours(hours_list: List[str]) -> List[Tuple]:
     """Convert opening hours from JSON format to structured data"""
-    days_map = {
-        'Monday': 1, 'Tuesday': 2, 'Wednesday': 3, 'Thursday': 4,
-        'Friday': 5, 'Saturday': 6, 'Sunday': 0
-    }
     parsed_hours = []
-    
     for hour in hours_list:
-        if not hour:
-            continue
-        try:
-            # Split day and times
-            day, times = hour.split(': ', 1)
-            day_num = days_map[day]
-            
-            if times.lower() == 'closed':
-                parsed_hours.append((day_num, None, None, True))
-                continue
-            
-            # Handle 24-hour format
-            if times.lower() == 'open 24 hours':
-                parsed_hours.append((day_num, '00:00:00', '23:59:59', False))
-                continue
-            
-            # Split and clean times
-            if '–' in times:
-                open_time, close_time = times.split('–')
-            elif ' - ' in times:
-                open_time, close_time = times.split(' - ')
-            else:
-                open_time, close_time = times.split('-')
-            
-            # Clean times
-            open_time = clean_time_string(open_time)
-            close_time = clean_time_string(close_time)
-            
-            # Handle AM/PM inheritance
-            if ' AM' in close_time and ' AM' not in open_time and ' PM' not in open_time:
-                open_time += ' AM'
-            elif ' PM' in close_time and ' AM' not in open_time and ' PM' not in open_time:
-                # Check if opening hour should be AM
-                open_hour = int(open_time.split(':')[0])
-                close_hour = int(close_time.split(':')[0])
-                if open_hour < close_hour or close_hour == 12:
-                    open_time += ' AM'
-                else:
-                    open_time += ' PM'
-            
-            # Convert to SQL format
-            sql_open_time = convert_time_format(open_time)
-            sql_close_time = convert_time_format(close_time)
-            
-            if sql_open_time and sql_close_time:
-                parsed_hours.append((day_num, sql_open_time, sql_close_time, False))
-            else:
-                print(f"Warning: Could not parse times for {day}: {open_time} - {close_time}")
-                print(f"Original format: {times}")
-                print(f"Cleaned format: {open_time} - {close_time}")
-                print(f"Converted: open={sql_open_time}, close={sql_close_time}")
-                
-        except (ValueError, KeyError) as e:
-            print(f"Warning: Error parsing hours: {hour}. Error: {str(e)}")
-            continue
-    
+        if hour:
+            parsed_hours.extend(parse_hours_line(hour))
     return parsed_hours
 
+@INSTRUMENTATION.timed('material_match')
 def match_materials(materials: List[str], website_materials: Dict, existing_materials: List[Dict]) -> List[Tuple]:
     """Enhanced material matching with fuzzy matching and category mapping"""
-    matched_materials = []  # Initialize the list here
-    material_categories = {
-        'metal': [
-            'iron', 'steel', 'aluminum', 'copper', 'scrap', 'metal', 'tin', 
-            'brass', 'bronze', 'zinc', 'lead', 'ferrous', 'non-ferrous',
-            'cans', 'wire', 'ingot'
-        ],
-        'plastic': [
-            'plastic', 'pp', 'ps', 'pet', 'pvc', 'hdpe', 'ldpe', 'lldpe',
-            'polypropylene', 'polystyrene', 'polyethylene', 'polyvinyl',
-            'bottles', 'containers', 'packaging', 'pla', 'bioplastic'
-        ],
-        'textile': [
-            'clothing', 'clothes', 'fabric', 'textile', 'garments', 'apparel',
-            'fashion', 'wool', 'cotton', 'polyester', 'nylon', 'linen',
-            'denim', 'silk', 'leather'
-        ],
-        'paper': [
-            'paper', 'cardboard', 'carton', 'newspaper', 'magazine', 'mail',
-            'book', 'phonebook', 'office paper', 'printing paper', 'corrugated',
-            'packaging', 'box', 'document', 'catalog', 'envelope', 'receipt'
-        ],
-        'glass': [
-            'glass', 'bottle', 'jar', 'window', 'mirror', 'container',
-            'glassware', 'windscreen', 'windshield', 'pane', 'cullet'
-        ]
+    catalog = DEFAULT_CATALOG if existing_materials is EXISTING_MATERIALS else MaterialCatalog(existing_materials)
+    return catalog.match(materials, website_materials)
+
+SERVICE_NAME = "Recycling Collection"
+
+@INSTRUMENTATION.timed('material_match')
+def business_material_matches(business: Dict) -> List[Tuple[int, str, str]]:
+    """Return (MaterialID, category, description) for each catalog material a business handles"""
+    return DEFAULT_CATALOG.material_matches(
+        business.get('materials', []),
+        business.get('website_materials', {})
+    )
+
+def service_description(business: Dict) -> str:
+    """Describe the recycling service a business offers"""
+    materials_list = business.get('materials', [])
+    return (f"Recycling services for {', '.join(materials_list)}" 
+            if materials_list else "General recycling services")
+
+SQL_HEADER = [
+    "SET NOCOUNT ON;",
+    "SET XACT_ABORT ON;",
+    "DECLARE @ErrorLog TABLE (BusinessName NVARCHAR(255), ErrorMessage NVARCHAR(MAX));",
+    "BEGIN TRY",
+    "    BEGIN TRANSACTION;"
+]
+
+SQL_FOOTER = [
+    "    COMMIT TRANSACTION;",
+    "    SELECT * FROM @ErrorLog WHERE ErrorMessage IS NOT NULL;",
+    "END TRY",
+    "BEGIN CATCH",
+    "    IF @@TRANCOUNT > 0",
+    "        ROLLBACK TRANSACTION;",
+    "    SELECT * FROM @ErrorLog WHERE ErrorMessage IS NOT NULL;",
+    "    THROW;",
+    "END CATCH"
+]
+
+# DeletedBy value recorded when a delta load soft-deletes a business
+SOFT_DELETE_USER = "recycling_services_researcher"
+
+# Table variable collecting the PlaceIDs a delta script has merged
+SEEN_PLACE_IDS = "@SeenPlaceIDs"
+
+# Child tables cleared before a changed business's rows are re-inserted
+BUSINESS_CHILD_TABLES = ["AddressComponents", "BusinessHours", "BusinessMaterials", "BusinessServices"]
+
+# List fields whose order carries no meaning; they may come from sets
+UNORDERED_FIELDS = ('materials', 'service_keywords')
+
+def canonical_record(business: Dict) -> Dict:
+    """The business with its unordered lists sorted, so equal records hash equally"""
+    record = dict(business)
+    for field in UNORDERED_FIELDS:
+        if isinstance(record.get(field), list):
+            record[field] = sorted(record[field], key=str)
+    if isinstance(record.get('website_materials'), dict):
+        record['website_materials'] = {
+            category: sorted(keywords, key=str) if isinstance(keywords, list) else keywords
+            for category, keywords in record['website_materials'].items()
+        }
+    return record
+
+def content_hash(business: Dict) -> str:
+    """SHA-256 of a business record, stable across key order and set iteration order"""
+    payload = json.dumps(canonical_record(business), sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def content_hashes(json_data: Iterable[Dict]) -> Dict[str, str]:
+    """Map each record's place_id to its content hash, e.g. from a previous run's JSON"""
+    return {business['place_id']: content_hash(business) for business in json_data if business.get('place_id')}
+
+def sql_escape(value: str) -> str:
+    """Escape single quotes for a T-SQL string literal"""
+    return value.replace("'", "''")
+
+def business_sql_values(business: Dict) -> Dict[str, str]:
+    """SQL literals for a business's recycling.Businesses columns"""
+    return {
+        'Name': f"'{sql_escape(business['name'])}'",
+        'FormattedAddress': f"'{sql_escape(business['address'])}'",
+        'Latitude': str(business['coordinates']['lat']),
+        'Longitude': str(business['coordinates']['lng']),
+        'PhoneNumber': f"'{business['phone']}'" if business.get('phone') else 'NULL',
+        'Website': f"'{business['website']}'" if business.get('website') else 'NULL',
+        'Rating': str(business['rating']) if business.get('rating') else 'NULL',
+        'PlaceID': f"'{business['place_id']}'",
+        'ServiceKeywords': f"'{sql_escape(','.join(business.get('service_keywords', [])))}'",
+        'ContentHash': f"'{content_hash(business)}'"
     }
-    
-    # Create lookup dictionaries
-    category_lookup = {mat['CategoryName']: [] for mat in existing_materials}
-    for mat in existing_materials:
-        category_lookup[mat['CategoryName']].append(mat['Description'].lower())
-    
-    def find_best_match(material: str, category: str) -> Optional[Tuple[str, str]]:
-        if not material:
-            return None
-        material_lower = material.lower()
-        
-        # Direct match
-        for mat in existing_materials:
-            if mat['Description'].lower() == material_lower:
-                return (mat['CategoryName'], mat['Description'])
-        
-        # Category match
-        if category in category_lookup:
-            if category == 'metal' and material_lower in ['iron', 'steel']:
-                return ('metal', 'Mixed Metals')
-            elif category == 'plastic':
-                return ('plastic', 'Mixed Plastics')
-            elif category == 'paper':
-                return ('paper', 'Mixed Paper (general)')
-        
-        return None
 
-    # Process materials from both sources
-    for material in materials:
-        category = next((cat for cat, keywords in material_categories.items() 
-                        if any(keyword in material.lower() for keyword in keywords)), None)
-        if category:
-            match = find_best_match(material, category)
-            if match:
-                matched_materials.append(match)
-    
-    # Process website_materials
-    for category, materials_list in website_materials.items():
-        for material in materials_list:
-            match = find_best_match(material, category)
-            if match:
-                matched_materials.append(match)
-    
-    return list(set(matched_materials))
+def business_sql_statements(i: int, business: Dict, upsert: bool = False) -> List[str]:
+    """Generate the SQL statements inserting one business and its related rows.
 
-def generate_sql_statements(json_data: List[Dict]) -> str:
-    """Generate SQL insert statements with proper transaction handling"""
-    sql_statements = [
-        "SET NOCOUNT ON;",
-        "SET XACT_ABORT ON;",
-        "DECLARE @ErrorLog TABLE (BusinessName NVARCHAR(255), ErrorMessage NVARCHAR(MAX));",
-        "BEGIN TRY",
-        "    BEGIN TRANSACTION;"
-    ]
-    
-    for i, business in enumerate(json_data):
-        # Use unique variable name for each business
-        business_id_var = f"@BusinessID_{i}"
-        
-        sql_statements.append(f"""
-        BEGIN TRY
-            DECLARE {business_id_var} INT;
-            
-            INSERT INTO recycling.Businesses (
-                Name, FormattedAddress, Latitude, Longitude, PhoneNumber, 
-                Website, Rating, PlaceID, ServiceKeywords
-            ) VALUES (
-                '{business['name'].replace("'", "''")}',
-                '{business['address'].replace("'", "''")}',
-                {business['coordinates']['lat']},
-                {business['coordinates']['lng']},
-                {f"'{business['phone']}'" if business.get('phone') else 'NULL'},
-                {f"'{business['website']}'" if business.get('website') else 'NULL'},
-                {business['rating'] if business.get('rating') else 'NULL'},
-                '{business['place_id']}',
-                '{','.join(business.get('service_keywords', [])).replace("'", "''")}'
-            );
-            
-            SET {business_id_var} = SCOPE_IDENTITY();
-            
-            -- Address Components insert
-            INSERT INTO recycling.AddressComponents (
-                BusinessID, StreetAddress, City, State, PostalCode, Country
-            ) VALUES (
-                {business_id_var},
-                {f"'{business.get('address_components', {}).get('route', '')}'" if business.get('address_components', {}).get('route') else 'NULL'},
-                '{business.get('address_components', {}).get('postal_town', '')}',
-                '{business.get('address_components', {}).get('administrative_area_level_1', '')}',
-                '{business.get('address_components', {}).get('postal_code', '')}',
-                '{business.get('address_components', {}).get('country', '')}'
-            );
-        """)
-        
-        # Business Hours insert
-        hours = parse_opening_hours(business.get('opening_hours', []))
-        for day_num, open_time, close_time, is_closed in hours:
-            sql_statements.append(f"""
-            INSERT INTO recycling.BusinessHours (
-                BusinessID, DayOfWeek, OpenTime, CloseTime, IsClosed
-            ) VALUES (
-                {business_id_var}, {day_num},
-                {f"'{open_time}'" if open_time else 'NULL'},
-                {f"'{close_time}'" if close_time else 'NULL'},
-                {1 if is_closed else 0}
-            );
-            """)
-        
-        # Business Materials insert
-        materials = match_materials(
-            business.get('materials', []),
-            business.get('website_materials', {}),
-            EXISTING_MATERIALS
+    With upsert, the business row is merged on PlaceID. Only a new business,
+    one whose stored ContentHash differs, or a soft-deleted one (which is
+    reactivated) is written, and then its related rows are replaced.
+    """
+    business_statements = []
+    # Use unique variable name for each business
+    business_id_var = f"@BusinessID_{i}"
+    values = business_sql_values(business)
+
+    if upsert:
+        updates = ",\n                ".join(
+            f"{column} = source.{column}" for column in values if column != 'PlaceID'
+        )
+        deletes = "\n        ".join(
+            f"DELETE FROM recycling.{table} WHERE BusinessID = {business_id_var};"
+            for table in BUSINESS_CHILD_TABLES
         )
+        business_row = f"""
+        MERGE recycling.Businesses WITH (HOLDLOCK) AS target
+        USING (SELECT {', '.join(f"{value} AS {column}" for column, value in values.items())}) AS source
+        ON target.PlaceID = source.PlaceID
+        WHEN MATCHED AND (target.ContentHash IS NULL OR target.ContentHash <> source.ContentHash
+                          OR target.IsActive = 0) THEN UPDATE SET
+                {updates},
+                IsActive = 1,
+                DeletedAt = NULL,
+                DeletedBy = NULL,
+                LastUpdated = SYSUTCDATETIME()
+        WHEN NOT MATCHED THEN
+            INSERT ({', '.join(values)})
+            VALUES ({', '.join(f"source.{column}" for column in values)});
+
+        -- An unchanged business is left as it is
+        IF @@ROWCOUNT > 0
+        BEGIN
+        SELECT {business_id_var} = BusinessID FROM recycling.Businesses WHERE PlaceID = {values['PlaceID']};
+        {deletes}"""
+    else:
+        business_row = f"""
+        INSERT INTO recycling.Businesses (
+            {', '.join(values)}
+        ) VALUES (
+            {', '.join(values.values())}
+        );
         
-        for category, description in materials:
-            sql_statements.append(f"""
-            INSERT INTO recycling.BusinessMaterials (
-                BusinessID, MaterialID, CategoryName, Description, IsVerified
-            )
-            SELECT {business_id_var}, MaterialID, '{category}', '{description}', 1
-            FROM recycling.Materials
-            WHERE Description = '{description}';
-            """)
+        SET {business_id_var} = SCOPE_IDENTITY();"""
+
+    # A merged business is recorded even if it fails, so it is never soft-deleted
+    seen = f"INSERT INTO {SEEN_PLACE_IDS} (PlaceID) VALUES ({values['PlaceID']});" if upsert else ""
+    business_statements.append(f"""
+    {seen}
+    BEGIN TRY
+        DECLARE {business_id_var} INT;
+        {business_row}
         
-        # Business Services insert
-        materials_list = business.get('materials', [])
-        service_name = "Recycling Collection"
-        service_desc = (f"Recycling services for {', '.join(materials_list)}" 
-                       if materials_list else "General recycling services")
-            
-        sql_statements.append(f"""
-            INSERT INTO recycling.BusinessServices (
-                BusinessID, ServiceName, Description
-            ) VALUES (
-                {business_id_var},
-                '{service_name}',
-                '{service_desc.replace("'", "''")}'
-            );
-            
-        END TRY
-        BEGIN CATCH
-            INSERT INTO @ErrorLog (BusinessName, ErrorMessage)
-            VALUES ('{business['name'].replace("'", "''")}', ERROR_MESSAGE());
-        END CATCH
+        -- Address Components insert
+        INSERT INTO recycling.AddressComponents (
+            BusinessID, StreetAddress, City, State, PostalCode, Country
+        ) VALUES (
+            {business_id_var},
+            {f"'{business.get('address_components', {}).get('route', '')}'" if business.get('address_components', {}).get('route') else 'NULL'},
+            '{business.get('address_components', {}).get('postal_town', '')}',
+            '{business.get('address_components', {}).get('administrative_area_level_1', '')}',
+            '{business.get('address_components', {}).get('postal_code', '')}',
+            '{business.get('address_components', {}).get('country', '')}'
+        );
+    """)
+    
+    # Business Hours insert
+    hours = parse_opening_hours(business.get('opening_hours', []))
+    for day_num, open_time, close_time, is_closed in hours:
+        business_statements.append(f"""
+        INSERT INTO recycling.BusinessHours (
+            BusinessID, DayOfWeek, OpenTime, CloseTime, IsClosed
+        ) VALUES (
+            {business_id_var}, {day_num},
+            {f"'{open_time}'" if open_time else 'NULL'},
+            {f"'{close_time}'" if close_time else 'NULL'},
+            {1 if is_closed else 0}
+        );
         """)
     
-    # Final transaction handling
-    sql_statements.extend([
-        "    COMMIT TRANSACTION;",
-        "    SELECT * FROM @ErrorLog WHERE ErrorMessage IS NOT NULL;",
-        "END TRY",
-        "BEGIN CATCH",
-        "    IF @@TRANCOUNT > 0",
-        "        ROLLBACK TRANSACTION;",
-        "    SELECT * FROM @ErrorLog WHERE ErrorMessage IS NOT NULL;",
-        "    THROW;",
-        "END CATCH"
-    ])
+    # One multi-row Business Materials insert, using the catalog's fixed MaterialIDs
+    material_rows = []
+    for material_id, category, description in business_material_matches(business):
+        escaped_description = description.replace("'", "''")
+        material_rows.append(
+            f"({business_id_var}, {material_id}, '{category}', '{escaped_description}', 1)"
+        )
+    if material_rows:
+        separator = ",\n                "
+        business_statements.append(f"""
+        INSERT INTO recycling.BusinessMaterials (
+            BusinessID, MaterialID, CategoryName, Description, IsVerified
+        ) VALUES
+            {separator.join(material_rows)};
+        """)
+    
+    # Business Services insert
+    service_name = SERVICE_NAME
+    service_desc = service_description(business)
+        
+    business_statements.append(f"""
+        INSERT INTO recycling.BusinessServices (
+            BusinessID, ServiceName, Description
+        ) VALUES (
+            {business_id_var},
+            '{service_name}',
+            '{service_desc.replace("'", "''")}'
+        );
+        {"END" if upsert else ""}
+    END TRY
+    BEGIN CATCH
+        INSERT INTO @ErrorLog (BusinessName, ErrorMessage)
+        VALUES ('{business['name'].replace("'", "''")}', ERROR_MESSAGE());
+    END CATCH
+    """)
     
-    return "\n".join(sql_statements)
+    return business_statements
+
+def soft_delete_sql_statements(scope: Bounds) -> List[str]:
+    """Generate a statement marking businesses inactive instead of deleting them.
+
+    Only active businesses inside the scope, a (south, west, north, east)
+    box, that the script did not merge are affected.
+    """
+    south, west, north, east = scope
+    return [f"""
+    UPDATE recycling.Businesses
+    SET IsActive = 0, DeletedAt = SYSUTCDATETIME(), DeletedBy = '{SOFT_DELETE_USER}'
+    WHERE IsActive = 1
+        AND Latitude BETWEEN {south} AND {north}
+        AND Longitude BETWEEN {west} AND {east}
+        AND PlaceID NOT IN (SELECT PlaceID FROM {SEEN_PLACE_IDS});
+    """]
+
+def iter_sql_statements(json_data: Iterable[Dict], delta: bool = False) -> Iterator[str]:
+    """Yield the SQL script in chunks: the header, one chunk per business, then the footer.
+
+    With delta, each business is merged against the ContentHash stored in
+    the database, so only new or changed ones are written, and stored
+    businesses within the area covered by json_data that it no longer
+    contains are soft-deleted.
+    """
+    yield "\n".join(SQL_HEADER)
+    if not delta:
+        for i, business in enumerate(json_data):
+            yield "\n".join(business_sql_statements(i, business))
+    else:
+        yield f"    DECLARE {SEEN_PLACE_IDS} TABLE (PlaceID NVARCHAR(255) PRIMARY KEY WITH (IGNORE_DUP_KEY = ON));"
+        south = west = float('inf')
+        north = east = float('-inf')
+        for i, business in enumerate(json_data):
+            yield "\n".join(business_sql_statements(i, business, upsert=True))
+            lat, lng = business['coordinates']['lat'], business['coordinates']['lng']
+            south, north = min(south, lat), max(north, lat)
+            west, east = min(west, lng), max(east, lng)
+        if south <= north:
+            yield "\n".join(soft_delete_sql_statements((south, west, north, east)))
+    yield "\n".join(SQL_FOOTER)
+
+def generate_sql_statements(json_data: List[Dict], delta: bool = False) -> str:
+    """Generate SQL insert statements with proper transaction handling"""
+    return "\n".join(iter_sql_statements(json_data, delta))
+
+@INSTRUMENTATION.timed('sql_write')
+def write_sql_file(json_data: Iterable[Dict], file_name: str, delta: bool = False) -> int:
+    """Stream SQL statements for the businesses into file_name, returning how many were read"""
+    count = 0
+
+    def counted(records):
+        nonlocal count
+        for record in records:
+            count += 1
+            yield record
+
+    with open(file_name, "w", encoding="utf-8") as f:
+        for i, chunk in enumerate(iter_sql_statements(counted(json_data), delta)):
+            if i:
+                f.write("\n")
+            f.write(chunk)
+    return count
+
+def iter_json_records(file_name: str, chunk_size: int = 64 * 1024) -> Iterator[Dict]:
+    """Incrementally read business records from a JSON array or JSON Lines file.
+
+    Either may be gzip-compressed. Only one record (plus a read buffer) is
+    held in memory at a time.
+    """
+    with open_text(file_name) as f:
+        first_char = f.read(1)
+        while first_char and first_char.isspace():
+            first_char = f.read(1)
+
+        if first_char != "[":
+            # JSON Lines: one record per non-empty line
+            f.seek(0)
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        decoder = json.JSONDecoder()
+        buffer = ""
+        eof = False
+        while True:
+            buffer = buffer.lstrip().lstrip(",").lstrip()
+            if buffer.startswith("]"):
+                return
+            try:
+                record, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                # Most likely a record cut off by the end of the buffer
+                if eof:
+                    raise
+                more = f.read(chunk_size)
+                eof = not more
+                buffer += more
+                continue
+            yield record
+            buffer = buffer[end:]
 
 def main():
     try:
-        # Load JSON data
-        with open("middlesbrough_UK_20241119_055401.json", "r") as f:
-            json_data = json.load(f)
-        
-        # Generate SQL statements
-        sql_statements = generate_sql_statements(json_data)
+        json_file = sys.argv[1] if len(sys.argv) > 1 else "middlesbrough_UK_20241119_055401.json"
         
         # Save to file with unique name like city country combination
-        file_name = "middlesbrough_UK.sql"
-        with open(file_name, "w") as f:
-            f.write(sql_statements)
+        file_name = sys.argv[2] if len(sys.argv) > 2 else "middlesbrough_UK.sql"
+        
+        # --delta merges only new or changed businesses and soft-deletes
+        # those in the same area that are no longer found
+        delta = len(sys.argv) > 3 and sys.argv[3] == '--delta'
+        
+        # Stream records from the JSON file straight into the SQL file
+        count = write_sql_file(iter_json_records(json_file), file_name, delta)
         
-        print("SQL statements have been generated and saved to sql_statements.sql")
+        print(f"SQL statements for {count} businesses have been generated and saved to {file_name}")
         
     except Exception as e:
         print(f"Error: {str(e)}")
@@ -0,0 +1,84 @@
+import sys
+from typing import Dict, List
+from .existing_materials import EXISTING_MATERIALS
+
+def generate_materials_seed_sql(materials: List[Dict] = EXISTING_MATERIALS) -> str:
+    """Generate an idempotent script that loads the material catalog with its fixed MaterialIDs.
+
+    Databases seeded before the IDs were fixed hold IDENTITY-assigned IDs.
+    Materials whose Description is in the catalog under another ID are
+    moved onto the catalog's ID, other materials sitting on a catalog ID
+    are re-inserted under a new one, and BusinessMaterials rows follow
+    their material in both cases.
+    """
+    rows = []
+    for mat in materials:
+        description = mat['Description'].replace("'", "''")
+        rows.append(f"    ({mat['MaterialID']}, '{mat['CategoryName']}', '{description}', {mat['CO2Savings']})")
+
+    return "\n".join([
+        "SET NOCOUNT ON;",
+        "SET XACT_ABORT ON;",
+        "BEGIN TRANSACTION;",
+        "",
+        "CREATE TABLE #catalog (MaterialID INT PRIMARY KEY, CategoryName NVARCHAR(50),",
+        "                       Description NVARCHAR(500), CO2Savings DECIMAL(10, 2));",
+        "INSERT INTO #catalog (MaterialID, CategoryName, Description, CO2Savings) VALUES",
+        ",\n".join(rows) + ";",
+        "",
+        "-- Existing materials whose ID or Description clashes with the catalog;",
+        "-- NewID is the catalog ID of their Description, NULL if it has none",
+        "SELECT m.MaterialID AS OldID, m.CategoryName, m.Description, m.CO2Savings, c.MaterialID AS NewID",
+        "INTO #misplaced",
+        "FROM recycling.Materials m",
+        "LEFT JOIN #catalog c ON c.Description = m.Description",
+        "WHERE NOT EXISTS (SELECT 1 FROM #catalog x WHERE x.MaterialID = m.MaterialID AND x.Description = m.Description)",
+        "  AND (c.MaterialID IS NOT NULL OR m.MaterialID IN (SELECT MaterialID FROM #catalog));",
+        "",
+        "-- Set their business links aside so the materials can be moved",
+        "SELECT bm.* INTO #links",
+        "FROM recycling.BusinessMaterials bm",
+        "JOIN #misplaced mp ON mp.OldID = bm.MaterialID;",
+        "DELETE bm FROM recycling.BusinessMaterials bm JOIN #misplaced mp ON mp.OldID = bm.MaterialID;",
+        "DELETE m FROM recycling.Materials m JOIN #misplaced mp ON mp.OldID = m.MaterialID;",
+        "",
+        "SET IDENTITY_INSERT recycling.Materials ON;",
+        "MERGE recycling.Materials AS target",
+        "USING #catalog AS source",
+        "ON target.MaterialID = source.MaterialID",
+        "WHEN MATCHED THEN",
+        "    UPDATE SET CategoryName = source.CategoryName,",
+        "               Description = source.Description,",
+        "               CO2Savings = source.CO2Savings",
+        "WHEN NOT MATCHED BY TARGET THEN",
+        "    INSERT (MaterialID, CategoryName, Description, CO2Savings)",
+        "    VALUES (source.MaterialID, source.CategoryName, source.Description, source.CO2Savings);",
+        "SET IDENTITY_INSERT recycling.Materials OFF;",
+        "",
+        "-- Materials outside the catalog get a new ID of their own",
+        "CREATE TABLE #reinserted (MaterialID INT, Description NVARCHAR(500));",
+        "INSERT INTO recycling.Materials (CategoryName, Description, CO2Savings)",
+        "OUTPUT inserted.MaterialID, inserted.Description INTO #reinserted",
+        "SELECT CategoryName, Description, CO2Savings FROM #misplaced WHERE NewID IS NULL;",
+        "UPDATE mp SET NewID = r.MaterialID",
+        "FROM #misplaced mp JOIN #reinserted r ON r.Description = mp.Description",
+        "WHERE mp.NewID IS NULL;",
+        "",
+        "UPDATE l SET MaterialID = mp.NewID FROM #links l JOIN #misplaced mp ON mp.OldID = l.MaterialID;",
+        "INSERT INTO recycling.BusinessMaterials SELECT * FROM #links;",
+        "",
+        "DROP TABLE #links;",
+        "DROP TABLE #reinserted;",
+        "DROP TABLE #misplaced;",
+        "DROP TABLE #catalog;",
+        "COMMIT TRANSACTION;"
+    ])
+
+def main():
+    file_name = sys.argv[1] if len(sys.argv) > 1 else "seed_materials.sql"
+    with open(file_name, "w", encoding="utf-8") as f:
+        f.write(generate_materials_seed_sql())
+    print(f"Materials seed script saved to {file_name}")
+
+if __name__ == "__main__":
+    main()
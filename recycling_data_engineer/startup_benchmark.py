@@ -0,0 +1,109 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from .query_benchmark import synthetic_businesses
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(ROOT, 'recycling_services_researcher.py')
+
+# Modules a short command should never pay for
+HEAVY_MODULES = ('googlemaps', 'requests', 'bs4', 'sqlalchemy')
+
+def scenarios(json_file: str, sql_file: str) -> Dict[str, List[str]]:
+    """Command lines to time, from bare interpreter startup to a real SQL run"""
+    return {
+        'interpreter': ['-c', 'pass'],
+        'import': ['-c', 'import recycling_services_researcher'],
+        'help': [CLI, '--help'],
+        'sql': [CLI, 'sql', json_file, sql_file],
+        'finder_import': ['-c', 'import recycling_business_finder.recycling_business_finder']
+    }
+
+def benchmark_env() -> Dict[str, str]:
+    """The caller's environment without an API key, as SQL-only invocations run"""
+    env = {name: value for name, value in os.environ.items() if name != 'GOOGLE_API_KEY'}
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, env.get('PYTHONPATH')]))
+    return env
+
+def time_command(args: List[str], runs: int, env: Dict[str, str]) -> Dict[str, float]:
+    """Wall time of running the command in a fresh interpreter, in milliseconds"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {'median_ms': round(statistics.median(timings), 1), 'min_ms': round(min(timings), 1)}
+
+def imported_modules(args: List[str], env: Dict[str, str]) -> Dict:
+    """Heavy modules the command imports, and its slowest imports by cumulative time"""
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + args, cwd=ROOT, env=env, check=True,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package", nested imports indented
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        imports.append((module.strip(), int(cumulative)))
+    top_level = {module.split('.')[0] for module, _ in imports}
+    return {
+        'heavy_modules': [module for module in HEAVY_MODULES if module in top_level],
+        'slowest_imports_ms': {
+            module: round(microseconds / 1000, 1)
+            for module, microseconds in sorted(imports, key=lambda item: item[1], reverse=True)[:5]
+        }
+    }
+
+def run_benchmark(runs: int = 10, businesses: int = 20) -> Dict:
+    env = benchmark_env()
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        json_file = os.path.join(directory, 'benchmark.json')
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(list(synthetic_businesses(businesses)), f, ensure_ascii=False)
+        sql_file = os.path.join(directory, 'benchmark.sql')
+
+        for name, args in scenarios(json_file, sql_file).items():
+            results[name] = {**time_command(args, runs, env), **imported_modules(args, env)}
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'runs': runs,
+        'businesses': businesses,
+        'scenarios': results
+    }
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Measure how long short CLI invocations take to start")
+    parser.add_argument('--runs', type=int, default=10, help="invocations timed per scenario")
+    parser.add_argument('--businesses', type=int, default=20, help="records in the file the sql scenario converts")
+    parser.add_argument('--output', default=os.path.join('output', 'startup_benchmark.json'))
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(runs=args.runs, businesses=args.businesses)
+
+    print(f"{'scenario':<15}{'median ms':>11}{'min ms':>9}  heavy modules")
+    for name, scenario in results['scenarios'].items():
+        print(f"{name:<15}{scenario['median_ms']:>11.1f}{scenario['min_ms']:>9.1f}  "
+              f"{', '.join(scenario['heavy_modules']) or '-'}")
+
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+    print(f"Results saved to: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,71 +1,143 @@
 # recycling_service_manager.py
 
+import argparse
 import os
+import csv
 import json
+import logging
+import re
+import time
 from datetime import datetime
-from dotenv import load_dotenv
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, Collection, List, Dict, Optional, Tuple
 import sys
 
 # Add the project root to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from recycling_business_finder.recycling_business_finder import EnhancedRecyclingFinder
-from recycling_data_engineer.reporting_engineer import generate_sql_statements
+from recycling_business_finder.business_table import BusinessTable, dump_json
+from recycling_business_finder.checkpoint import SearchCheckpoint
+from recycling_business_finder.instrumentation import INSTRUMENTATION
+from recycling_business_finder.json_lines import JsonLinesRecords, JsonLinesWriter
 
-# Load environment variables
-load_dotenv()
+# googlemaps, requests, SQLAlchemy and the material matchers are imported only
+# by the code paths that use them, so short commands such as `sql` start fast
+if TYPE_CHECKING:
+    from recycling_business_finder.recycling_business_finder import EnhancedRecyclingFinder
 
-# Check the API key
-api_key = os.getenv('GOOGLE_API_KEY')
-print(f"Using Google API Key: {api_key}")
+logger = logging.getLogger(__name__)
 
 class RecyclingServiceManager:
-    def __init__(self):
+    def __init__(self, client=None):
+        # client replaces googlemaps.Client in every search, e.g. with a local fake
+        self.client = client
+        # Only searches need the key; it is checked when one starts
         self.api_key = os.getenv('GOOGLE_API_KEY')
-        if not self.api_key:
-            raise ValueError("GOOGLE_API_KEY environment variable is not set")
         
         self.json_data = None
         self.sql_statements = None
         self.json_filename = None
         self.sql_filename = None
+        self.checkpoint = None
+        # Search progress is recorded here so an interrupted run can resume;
+        # an empty value disables checkpoints
+        self.checkpoint_dir = os.getenv('CHECKPOINT_DIR', os.path.join('output', 'checkpoints'))
+        # Stage timings and counters of each run are saved next to its output;
+        # METRICS_TEXTFILE also writes them for node_exporter's textfile collector
+        self.metrics_filename = None
+        self.metrics_textfile = os.getenv('METRICS_TEXTFILE')
+        # "json" writes one indented array at the end; "jsonl" or "jsonl.gz"
+        # append each business to the file as soon as it is complete
+        self.output_format = os.getenv('OUTPUT_FORMAT', 'json').lower()
+        if self.output_format not in ('json', 'jsonl', 'jsonl.gz'):
+            raise ValueError(f"Unsupported OUTPUT_FORMAT: {self.output_format}")
+
+    def require_api_key(self) -> None:
+        # A replay answers every request from the response archive, so it needs no key
+        if not self.api_key and os.getenv('ARCHIVE_MODE', 'off').lower() != 'replay':
+            raise ValueError("GOOGLE_API_KEY environment variable is not set")
+
+    @property
+    def streaming(self) -> bool:
+        return self.output_format != 'json'
+
+    @staticmethod
+    def location_name(city: str, country: str) -> str:
+        """The city_country stem shared by a location's output files."""
+        return f"{city.replace(' ', '_').lower()}_{country.replace(' ', '_').lower()}"
 
     def generate_filenames(self, city: str, country: str) -> tuple:
         """Generate consistent filenames for both JSON and SQL files."""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        base_name = f"{city.replace(' ', '_').lower()}_{country.replace(' ', '_').lower()}"
+        base_name = self.location_name(city, country)
         
         # Create output directory if it doesn't exist
         output_dir = 'output'
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        os.makedirs(output_dir, exist_ok=True)  # Batch workers may race to create it
         
-        self.json_filename = os.path.join(output_dir, f"{base_name}_{timestamp}.json")
+        self.json_filename = os.path.join(output_dir, f"{base_name}_{timestamp}.{self.output_format}")
         self.sql_filename = os.path.join(output_dir, f"{base_name}.sql")
         return self.json_filename, self.sql_filename
 
-    def find_recycling_services(self, city: str, country: str) -> None:
-        """Find recycling services and store the results."""
+    def open_checkpoint(self, finder: 'EnhancedRecyclingFinder', city: str, country: str,
+                        coordinates: Optional[Tuple[float, float]] = None,
+                        bounds: Optional[Tuple[float, float, float, float]] = None) -> Optional[SearchCheckpoint]:
+        """Open the location's checkpoint, resuming it if it was written for the same search."""
+        # A replay is cheap and exists to re-run extraction, so it never resumes
+        if not self.checkpoint_dir or finder.replaying:
+            return None
+        self.checkpoint = SearchCheckpoint(os.path.join(self.checkpoint_dir, f"{self.location_name(city, country)}.jsonl"), {
+            'location': f"{city}, {country}",
+            'coordinates': coordinates,
+            'bounds': bounds,
+            'mode': finder.search_mode,
+            'radius': finder.search_radius,
+            'max_results': finder.max_results
+        })
+        return self.checkpoint
+
+    def find_recycling_services(self, city: str, country: str,
+                                coordinates: Optional[Tuple[float, float]] = None,
+                                bounds: Optional[Tuple[float, float, float, float]] = None) -> None:
+        """Find recycling services and store the results.
+
+        Explicit (lat, lng) coordinates or a (south, west, north, east)
+        bounding box skip the location lookup.
+        """
         try:
+            self.require_api_key()
+            from recycling_business_finder.recycling_business_finder import EnhancedRecyclingFinder
+
             location = f"{city}, {country}"
             print(f"Searching for recycling services in {location}...")
             
-            finder = EnhancedRecyclingFinder(self.api_key)
-            results = finder.search_businesses(location)
+            finder = EnhancedRecyclingFinder(self.api_key, client=self.client)
+            checkpoint = self.open_checkpoint(finder, city, country, coordinates, bounds)
+            try:
+                with INSTRUMENTATION.span('search'):
+                    if self.streaming:
+                        results = self.search_streaming(finder, city, country, coordinates, bounds)
+                    else:
+                        results = finder.search_businesses(location, coordinates=coordinates, bounds=bounds,
+                                                           checkpoint=checkpoint)
+            finally:
+                if checkpoint:
+                    checkpoint.close()
             
-            # Debugging: Check the results
-            print(f"Results from API: {results}")
+            logger.debug("Search for %s returned %d businesses", location, len(results))
+            INSTRUMENTATION.count('businesses', len(results))
             
             if not results:  # Check if results are empty
                 print("No results found from the API.")
                 self.json_data = []  # Initialize as empty list
                 return
             
-            self.json_data = [business.to_dict() for business in results]
+            # Streamed records stay on disk; otherwise columnar rows that read
+            # like to_dict(), releasing the business objects as they are converted
+            self.json_data = results if self.streaming else BusinessTable.consume(results)
             
-            # Generate filenames
-            self.generate_filenames(city, country)
+            # Generate filenames (streamed output already has them)
+            if not self.streaming:
+                self.generate_filenames(city, country)
             
             print(f"Found {len(self.json_data)} recycling businesses")
             
@@ -74,12 +146,36 @@ class RecyclingServiceManager:
             self.json_data = []  # Initialize as empty list in case of error
             raise
 
+    def search_streaming(self, finder: 'EnhancedRecyclingFinder', city: str, country: str,
+                         coordinates: Optional[Tuple[float, float]] = None,
+                         bounds: Optional[Tuple[float, float, float, float]] = None) -> Collection[Dict]:
+        """Search while appending each finished business to the JSON Lines output file.
+
+        The finder keeps no businesses of its own, so the records are returned
+        as a view of the file, counted by the writer.
+        """
+        self.generate_filenames(city, country)
+        with JsonLinesWriter(self.json_filename) as writer:
+            finder.search_businesses(
+                f"{city}, {country}",
+                coordinates=coordinates,
+                bounds=bounds,
+                on_business=lambda business: writer.write(business.to_dict()),
+                checkpoint=self.checkpoint,
+                keep_businesses=False
+            )
+        if not writer.count:
+            os.remove(self.json_filename)
+            return []
+        return JsonLinesRecords(self.json_filename, writer.count)
+
     def generate_sql(self) -> None:
         """Generate SQL statements from stored JSON data."""
         try:
             if not self.json_data:
                 raise ValueError("No JSON data available. Run find_recycling_services first.")
                 
+            from recycling_data_engineer.reporting_engineer import generate_sql_statements
             self.sql_statements = generate_sql_statements(self.json_data)
             
         except Exception as e:
@@ -90,10 +186,13 @@ class RecyclingServiceManager:
         """Save JSON data to file."""
         if not self.json_data or not self.json_filename:
             raise ValueError("No JSON data or filename available")
+        if self.streaming:
+            print(f"JSON Lines data already written to: {self.json_filename}")
+            return
         
         try:
-            with open(self.json_filename, 'w', encoding='utf-8') as f:
-                json.dump(self.json_data, f, indent=2, ensure_ascii=False)
+            with INSTRUMENTATION.span('json_write'), open(self.json_filename, 'w', encoding='utf-8') as f:
+                dump_json(self.json_data, f, indent=2)
             print(f"JSON data saved to: {self.json_filename}")
         except Exception as e:
             print(f"Error saving JSON data: {str(e)}")
@@ -112,11 +211,28 @@ class RecyclingServiceManager:
             print(f"Error saving SQL statements: {str(e)}")
             raise
 
-    def process_location(self, city: str, country: str) -> tuple:
+    def write_sql_statements(self) -> None:
+        """Stream SQL statements for the stored JSON data straight to the SQL file."""
+        if not self.json_data or not self.sql_filename:
+            raise ValueError("No JSON data or filename available")
+        
+        try:
+            from recycling_data_engineer.reporting_engineer import write_sql_file
+            # Streamed output is read back from disk rather than from memory
+            count = write_sql_file(self.json_data, self.sql_filename)
+            print(f"SQL statements for {count} businesses saved to: {self.sql_filename}")
+        except Exception as e:
+            print(f"Error saving SQL statements: {str(e)}")
+            raise
+
+    def process_location(self, city: str, country: str,
+                         coordinates: Optional[Tuple[float, float]] = None,
+                         bounds: Optional[Tuple[float, float, float, float]] = None) -> tuple:
         """Main method to process a location and return filenames."""
+        INSTRUMENTATION.reset()
         try:
             # Step 1: Find recycling services and generate filenames
-            self.find_recycling_services(city, country)
+            self.find_recycling_services(city, country, coordinates=coordinates, bounds=bounds)
             
             # Check if JSON data is available before processing
             if not self.json_data:  # Assuming json_data is the variable holding your JSON
@@ -126,11 +242,11 @@ class RecyclingServiceManager:
             # Step 2: Save JSON data
             self.save_json_data()
             
-            # Step 3: Generate SQL statements
-            self.generate_sql()
-            
-            # Step 4: Save SQL statements
-            self.save_sql_statements()
+            # Step 3: Generate SQL statements, writing them to disk as they are produced
+            self.write_sql_statements()
+
+            # The output is complete, so the next run starts a fresh search
+            self.remove_checkpoint()
             
             print(f"\nProcess completed successfully!")
             print(f"JSON data saved to: {self.json_filename}")
@@ -141,29 +257,242 @@ class RecyclingServiceManager:
         except Exception as e:
             print(f"Error processing location: {str(e)}")
             raise
+        finally:
+            self.save_metrics(city, country)
+
+    def save_metrics(self, city: str, country: str) -> None:
+        """Write the run's stage timings and counters, successful or not."""
+        if self.json_filename:
+            base_name = self.json_filename[:-len(self.output_format) - 1]
+        else:
+            # The search failed or found nothing, so there is no output file to sit next to
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            base_name = os.path.join('output', f"{self.location_name(city, country)}_{timestamp}")
+        self.metrics_filename = f"{base_name}.metrics.json"
+        try:
+            INSTRUMENTATION.write_json(self.metrics_filename, city=city, country=country)
+            if self.metrics_textfile:
+                # A {location} placeholder gives each batch location its own textfile
+                textfile = self.metrics_textfile.replace('{location}', self.location_name(city, country))
+                INSTRUMENTATION.write_prometheus(textfile, {'city': city, 'country': country})
+            INSTRUMENTATION.log_summary()
+        except OSError as e:
+            logger.warning("Could not save run metrics: %s", e)
+
+    def remove_checkpoint(self) -> None:
+        if self.checkpoint:
+            self.checkpoint.remove()
+            self.checkpoint = None
+
+def load_locations(path: str) -> List[Dict]:
+    """Load batch locations from a CSV file (city, country and optional lat, lng
+    columns) or a JSON list of objects with the same keys."""
+    if path.lower().endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+    else:
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
 
-def main():
+    locations = []
+    for row in rows:
+        location = {'city': row['city'].strip(), 'country': row['country'].strip()}
+        if row.get('lat') not in (None, '') and row.get('lng') not in (None, ''):
+            location['coordinates'] = (float(row['lat']), float(row['lng']))
+        locations.append(location)
+    return locations
+
+def process_batch_location(location: Dict) -> Dict:
+    """Process one batch location, reporting the outcome instead of raising."""
+    started = time.time()
+    report = {'city': location['city'], 'country': location['country']}
     try:
-        # Get city and country from command line arguments
-        if len(sys.argv) != 3:
-            print("Usage: python recycling_service_manager.py <city> <country>")
-            sys.exit(1)
-        
-        city = sys.argv[1]
-        country = sys.argv[2]
-        
-        # Initialize and run the manager
         manager = RecyclingServiceManager()
-        json_file, sql_file = manager.process_location(city, country)
-        
-        print(f"\nProcess completed successfully!")
-        print(f"JSON data saved to: {json_file}")
-        print(f"SQL statements saved to: {sql_file}")
-        
+        result = manager.process_location(
+            location['city'],
+            location['country'],
+            coordinates=location.get('coordinates')
+        )
+        if result:
+            report.update({
+                'status': 'success',
+                'businesses': len(manager.json_data),
+                'json_file': result[0],
+                'sql_file': result[1],
+                'metrics_file': manager.metrics_filename
+            })
+        else:
+            report.update({'status': 'empty', 'businesses': 0})
+    except Exception as e:
+        report.update({'status': 'failed', 'error': str(e)})
+
+    report['seconds'] = round(time.time() - started, 2)
+    return report
+
+def process_batch(locations: List[Dict], workers: Optional[int] = None, manifest_path: Optional[str] = None) -> Dict:
+    """Process many locations across a pool of worker processes.
+
+    Workers share the on-disk caches and split the rate limits between
+    them. The per-location reports are written to a manifest JSON file in
+    the output directory.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from recycling_business_finder.rate_limit import init_worker_rate_limiter
+
+    workers = max(1, workers or int(os.getenv('BATCH_WORKERS', os.cpu_count() or 1)))
+    started_at = datetime.now()
+    reports = [None] * len(locations)
+
+    if workers == 1:
+        for index, location in enumerate(locations):
+            reports[index] = process_batch_location(location)
+            print(f"[{index + 1}/{len(locations)}] {location['city']}, {location['country']}: {reports[index]['status']}")
+    else:
+        # The workers split GOOGLE_QPS and WEBSITE_HOST_RATE between them
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker_rate_limiter,
+                                 initargs=(workers,)) as executor:
+            futures = {
+                executor.submit(process_batch_location, location): index
+                for index, location in enumerate(locations)
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                index = futures[future]
+                reports[index] = future.result()
+                print(f"[{done}/{len(locations)}] {locations[index]['city']}, {locations[index]['country']}: {reports[index]['status']}")
+
+    manifest = {
+        'started_at': started_at.isoformat(),
+        'finished_at': datetime.now().isoformat(),
+        'workers': workers,
+        'succeeded': sum(1 for report in reports if report['status'] == 'success'),
+        'empty': sum(1 for report in reports if report['status'] == 'empty'),
+        'failed': sum(1 for report in reports if report['status'] == 'failed'),
+        'locations': reports
+    }
+
+    if not manifest_path:
+        os.makedirs('output', exist_ok=True)
+        manifest_path = os.path.join('output', f"batch_manifest_{started_at.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    manifest['manifest_file'] = manifest_path
+
+    return manifest
+
+
+COMMANDS = ('search', 'crawl', 'sql', 'load', 'batch')
+
+def sql_filename_for(json_file: str) -> str:
+    """The SQL file next to a results file, without the run timestamp."""
+    base_name = re.sub(r'(_\d{8}_\d{6})?\.jsonl?(\.gz)?$', '', json_file)
+    return f"{base_name}.sql"
+
+def run_search(args: argparse.Namespace) -> int:
+    manager = RecyclingServiceManager()
+    result = manager.process_location(
+        args.city,
+        args.country,
+        coordinates=tuple(args.coordinates) if args.coordinates else None,
+        bounds=tuple(args.bounds) if args.bounds else None
+    )
+    return 0 if result else 1
+
+def run_crawl(args: argparse.Namespace) -> int:
+    from recycling_business_finder.cache import HttpCache
+    from recycling_business_finder.html_text import extract_materials_from_html
+    from recycling_business_finder.rate_limit import shared_rate_limiter
+    from recycling_business_finder.website_crawler import WebsiteCrawler
+
+    cache = HttpCache() if int(os.getenv('HTTP_CACHE_MAX_BYTES', 1)) > 0 else None
+    crawler = WebsiteCrawler(cache=cache, rate_limiter=shared_rate_limiter())
+    try:
+        materials = crawler.crawl(args.urls, on_page=lambda url, html: extract_materials_from_html(html) if html else None)
+    finally:
+        crawler.close()
+    print(json.dumps(materials, indent=2, ensure_ascii=False))
+    return 0 if all(found is not None for found in materials.values()) else 1
+
+def run_sql(args: argparse.Namespace) -> int:
+    from recycling_data_engineer.reporting_engineer import iter_json_records, write_sql_file
+
+    sql_file = args.sql_file or sql_filename_for(args.json_file)
+    count = write_sql_file(iter_json_records(args.json_file), sql_file, delta=args.delta)
+    print(f"SQL statements for {count} businesses saved to: {sql_file}")
+    return 0
+
+def run_load(args: argparse.Namespace) -> int:
+    from recycling_data_engineer.database_loader import load_json_file
+
+    stats = load_json_file(args.json_file, args.previous)
+    print(f"Loaded businesses into the database: {stats}")
+    return 0
+
+def run_batch(args: argparse.Namespace) -> int:
+    manifest = process_batch(load_locations(args.locations), workers=args.workers)
+    print(f"\nBatch completed: {manifest['succeeded']} succeeded, "
+          f"{manifest['empty']} empty, {manifest['failed']} failed")
+    print(f"Manifest saved to: {manifest['manifest_file']}")
+    return 1 if manifest['failed'] else 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='recycling_services_researcher.py',
+        description="Find recycling businesses and turn them into SQL for the iRecycle database"
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    search = commands.add_parser('search', help="search a location and write JSON and SQL files")
+    search.add_argument('city')
+    search.add_argument('country')
+    search.add_argument('--coordinates', nargs=2, type=float, metavar=('LAT', 'LNG'),
+                        help="search around these coordinates instead of looking the location up")
+    search.add_argument('--bounds', nargs=4, type=float, metavar=('SOUTH', 'WEST', 'NORTH', 'EAST'),
+                        help="search this bounding box instead of looking the location up")
+    search.set_defaults(run=run_search)
+
+    crawl = commands.add_parser('crawl', help="fetch websites and print the materials they mention")
+    crawl.add_argument('urls', nargs='+')
+    crawl.set_defaults(run=run_crawl)
+
+    sql = commands.add_parser('sql', help="generate SQL from a JSON or JSON Lines results file")
+    sql.add_argument('json_file')
+    sql.add_argument('sql_file', nargs='?', help="defaults to the results file name with a .sql extension")
+    sql.add_argument('--delta', action='store_true',
+                     help="merge only businesses whose stored content hash differs and soft-delete those gone from the area")
+    sql.set_defaults(run=run_sql)
+
+    load = commands.add_parser('load', help="load a results file into the database")
+    load.add_argument('json_file')
+    load.add_argument('--previous', help="earlier results file, so businesses no longer found are soft-deleted")
+    load.set_defaults(run=run_load)
+
+    batch = commands.add_parser('batch', help="search every location in a CSV or JSON file")
+    batch.add_argument('locations')
+    batch.add_argument('--workers', type=int, help="worker processes (defaults to BATCH_WORKERS or the CPU count)")
+    batch.set_defaults(run=run_batch)
+
+    return parser
+
+def legacy_arguments(argv: List[str]) -> List[str]:
+    """Map the original `<city> <country>` and `--batch <file>` forms onto subcommands."""
+    if argv and argv[0] == '--batch':
+        return ['batch'] + argv[1:]
+    if len(argv) == 2 and argv[0] not in COMMANDS and not argv[0].startswith('-'):
+        return ['search'] + argv
+    return argv
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(legacy_arguments(sys.argv[1:] if argv is None else argv))
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper(),
+                        format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    try:
+        return args.run(args)
     except Exception as e:
         print(f"An error occurred: {str(e)}")
-        sys.exit(1)
+        return 1
 
 if __name__ == "__main__":
-    import sys
-    main()
\ No newline at end of file
+    sys.exit(main())
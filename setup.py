@@ -3,7 +3,8 @@ from setuptools import setup, find_packages
 setup(
     name="irecycle-digital-research",
     version="0.1.0",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
+    package_data={"recycling_business_finder": ["gazetteer.csv"]},
     install_requires=[
         "googlemaps>=4.10.0",
         "beautifulsoup4>=4.12.0",
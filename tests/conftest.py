@@ -8,11 +8,13 @@ from recycling_business_finder.recycling_business_finder import EnhancedRecyclin
 # Load environment variables
 load_dotenv()
 
+
 @pytest.fixture
 def api_key():
     """Provide API key for tests"""
     return os.getenv('GOOGLE_API_KEY')
 
+
 @pytest.fixture
 def mock_google_client(mocker):
     """Provide a mock Google Maps client"""
@@ -20,11 +22,13 @@ def mock_google_client(mocker):
     mocker.patch('googlemaps.Client', return_value=mock_client)
     return mock_client
 
+
 @pytest.fixture
 def manager(mock_google_client):
     """Create a RecyclingServiceManager instance with mocked dependencies"""
     return RecyclingServiceManager()
 
+
 @pytest.fixture
 def mock_geocode_response():
     """Provide mock geocode response"""
@@ -37,6 +41,7 @@ def mock_geocode_response():
         }
     }]
 
+
 @pytest.fixture
 def mock_places_response():
     """Provide mock places response"""
@@ -55,6 +60,7 @@ def mock_places_response():
         }]
     }
 
+
 @pytest.fixture
 def mock_place_details():
     """Provide mock place details response"""
@@ -74,4 +80,38 @@ def mock_place_details():
                 'types': ['locality']
             }]
         }
-    } 
\ No newline at end of file
+    }
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep the on-disk caches of every test in a temporary directory"""
+    monkeypatch.setenv('CACHE_DIR', str(tmp_path / 'cache'))
+    return tmp_path / 'cache'
+
+
+@pytest.fixture(autouse=True)
+def isolated_checkpoint_dir(tmp_path, monkeypatch):
+    """Keep search checkpoints out of the working directory"""
+    monkeypatch.setenv('CHECKPOINT_DIR', str(tmp_path / 'checkpoints'))
+    return tmp_path / 'checkpoints'
+
+
+@pytest.fixture(autouse=True)
+def fresh_rate_limiter(monkeypatch):
+    """Give every test its own process-wide rate limiter"""
+    monkeypatch.setattr('recycling_business_finder.rate_limit._shared_limiter', None)
+
+
+@pytest.fixture(autouse=True)
+def isolated_output_dir(tmp_path, monkeypatch):
+    """Run every test from a temporary directory so output/ files stay out of the repo"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / 'output'
+
+
+@pytest.fixture(autouse=True)
+def test_api_key(monkeypatch):
+    """Give every test a well-formed Google API key, so googlemaps clients build without a real one"""
+    monkeypatch.setenv('GOOGLE_API_KEY', 'AIza-test')
+    return 'AIza-test'
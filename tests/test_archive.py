@@ -0,0 +1,100 @@
+import requests
+from recycling_business_finder.archive import ArchiveCrawler, ResponseArchive
+from recycling_services_researcher import RecyclingServiceManager
+
+PAGE = '<html><body><p>We accept scrap metal, copper and plastic bottles.</p></body></html>'
+# Latin-1 bytes that are not valid UTF-8, so replay must use the recorded charset
+LATIN1_PAGE = '<html><body><p>Café: we accept scrap metal, copper and plastic bottles.</p></body></html>'
+
+class FakeResponse:
+    """A streamed requests response with a Latin-1 body"""
+    status_code = 200
+    ok = True
+    headers = {'Content-Type': 'text/html; charset=iso-8859-1', 'ETag': '"v1"'}
+
+    def iter_content(self, chunk_size):
+        body = LATIN1_PAGE.encode('latin-1')
+        return (body[i:i + chunk_size] for i in range(0, len(body), chunk_size))
+
+    def close(self):
+        pass
+
+def test_archive_stores_each_response_once(tmp_path):
+    """Test if identical responses share one compressed blob and keys are normalized"""
+    archive = ResponseArchive(str(tmp_path / 'responses.sqlite3'))
+    archive.put('website', 'https://Example.com/', PAGE.encode('utf-8') * 20)
+    archive.put('website', 'https://other.example.com/', PAGE.encode('utf-8') * 20)
+    archive.put_json('nearby', {'radius': 5000, 'location': (1.0, 2.0)}, {'results': []})
+
+    assert archive.get('website', 'https://example.com') == PAGE.encode('utf-8') * 20
+    assert archive.get_json('nearby', {'location': [1.0, 2.0], 'radius': 5000}) == {'results': []}
+    assert archive.get('details', 'missing') is None
+
+    stats = archive.stats()
+    assert stats['website'] == {'requests': 2, 'responses': 1}
+    assert stats['total']['responses'] == 2
+    assert stats['total']['stored_bytes'] < stats['total']['raw_bytes']
+
+def test_replay_reproduces_recorded_run(mocker, monkeypatch, tmp_path):
+    """Test if a replay rebuilds the same businesses and SQL from the archive without network access"""
+    monkeypatch.setenv('ARCHIVE_PATH', str(tmp_path / 'responses.sqlite3'))
+    monkeypatch.setenv('DETAILS_CACHE_MAX_AGE', '0')
+    monkeypatch.setenv('HTTP_CACHE_MAX_BYTES', '0')
+
+    monkeypatch.setenv('ARCHIVE_MODE', 'record')
+    mock_client = mocker.Mock()
+    mocker.patch('googlemaps.Client', return_value=mock_client)
+    mock_client.places_nearby.return_value = {'results': [
+        {'name': f'Metal Recycling {i}', 'place_id': f'id{i}', 'geometry': {'location': {'lat': 54.97, 'lng': -1.61}}}
+        for i in range(3)
+    ]}
+    mock_client.place.side_effect = lambda place_id, **kwargs: {'result': {
+        'formatted_address': f'{place_id} Test Street',
+        'website': f'https://{place_id}.example.com',
+        'opening_hours': {'weekday_text': ['Monday: 9:00 AM – 5:00 PM']}
+    }}
+    mocker.patch.object(requests.Session, 'get', return_value=FakeResponse())
+
+    recorder = RecyclingServiceManager()
+    recorder.find_recycling_services("Newcastle", "UK", coordinates=(54.97, -1.61))
+    recorded = list(recorder.json_data)
+    assert len(recorded) == 3
+
+    # Websites are archived as the raw bytes received, with their headers and charset
+    archive = ResponseArchive(str(tmp_path / 'responses.sqlite3'))
+    body, meta = archive.get_response('website', 'https://id0.example.com')
+    assert body == LATIN1_PAGE.encode('latin-1')
+    assert meta == {'status': 200, 'encoding': 'iso-8859-1',
+                    'headers': {'Content-Type': 'text/html; charset=iso-8859-1', 'ETag': '"v1"'}}
+    assert ArchiveCrawler(archive).fetch('https://id0.example.com') == LATIN1_PAGE
+
+    # Replay with no key, no Google client and no way to reach any website
+    monkeypatch.setenv('ARCHIVE_MODE', 'replay')
+    monkeypatch.delenv('GOOGLE_API_KEY', raising=False)
+    mocker.patch('googlemaps.Client', side_effect=AssertionError('Google must not be called'))
+    mocker.patch.object(requests.Session, 'get', side_effect=AssertionError('no network'))
+
+    manager = RecyclingServiceManager()
+    manager.process_location("Newcastle", "UK", coordinates=(54.97, -1.61))
+
+    key = lambda business: business['place_id']
+    assert sorted(manager.json_data, key=key) == sorted(recorded, key=key)
+    assert all('copper' in business['website_materials']['metal'] for business in manager.json_data)
+    with open(manager.sql_filename, encoding='utf-8') as f:
+        sql = f.read()
+    assert 'Metal Recycling 2' in sql
+
+def test_replay_bypasses_rate_limits(monkeypatch, tmp_path):
+    """Test if a replay never waits on a rate limit, per-endpoint GOOGLE_QPS_* overrides included"""
+    from recycling_business_finder.archive import ReplayClient
+    from recycling_business_finder.recycling_business_finder import EnhancedRecyclingFinder
+    monkeypatch.setenv('GOOGLE_QPS_PLACE', '0.001')
+    archive = ResponseArchive(str(tmp_path / 'responses.sqlite3'))
+    for i in range(3):
+        archive.put_json('details', f'id{i}', {'result': {'formatted_address': f'{i} Test Street'}})
+
+    finder = EnhancedRecyclingFinder(None, archive=archive, replay=True)
+    assert finder.rate_limiter is None
+    assert isinstance(finder.client, ReplayClient)
+    for i in range(3):
+        assert finder.client.place(f'id{i}')['result']['formatted_address'] == f'{i} Test Street'
@@ -0,0 +1,81 @@
+import io
+import json
+import pytest
+from recycling_business_finder.business_table import BusinessTable, dump_json
+from recycling_business_finder.json_lines import JsonLinesWriter
+from recycling_business_finder.recycling_business_finder import RecyclingBusiness
+
+@pytest.fixture
+def business():
+    """Create a populated recycling business"""
+    business = RecyclingBusiness(name="Test Recycling Center", address="123 Test Street, Newcastle, UK")
+    business.coordinates = {'lat': 54.97, 'lng': -1.61}
+    business.place_id = 'test123'
+    business.materials = ['plastic', 'metal']
+    business.website_materials = {'plastic': ['pet'], 'metal': ['steel']}
+    business.rating = 4.5
+    business.opening_hours = ['Monday: 9:00 AM – 5:00 PM', 'Sunday: Closed']
+    business.address_components = {'postal_town': 'Newcastle upon Tyne', 'country': 'United Kingdom'}
+    return business
+
+def test_recycling_business_is_slotted(business):
+    """Test if RecyclingBusiness stores attributes in slots instead of a per-instance dict"""
+    assert not hasattr(business, '__dict__')
+    with pytest.raises(AttributeError):
+        business.unknown_attribute = 1
+
+def test_table_rows_match_to_dict(business):
+    """Test if table rows are the same dicts RecyclingBusiness.to_dict returns"""
+    empty = RecyclingBusiness(name="Empty", address="No address")
+    table = BusinessTable([business, empty])
+    table.append(business.to_dict())
+
+    assert len(table) == 3
+    assert table[0] == business.to_dict()
+    assert table[1] == empty.to_dict()
+    assert table[-1] == business.to_dict()
+    assert list(table) == [business.to_dict(), empty.to_dict(), business.to_dict()]
+    with pytest.raises(IndexError):
+        table[3]
+
+def test_table_shares_repeated_values(business):
+    """Test if repeated opening hours and materials are stored once"""
+    table = BusinessTable([business, business.to_dict()])
+    assert table.opening_hours[0] is table.opening_hours[1]
+    assert table.website_materials[0] is table.website_materials[1]
+
+def test_dump_json_matches_json_dump(business):
+    """Test if streamed JSON output is identical to json.dump of the row list"""
+    table = BusinessTable([business, business])
+    expected = io.StringIO()
+    json.dump([business.to_dict(), business.to_dict()], expected, indent=2, ensure_ascii=False)
+    streamed = io.StringIO()
+
+    assert table.write_json(streamed) == 2
+    assert streamed.getvalue() == expected.getvalue()
+
+    empty = io.StringIO()
+    dump_json([], empty)
+    assert empty.getvalue() == '[]'
+
+def test_table_round_trips_to_dict(business, tmp_path):
+    """Test if rows round-trip to_dict exactly, keeping int ratings and matching the JSON Lines output"""
+    business.rating = 4
+    unrated = RecyclingBusiness(name="Unrated", address="No rating")
+    businesses = [business, unrated]
+    expected = [b.to_dict() for b in businesses]
+
+    table = BusinessTable.consume(businesses)
+    assert businesses == []
+    assert [dict(row) for row in table] == expected
+    assert table[0]['rating'] == 4 and isinstance(table[0]['rating'], int)
+    assert table[1]['rating'] is None
+    assert BusinessTable(table)[0] == expected[0]
+
+    with JsonLinesWriter(str(tmp_path / 'businesses.jsonl')) as writer:
+        for record in expected:
+            writer.write(record)
+    with open(tmp_path / 'businesses.jsonl', encoding='utf-8') as f:
+        written = [json.loads(line) for line in f]
+    assert json.loads(json.dumps(list(table), default=dict)) == written
+    assert '"rating": 4,' in json.dumps(table[0], default=dict)
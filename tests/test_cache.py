@@ -0,0 +1,74 @@
+import pytest
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from recycling_business_finder.cache import HttpCache, normalize_url
+from recycling_business_finder.website_crawler import WebsiteCrawler
+
+class _EtagHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append(self.headers.get('If-None-Match'))
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = b"<html><body>plastic and glass</body></html>"
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def etag_site():
+    """Serve a page that supports ETag revalidation"""
+    _EtagHandler.requests_seen = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _EtagHandler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+def test_normalize_url():
+    """Test if equivalent URLs share one cache key"""
+    assert normalize_url("HTTP://Example.COM:80") == "http://example.com/"
+    assert normalize_url("https://example.com/a?b=1#top") == "https://example.com/a?b=1"
+    assert normalize_url("http://example.com:8080/") == "http://example.com:8080/"
+
+def test_http_cache_lru_eviction(tmp_path):
+    """Test if the least recently used entries are evicted over the size budget"""
+    cache = HttpCache(str(tmp_path / 'http.sqlite3'), ttl=60, max_bytes=25)
+    cache.put("http://a.example", b"a" * 10)
+    cache.put("http://b.example", b"b" * 10)
+    cache.get("http://a.example")
+    cache.put("http://c.example", b"c" * 10)
+
+    assert cache.get("http://a.example") is not None
+    assert cache.get("http://b.example") is None
+    assert cache.get("http://c.example") is not None
+    assert cache.total_size() <= 25
+
+def test_crawler_serves_fresh_entries_from_cache(tmp_path, etag_site):
+    """Test if fresh entries are served without a network request"""
+    crawler = WebsiteCrawler(cache=HttpCache(str(tmp_path / 'http.sqlite3'), ttl=60))
+    first = crawler.fetch(etag_site)
+    second = crawler.fetch(etag_site)
+
+    assert first == second
+    assert len(_EtagHandler.requests_seen) == 1
+
+def test_crawler_revalidates_stale_entries(tmp_path, etag_site):
+    """Test if stale entries are revalidated with their ETag"""
+    crawler = WebsiteCrawler(cache=HttpCache(str(tmp_path / 'http.sqlite3'), ttl=0))
+    first = crawler.fetch(etag_site)
+    second = crawler.fetch(etag_site)
+
+    assert "plastic" in second
+    assert first == second
+    assert _EtagHandler.requests_seen == [None, '"v1"']
@@ -0,0 +1,86 @@
+import json
+from recycling_business_finder.checkpoint import SearchCheckpoint
+from recycling_business_finder.recycling_business_finder import EnhancedRecyclingFinder
+
+SEARCH = {'location': 'Test City, Test Country', 'coordinates': (1.0, 2.0), 'mode': 'radius'}
+
+def test_checkpoint_replays_events(tmp_path):
+    """Test if a reopened checkpoint restores its events and tolerates a torn last line"""
+    path = tmp_path / 'test_city.jsonl'
+    checkpoint = SearchCheckpoint(str(path), SEARCH)
+    checkpoint.record_location({'lat': 1.0, 'lng': 2.0, 'bounds': None, 'radius': 5000})
+    checkpoint.record_page([{'place_id': 'a'}], 'token-2')
+    checkpoint.record_business({'place_id': 'a', 'name': 'A'})
+    checkpoint.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"type":"busi')
+
+    resumed = SearchCheckpoint(str(path), SEARCH)
+    assert resumed.location['radius'] == 5000
+    assert resumed.pages == [[{'place_id': 'a'}]]
+    assert resumed.next_page_token == 'token-2'
+    assert not resumed.pages_done
+    assert list(resumed.businesses) == ['a']
+
+    # New events start on a fresh line after the torn one is dropped
+    resumed.record_page([], None)
+    resumed.close()
+    assert SearchCheckpoint(str(path), SEARCH).pages_done
+
+def test_checkpoint_discards_other_searches(tmp_path):
+    """Test if a checkpoint for different parameters or past its max age starts over"""
+    path = tmp_path / 'test_city.jsonl'
+    checkpoint = SearchCheckpoint(str(path), SEARCH)
+    checkpoint.record_business({'place_id': 'a'})
+    checkpoint.close()
+
+    other = SearchCheckpoint(str(path), dict(SEARCH, mode='tiled'))
+    assert other.businesses == {}
+    other.record_business({'place_id': 'b'})
+    other.close()
+
+    assert list(SearchCheckpoint(str(path), dict(SEARCH, mode='tiled')).businesses) == ['b']
+    assert SearchCheckpoint(str(path), dict(SEARCH, mode='tiled'), max_age=-1).businesses == {}
+    with open(path, encoding='utf-8') as f:
+        assert json.loads(f.readline())['search']['mode'] == 'tiled'
+
+def test_search_resumes_from_checkpoint(mocker, tmp_path):
+    """Test if a crashed search resumes without refetching finished places"""
+    mock_client = mocker.Mock()
+    mocker.patch('googlemaps.Client', return_value=mock_client)
+    mock_client.places_nearby.return_value = {'results': [
+        {'name': f'Place {i}', 'place_id': f'id{i}', 'geometry': {'location': {'lat': 0, 'lng': 0}}}
+        for i in range(4)
+    ]}
+    mock_client.place.side_effect = lambda place_id: {'result': {'formatted_address': f'{place_id} address'}}
+    path = str(tmp_path / 'test_city.jsonl')
+
+    finished = []
+
+    def crash_on_third(business):
+        if len(finished) == 2:
+            raise RuntimeError('killed')
+        finished.append(business.place_id)
+
+    checkpoint = SearchCheckpoint(path, SEARCH)
+    assert EnhancedRecyclingFinder('test-key').search_businesses(
+        "Test City, Test Country", coordinates=(1.0, 2.0), on_business=crash_on_third, checkpoint=checkpoint
+    ) == []
+    checkpoint.close()
+    assert mock_client.places_nearby.call_count == 1
+
+    # Details are cached too, so only count what the resumed run asks for
+    mocker.patch.object(EnhancedRecyclingFinder, 'get_place_details',
+                        side_effect=lambda place: {'formatted_address': f"{place['place_id']} address"})
+    resumed = []
+    checkpoint = SearchCheckpoint(path, SEARCH)
+    finder = EnhancedRecyclingFinder('test-key')
+    results = finder.search_businesses(
+        "Test City, Test Country", coordinates=(1.0, 2.0), on_business=resumed.append, checkpoint=checkpoint
+    )
+
+    assert mock_client.places_nearby.call_count == 1
+    assert [call.args[0]['place_id'] for call in finder.get_place_details.call_args_list] == ['id3']
+    assert sorted(business.place_id for business in results) == ['id0', 'id1', 'id2', 'id3']
+    assert sorted(business.place_id for business in resumed) == ['id0', 'id1', 'id2', 'id3']
+    assert results[0].address == 'id0 address'
@@ -0,0 +1,136 @@
+import pytest
+from sqlalchemy import text
+from recycling_data_engineer.database_loader import DatabaseLoader, sqlite_ddl
+from recycling_data_engineer.database_definitions import BUSINESS_HOURS_TABLE
+from recycling_data_engineer.existing_materials import EXISTING_MATERIALS
+from recycling_data_engineer.reporting_engineer import business_material_matches, content_hashes
+
+@pytest.fixture
+def sample_business():
+    """Provide a minimal business record as produced by the finder"""
+    return {
+        'name': "O'Brien Recycling",
+        'address': '1 Test Street',
+        'coordinates': {'lat': 54.97, 'lng': -1.61},
+        'place_id': 'test123',
+        'materials': ['plastic', 'paper'],
+        'website_materials': {'plastic': ['pet', 'hdpe'], 'paper': ['newspaper']},
+        'phone': None,
+        'website': None,
+        'rating': 4.5,
+        'opening_hours': ['Monday: 9:00 AM – 5:00 PM'],
+        'service_keywords': [],
+        'address_components': {'postal_town': 'Newcastle upon Tyne', 'country': 'United Kingdom'}
+    }
+
+@pytest.fixture
+def loader(tmp_path):
+    """Provide a loader backed by a fresh SQLite database"""
+    loader = DatabaseLoader(f"sqlite:///{tmp_path / 'recycling.db'}", batch_size=2)
+    loader.create_schema()
+    loader.seed_materials()
+    return loader
+
+def count(loader, table):
+    with loader.engine.connect() as connection:
+        return connection.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+
+def test_sqlite_ddl_translates_tsql():
+    """Test if T-SQL table definitions are translated for SQLite"""
+    ddl = sqlite_ddl(BUSINESS_HOURS_TABLE)
+    assert "CREATE TABLE IF NOT EXISTS BusinessHours" in ddl
+    assert "INTEGER PRIMARY KEY AUTOINCREMENT" in ddl
+    assert "recycling." not in ddl and "IDENTITY" not in ddl
+
+def test_seed_materials_is_idempotent(loader):
+    """Test if seeding twice keeps one row per catalog material"""
+    loader.seed_materials()
+    assert count(loader, 'Materials') == len(EXISTING_MATERIALS)
+
+def test_seed_materials_updates_changed_catalog_rows(loader):
+    """Test if re-seeding brings a stored material's category and CO2 savings back to the catalog's"""
+    material = EXISTING_MATERIALS[0]
+    with loader.engine.begin() as connection:
+        connection.execute(text("UPDATE Materials SET CategoryName = 'stale', CO2Savings = -1 WHERE MaterialID = :id"),
+                           {'id': material['MaterialID']})
+
+    loader.seed_materials()
+
+    with loader.engine.connect() as connection:
+        row = connection.execute(text("SELECT CategoryName, CO2Savings FROM Materials WHERE MaterialID = :id"),
+                                 {'id': material['MaterialID']}).one()
+    assert tuple(row) == (material['CategoryName'], material['CO2Savings'])
+
+def test_load_inserts_business_and_children(loader, sample_business):
+    """Test if businesses are loaded with address, hours, materials and services in batches"""
+    records = [dict(sample_business, place_id=f'id{i}') for i in range(5)]
+
+    assert loader.load(iter(records)) == 5
+    assert count(loader, 'Businesses') == 5
+    assert count(loader, 'AddressComponents') == 5
+    assert count(loader, 'BusinessHours') == 5
+    assert count(loader, 'BusinessServices') == 5
+    assert count(loader, 'BusinessMaterials') == 5 * len(business_material_matches(sample_business))
+
+    with loader.engine.connect() as connection:
+        name, city = connection.execute(text(
+            "SELECT b.Name, a.City FROM Businesses b JOIN AddressComponents a ON a.BusinessID = b.BusinessID "
+            "WHERE b.PlaceID = 'id3'"
+        )).one()
+        material_ids = connection.execute(text(
+            "SELECT m.MaterialID FROM BusinessMaterials m JOIN Businesses b ON b.BusinessID = m.BusinessID "
+            "WHERE b.PlaceID = 'id0' ORDER BY m.MaterialID"
+        )).scalars().all()
+    assert (name, city) == ("O'Brien Recycling", 'Newcastle upon Tyne')
+    assert 20 in material_ids
+
+def test_load_skips_duplicate_places_in_a_batch(loader, sample_business):
+    """Test if a place repeated within a batch is loaded once"""
+    assert loader.load([sample_business, dict(sample_business)]) == 1
+    assert count(loader, 'Businesses') == 1
+
+def test_upsert_only_writes_changes_and_soft_deletes(loader, sample_business):
+    """Test if a refresh updates changed businesses, skips unchanged ones and soft-deletes missing ones"""
+    first_run = [dict(sample_business, place_id=f'id{i}') for i in range(4)]
+    assert loader.upsert(first_run)['inserted'] == 4
+
+    second_run = first_run[:2] + [dict(first_run[2], rating=3.0)]
+    stats = loader.upsert(second_run, content_hashes(first_run))
+    assert stats == {'inserted': 0, 'updated': 1, 'unchanged': 2, 'deleted': 1}
+
+    assert count(loader, 'Businesses') == 4
+    assert count(loader, 'BusinessServices') == 4
+    assert set(loader.fetch_content_hashes()) == {'id0', 'id1', 'id2'}
+    with loader.engine.connect() as connection:
+        assert connection.execute(text("SELECT DeletedBy FROM Businesses WHERE PlaceID = 'id3'")).scalar()
+
+    # A soft-deleted business that reappears is reactivated, not duplicated
+    assert loader.upsert([first_run[3]])['updated'] == 1
+    assert count(loader, 'Businesses') == 4
+    assert 'id3' in loader.fetch_content_hashes()
+
+def test_seed_materials_remaps_identity_assigned_ids(tmp_path):
+    """Test if materials seeded before the IDs were fixed move onto the catalog IDs with their business links"""
+    loader = DatabaseLoader(f"sqlite:///{tmp_path / 'recycling.db'}")
+    loader.create_schema()
+    pet = next(mat for mat in EXISTING_MATERIALS if mat['Description'] == 'PET')
+    squatter = next(mat for mat in EXISTING_MATERIALS if mat['MaterialID'] == 1)
+    with loader.engine.begin() as connection:
+        # An IDENTITY-era table: PET on ID 1, and a custom material on PET's catalog ID
+        connection.execute(text("INSERT INTO Materials (MaterialID, CategoryName, Description, CO2Savings) "
+                                "VALUES (1, 'plastic', 'PET', 1.5), (:id, 'other', 'Corks', 0)"),
+                           {'id': pet['MaterialID']})
+        connection.execute(text("INSERT INTO BusinessMaterials (BusinessID, MaterialID, CategoryName, Description) "
+                                "VALUES (7, 1, 'plastic', 'PET'), (7, :id, 'other', 'Corks')"),
+                           {'id': pet['MaterialID']})
+
+    loader.seed_materials()
+
+    with loader.engine.connect() as connection:
+        materials = dict(connection.execute(text("SELECT MaterialID, Description FROM Materials")).all())
+        links = dict(connection.execute(text("SELECT Description, MaterialID FROM BusinessMaterials")).all())
+    assert materials[pet['MaterialID']] == 'PET'
+    assert materials[1] == squatter['Description']
+    assert materials[links['Corks']] == 'Corks'
+    assert links['PET'] == pet['MaterialID']
+    assert count(loader, 'Materials') == len(EXISTING_MATERIALS) + 1
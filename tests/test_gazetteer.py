@@ -0,0 +1,57 @@
+import pytest
+from recycling_business_finder.gazetteer import load_gazetteer, lookup_location, normalize_location
+from recycling_business_finder.geo import bounds_center, bounds_radius
+from recycling_business_finder.recycling_business_finder import EnhancedRecyclingFinder
+
+def test_normalize_location():
+    """Test if location strings normalize to one lookup key"""
+    assert normalize_location("  Newcastle ,  United Kingdom ") == "newcastle, uk"
+    assert normalize_location("NEWCASTLE, UK") == "newcastle, uk"
+
+def test_bundled_gazetteer_lookup():
+    """Test if bundled cities resolve without an API call"""
+    lat, lng = lookup_location("London, United Kingdom")
+    assert lat == pytest.approx(51.5074)
+    assert lng == pytest.approx(-0.1278)
+    assert lookup_location("Atlantis, Nowhere") is None
+
+def test_user_gazetteer_overrides_bundled(tmp_path):
+    """Test if a user gazetteer file adds and overrides entries"""
+    path = tmp_path / 'cities.csv'
+    path.write_text("city,country,lat,lng\nAtlantis,Nowhere,1.5,2.5\nLondon,UK,0,0\n")
+    entries = load_gazetteer(str(path))
+
+    assert entries["atlantis, nowhere"] == (1.5, 2.5)
+    assert entries["london, uk"] == (0.0, 0.0)
+
+def test_bounds_helpers():
+    """Test if bounding box centre and covering radius are computed"""
+    bounds = (54.9, -1.7, 55.0, -1.5)
+    assert bounds_center(bounds) == pytest.approx((54.95, -1.6))
+    assert 8000 < bounds_radius(bounds) < 9000
+
+def test_resolve_location_uses_geocode_cache(mocker):
+    """Test if geocode results are cached across finders"""
+    mock_client = mocker.Mock()
+    mocker.patch('googlemaps.Client', return_value=mock_client)
+    mock_client.geocode.return_value = [{'geometry': {
+        'location': {'lat': 1.0, 'lng': 2.0},
+        'viewport': {'southwest': {'lat': 0.5, 'lng': 1.5}, 'northeast': {'lat': 1.5, 'lng': 2.5}}
+    }}]
+
+    first = EnhancedRecyclingFinder('test-key').resolve_location("Test City, Test Country")
+    second = EnhancedRecyclingFinder('test-key').resolve_location("test city,  test country")
+
+    assert first == second == {'lat': 1.0, 'lng': 2.0, 'bounds': (0.5, 1.5, 1.5, 2.5)}
+    mock_client.geocode.assert_called_once_with("Test City, Test Country")
+
+def test_search_with_explicit_coordinates(mocker):
+    """Test if explicit coordinates skip geocoding"""
+    mock_client = mocker.Mock()
+    mocker.patch('googlemaps.Client', return_value=mock_client)
+    mock_client.places_nearby.return_value = {'results': []}
+
+    EnhancedRecyclingFinder('test-key').search_businesses("Anywhere", coordinates=(1.0, 2.0))
+
+    mock_client.geocode.assert_not_called()
+    assert mock_client.places_nearby.call_args.kwargs['location'] == (1.0, 2.0)
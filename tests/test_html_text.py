@@ -0,0 +1,59 @@
+import pytest
+from recycling_business_finder.html_text import MaterialTextParser, extract_materials_from_html
+from recycling_business_finder.material_keywords import KeywordMatcher
+
+def test_extract_skips_scripts_and_styles():
+    """Test if only visible text is scanned"""
+    html = """
+    <html><head><title>Plastic</title><style>.glass { color: red }</style></head>
+    <body><script>var steel = 1;</script><ul><li>Paper</li><li>Cardboard</li></ul></body></html>
+    """
+    assert extract_materials_from_html(html) == {'paper': ['paper', 'cardboard']}
+
+def test_extract_finds_keywords_across_chunks():
+    """Test if keywords split across feed chunks are still found"""
+    html = "<p>" + "x " * 100 + "we take scrap metal</p>"
+    boundary = html.index("metal") + 2
+    assert extract_materials_from_html(html, chunk_chars=boundary)['metal'] == ['metal', 'scrap metal', 'scrap']
+
+def test_partial_words_at_batch_boundaries_do_not_match():
+    """Test if the tail of a word carried between batches cannot match a keyword"""
+    matcher = KeywordMatcher({'plastic': ['pp']})
+    parser = MaterialTextParser(matcher, batch_chars=1)
+    parser.feed("<p>We support recycling</p>")
+    parser.close()
+    parser.scan()
+    assert parser.found == set()
+
+def test_extract_stops_once_every_category_is_found(mocker):
+    """Test if parsing stops early when all categories are found"""
+    matcher = KeywordMatcher({'metal': ['steel'], 'glass': ['glass']})
+    html = "<p>steel and glass</p>" + "<p>filler</p>" * 10000
+    fed_chunks = []
+
+    class CountingParser(MaterialTextParser):
+        def feed(self, data):
+            fed_chunks.append(len(data))
+            super().feed(data)
+
+    mocker.patch('recycling_business_finder.html_text.MaterialTextParser', CountingParser)
+    materials = extract_materials_from_html(html, matcher=matcher, chunk_chars=1024)
+
+    assert materials == {'metal': ['steel'], 'glass': ['glass']}
+    assert len(fed_chunks) == 1
+
+def test_extract_without_closing_head():
+    """Test if a page that omits the optional </head> still has its body scanned"""
+    html = "<html><head><title>Plastic</title><meta charset=utf-8><p>We accept glass bottles</p></html>"
+    assert extract_materials_from_html(html) == {'glass': ['glass', 'bottles']}
+
+def test_words_split_across_chunks_do_not_match():
+    """Test if the start of a word cut at a chunk edge is not matched as a keyword"""
+    matcher = KeywordMatcher({'plastic': ['pet'], 'metal': ['scrap metal']})
+    html = "<p>" + "x " * 20 + "petrol and scrap metal</p>"
+    assert extract_materials_from_html(html, matcher=matcher, chunk_chars=html.index("petrol") + 3) == {
+        'metal': ['scrap metal']
+    }
+    assert extract_materials_from_html(html, matcher=matcher, chunk_chars=html.index(" metal")) == {
+        'metal': ['scrap metal']
+    }
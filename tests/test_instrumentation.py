@@ -0,0 +1,86 @@
+import json
+import pytest
+from recycling_business_finder.instrumentation import INSTRUMENTATION, Instrumentation
+from recycling_services_researcher import RecyclingServiceManager
+
+def test_spans_and_counters_are_summarized():
+    """Test if spans accumulate per stage, count errors and sort slowest first"""
+    metrics = Instrumentation()
+    metrics.record('details', 0.25)
+    metrics.record('details', 0.75)
+    metrics.record('geocode', 0.1)
+    with pytest.raises(ValueError):
+        with metrics.span('crawl'):
+            raise ValueError('unreachable')
+
+    @metrics.timed('extract')
+    def extract():
+        return 'materials'
+
+    assert extract() == 'materials'
+    metrics.count('crawl_bytes', 2048)
+    metrics.count('details_cache_hits')
+    metrics.count('details_cache_hits')
+
+    summary = metrics.summary()
+    assert list(summary['stages'])[:2] == ['details', 'geocode']
+    assert summary['stages']['details'] == {'calls': 2, 'errors': 0, 'seconds': 1.0, 'mean_ms': 500.0, 'max_ms': 750.0}
+    assert summary['stages']['crawl']['errors'] == 1
+    assert summary['stages']['extract']['calls'] == 1
+    assert summary['counters'] == {'crawl_bytes': 2048, 'details_cache_hits': 2}
+
+    text = metrics.prometheus_text({'city': 'Newcastle "upon" Tyne'})
+    assert '# TYPE recycling_stage_seconds_total counter' in text
+    assert 'recycling_stage_seconds_total{stage="details",city="Newcastle \\"upon\\" Tyne"} 1' in text
+    assert 'recycling_stage_max_seconds{stage="details",city="Newcastle \\"upon\\" Tyne"} 0.75' in text
+    assert 'recycling_details_cache_hits_total{city="Newcastle \\"upon\\" Tyne"} 2' in text
+
+    metrics.reset()
+    assert metrics.summary()['stages'] == {}
+
+def test_process_location_saves_run_metrics(mocker, monkeypatch, tmp_path):
+    """Test if a run writes per-stage metrics as JSON and a Prometheus textfile"""
+    monkeypatch.setenv('METRICS_TEXTFILE', str(tmp_path / 'textfiles' / '{location}.prom'))
+    mock_client = mocker.Mock()
+    mocker.patch('googlemaps.Client', return_value=mock_client)
+    mock_client.places_nearby.return_value = {'results': [
+        {'name': f'Metal Recycling {i}', 'place_id': f'id{i}', 'geometry': {'location': {'lat': 54.97, 'lng': -1.61}}}
+        for i in range(3)
+    ]}
+    mock_client.place.return_value = {'result': {
+        'formatted_address': '1 Test Street',
+        'opening_hours': {'weekday_text': ['Monday: 9:00 AM – 5:00 PM']}
+    }}
+
+    manager = RecyclingServiceManager()
+    manager.process_location("Newcastle", "UK", coordinates=(54.97, -1.61))
+
+    assert manager.metrics_filename.endswith('.metrics.json')
+    assert manager.metrics_filename[:-len('.metrics.json')] == manager.json_filename[:-len('.json')]
+    with open(manager.metrics_filename, encoding='utf-8') as f:
+        metrics = json.load(f)
+    assert metrics['city'] == 'Newcastle'
+    for stage in ('search', 'nearby_page', 'details', 'hours_parse', 'material_match', 'sql_write', 'json_write'):
+        assert metrics['stages'][stage]['calls'] >= 1, stage
+    assert metrics['stages']['details']['calls'] == 3
+    assert metrics['counters']['nearby_results'] == 3
+    assert metrics['counters']['businesses'] == 3
+
+    textfile = tmp_path / 'textfiles' / 'newcastle_uk.prom'
+    assert 'recycling_stage_calls_total{stage="details",city="Newcastle",country="UK"} 3' in textfile.read_text()
+    assert INSTRUMENTATION.summary()['stages']['details']['calls'] == 3
+
+def test_span_leaves_out_excluded_callback_time():
+    """Test if a callback timed inside a span counts toward its own stage instead of the span's"""
+    import time
+    metrics = Instrumentation()
+    extract = metrics.callback_timer('extract')
+    feed = extract.wrap(lambda text: time.sleep(0.05))
+    with metrics.span('crawl', exclude=extract):
+        feed('chunk')
+        feed('chunk')
+    extract.record()
+
+    stages = metrics.summary()['stages']
+    assert stages['crawl']['calls'] == 1 and stages['crawl']['seconds'] < 0.05
+    assert stages['extract']['calls'] == 0 and stages['extract']['seconds'] >= 0.1
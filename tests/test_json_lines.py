@@ -0,0 +1,28 @@
+import gzip
+from recycling_business_finder.json_lines import JsonLinesWriter, open_text
+from recycling_data_engineer.reporting_engineer import iter_json_records
+
+def test_writer_appends_compact_lines(tmp_path):
+    """Test if each record is written as one compact line and visible before close"""
+    path = tmp_path / 'out' / 'businesses.jsonl'
+    with JsonLinesWriter(str(path)) as writer:
+        writer.write({'name': 'Café', 'materials': ['plastic']})
+        assert path.read_text(encoding='utf-8') == '{"name":"Café","materials":["plastic"]}\n'
+        writer.write({'name': 'Second'})
+
+    assert writer.count == 2
+    assert [record['name'] for record in iter_json_records(str(path))] == ['Café', 'Second']
+
+def test_gzip_output_round_trips(tmp_path):
+    """Test if .gz output is compressed and read back transparently"""
+    path = tmp_path / 'businesses.jsonl.gz'
+    records = [{'place_id': f'id{i}', 'name': 'Recycling'} for i in range(100)]
+    with JsonLinesWriter(str(path)) as writer:
+        for record in records:
+            writer.write(record)
+
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        assert len(f.readlines()) == 100
+    with open_text(str(path)) as f:
+        assert f.readline().startswith('{"place_id":"id0"')
+    assert list(iter_json_records(str(path))) == records
@@ -0,0 +1,35 @@
+from recycling_data_engineer.material_catalog import DEFAULT_CATALOG, MaterialCatalog
+
+def test_best_match_prefers_exact_description():
+    """Test if a keyword naming a catalog entry matches it regardless of case"""
+    assert DEFAULT_CATALOG.best_match('pet', 'plastic') == ('plastic', 'PET')
+    assert DEFAULT_CATALOG.best_match('Newspaper', 'paper') == ('paper', 'Newspaper')
+
+def test_best_match_falls_back_to_mixed_entries():
+    """Test if unspecific keywords fall back to the category's mixed entry"""
+    assert DEFAULT_CATALOG.best_match('polymer', 'plastic') == ('plastic', 'Mixed Plastics')
+    assert DEFAULT_CATALOG.best_match('steel', 'metal') == ('metal', 'Mixed Metals')
+    assert DEFAULT_CATALOG.best_match('copper', 'metal') is None
+
+def test_material_matches_use_catalog_ids():
+    """Test if matches carry the catalog MaterialIDs, sorted and without duplicates"""
+    matches = DEFAULT_CATALOG.material_matches(['plastic'], {'plastic': ['pet', 'PET']})
+    assert matches == [(20, 'plastic', 'PET'), (25, 'plastic', 'Mixed Plastics')]
+
+def test_custom_catalog_only_matches_its_entries():
+    """Test if a catalog built from other materials indexes only those"""
+    catalog = MaterialCatalog([{'CategoryName': 'glass', 'Description': 'Clear Glass'}])
+    assert catalog.match(['glass'], {'glass': ['clear glass']}) == [('glass', 'Clear Glass')]
+    assert catalog.match(['plastic'], {}) == []
+    assert catalog.ids == {}
+
+def test_match_caches_are_bounded(monkeypatch):
+    """Test if a run with many distinct material sets keeps the match caches at their size limit"""
+    monkeypatch.setattr('recycling_data_engineer.material_catalog.MATCH_CACHE_SIZE', 8)
+    catalog = MaterialCatalog([{'CategoryName': 'glass', 'Description': 'Clear Glass'}])
+    for i in range(50):
+        assert catalog.match([f'glass jar {i}'], {'glass': [f'bottle {i}']}) == []
+
+    assert catalog._match.cache_info().currsize == 8
+    assert catalog._best_match.cache_info().currsize == 8
+    assert catalog._first_category.cache_info().currsize == 8
@@ -0,0 +1,54 @@
+import pytest
+from recycling_business_finder.material_keywords import (
+    KeywordMatcher,
+    MATERIAL_MATCHER,
+    BUSINESS_TYPE_MATCHER,
+    LABEL_MATCHER
+)
+
+def test_short_keywords_need_word_boundaries():
+    """Test if short keywords do not match inside unrelated words"""
+    assert MATERIAL_MATCHER.find("We support happy carpet owners with care") == {}
+    assert MATERIAL_MATCHER.find("We accept PP and PS plastics") == {'plastic': ['plastics', 'PP', 'PS']}
+
+def test_plurals_and_multi_word_keywords():
+    """Test if listed plurals match and multi-word keywords imply their parts"""
+    materials = MATERIAL_MATCHER.find("Scrap metal, glass bottles and old computers")
+    assert materials == {
+        'metal': ['metal', 'scrap metal', 'scrap'],
+        'glass': ['glass', 'bottles'],
+        'electronics': ['computers']
+    }
+
+def test_business_type_matcher_includes_general():
+    """Test if business names can match the general category"""
+    assert 'general' in BUSINESS_TYPE_MATCHER.find("Northside Recycling Center")
+    assert 'general' not in MATERIAL_MATCHER.find("Northside Recycling Center")
+
+def test_first_category_uses_registry_order():
+    """Test if first_category follows the registry order"""
+    matcher = KeywordMatcher({'metal': ['steel'], 'glass': ['glass']})
+    assert matcher.first_category("glass and steel") == 'metal'
+    assert matcher.first_category("wood") is None
+
+def test_results_keep_registry_spelling():
+    """Test if matching ignores case but reports keywords as the original extractors spelled them"""
+    assert MATERIAL_MATCHER.find("we take pet and hdpe") == {'plastic': ['PET', 'HDPE']}
+    assert MATERIAL_MATCHER.find("One computer, two old phones") == {'electronics': ['computer', 'phones']}
+    assert MATERIAL_MATCHER.find("Electronic waste") == {'electronics': ['electronic', 'electronic waste']}
+    assert MATERIAL_MATCHER.find("a glass bottle") == {'glass': ['glass', 'bottle']}
+
+def test_no_generic_plural_suffix():
+    """Test if keywords only match as listed, not with any s/es ending"""
+    for text in ("Our team cares", "Nothing scrapes", "No pets", "petes", "oiles", "irones"):
+        assert MATERIAL_MATCHER.find(text) == {}, text
+
+def test_label_keywords_only_categorise_labels():
+    """Test if ambiguous everyday words categorise material labels but are not found in page text"""
+    assert MATERIAL_MATCHER.find("Book a box collection, lead times vary") == {}
+    assert LABEL_MATCHER.first_category("packaging") == 'plastic'
+    assert LABEL_MATCHER.first_category("lead") == 'metal'
+    assert LABEL_MATCHER.first_category("box") == 'paper'
+    assert MATERIAL_MATCHER.find("tin cans, copper wire and a glass jar") == {
+        'metal': ['copper', 'tin', 'cans', 'wire'], 'glass': ['glass', 'jar']
+    }
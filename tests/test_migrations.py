@@ -0,0 +1,80 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from recycling_data_engineer.database_definitions import BUSINESS_LOCATION_INDEX
+from recycling_data_engineer.migrations import MIGRATIONS, applied_versions, migrate, sqlite_ddl
+
+OLD_BUSINESS_TABLE = """
+CREATE TABLE Businesses (
+    BusinessID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Name TEXT NOT NULL,
+    FormattedAddress TEXT NOT NULL,
+    Latitude REAL,
+    Longitude REAL,
+    PlaceID TEXT,
+    IsActive INTEGER DEFAULT 1
+)
+"""
+
+def old_database(tmp_path):
+    """Create a database from before ContentHash and the indexes, holding a duplicated place"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        connection.exec_driver_sql(OLD_BUSINESS_TABLE)
+        for table in ('AddressComponents', 'BusinessHours', 'BusinessServices'):
+            connection.exec_driver_sql(f"CREATE TABLE {table} (BusinessID INTEGER)")
+        connection.exec_driver_sql("CREATE TABLE BusinessMaterials (BusinessID INTEGER, MaterialID INTEGER)")
+        connection.exec_driver_sql("CREATE TABLE Materials (MaterialID INTEGER PRIMARY KEY, CategoryName TEXT)")
+        for place_id in ('a', 'a', 'b'):
+            connection.execute(
+                text("INSERT INTO Businesses (Name, FormattedAddress, PlaceID) VALUES ('n', 'addr', :place_id)"),
+                {'place_id': place_id}
+            )
+        connection.exec_driver_sql("INSERT INTO BusinessServices (BusinessID) VALUES (1), (2), (3)")
+    return engine
+
+def test_sqlite_ddl_folds_included_columns_into_key():
+    """Test if covering index INCLUDE columns become trailing key columns on SQLite"""
+    assert "(Latitude, Longitude, IsActive, Name, PlaceID)" in sqlite_ddl(BUSINESS_LOCATION_INDEX)
+
+def resolve_duplicates(engine):
+    """Soft-delete the older row of the duplicated place and clear its PlaceID, as an operator would"""
+    with engine.begin() as connection:
+        connection.exec_driver_sql("UPDATE Businesses SET IsActive = 0, PlaceID = NULL WHERE BusinessID = 1")
+
+def test_migrate_refuses_duplicate_places(tmp_path):
+    """Test if the PlaceID index migration fails listing duplicated places instead of deleting rows"""
+    engine = old_database(tmp_path)
+
+    with pytest.raises(ValueError, match=r"Migration 2 .*1 PlaceIDs held by more than one Businesses row: a$"):
+        migrate(engine)
+
+    assert applied_versions(engine) == [1]
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM Businesses")).scalar() == 3
+        assert connection.execute(text("SELECT COUNT(*) FROM BusinessServices")).scalar() == 3
+
+def test_migrate_upgrades_old_schema(tmp_path):
+    """Test if migrations add ContentHash and create every index once duplicates are resolved"""
+    engine = old_database(tmp_path)
+    resolve_duplicates(engine)
+
+    assert migrate(engine) == [migration.version for migration in MIGRATIONS]
+
+    inspector = inspect(engine)
+    assert 'ContentHash' in {col['name'] for col in inspector.get_columns('Businesses')}
+    index_names = {index['name'] for table in inspector.get_table_names() for index in inspector.get_indexes(table)}
+    assert {name for migration in MIGRATIONS for _, name, _ in migration.indexes} <= index_names
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM Businesses")).scalar() == 3
+        assert connection.execute(text("SELECT COUNT(*) FROM BusinessServices")).scalar() == 3
+
+def test_migrate_is_idempotent(tmp_path):
+    """Test if re-running migrations applies nothing new"""
+    engine = old_database(tmp_path)
+    resolve_duplicates(engine)
+    migrate(engine, target=1)
+    assert applied_versions(engine) == [1]
+
+    migrate(engine)
+    assert migrate(engine) == []
+    assert applied_versions(engine) == [migration.version for migration in MIGRATIONS]
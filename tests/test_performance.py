@@ -1,14 +1,44 @@
 import pytest
-import time
-from recycling_services_researcher import RecyclingServiceManager
+
 
 @pytest.mark.performance
 def test_search_performance():
-    """Test performance of search operation"""
-    manager = RecyclingServiceManager()
-    start_time = time.time()
-    manager.find_recycling_services("Newcastle", "UK")
-    end_time = time.time()
-    
-    execution_time = end_time - start_time
-    assert execution_time < 10  # Should complete within 10 seconds 
\ No newline at end of file
+    """Test if searches against the local stand-ins for Google and websites complete quickly"""
+    from benchmarks.search_benchmark import run_benchmark
+
+    results = run_benchmark(sizes=(60,), site_latency=0.01, page_bytes=5000)
+
+    assert [(s['target'], s['places']) for s in results['scenarios']] == [('finder', 60), ('manager', 60)]
+    for scenario in results['scenarios']:
+        assert scenario['found'] == 60
+        assert scenario['google_requests'] >= 60
+        assert scenario['website_requests'] > 0
+        assert scenario['requests_per_second'] > 0
+        assert 'crawl' in scenario['stage_seconds']
+        assert scenario['wall_seconds'] < 10  # Should complete within 10 seconds
+    assert 'sql_write' in results['scenarios'][1]['stage_seconds']
+
+
+@pytest.mark.performance
+def test_indexed_query_performance(tmp_path):
+    """Test if the migrated indexes serve the typical API queries"""
+    from recycling_data_engineer.query_benchmark import (
+        QUERIES, build_database, query_parameters, query_plan, time_queries
+    )
+
+    count = 2000
+    parameters = query_parameters(count, samples=50)
+    plain = build_database(str(tmp_path / 'plain.db'), count, indexes=False)
+    indexed = build_database(str(tmp_path / 'indexed.db'), count, indexes=True)
+
+    expected_indexes = {
+        'by_place_id': 'UX_Businesses_PlaceID',
+        'by_material': 'IX_BusinessMaterials_MaterialID',
+        'by_bounding_box': 'IX_Businesses_Location'
+    }
+    for name in QUERIES:
+        assert expected_indexes[name] in query_plan(indexed, name, parameters[name][0])
+    before = time_queries(plain, parameters)
+    after = time_queries(indexed, parameters)
+    assert after['by_place_id'] < before['by_place_id']
+    assert after['by_bounding_box'] < before['by_bounding_box']
@@ -0,0 +1,91 @@
+import googlemaps
+import pytest
+from recycling_business_finder.rate_limit import RateLimiter, TokenBucket, is_quota_error
+from recycling_business_finder.recycling_business_finder import EnhancedRecyclingFinder
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+def test_token_bucket_spaces_requests():
+    """Test if requests beyond the burst are spaced at the bucket's rate"""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=2, clock=clock)
+
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    clock.now += 10
+    assert bucket.reserve() == 0.0
+
+    bucket.pause(3)
+    assert bucket.reserve() == 3.0
+    assert bucket.stats()['requests'] == 6
+    assert bucket.stats()['backoffs'] == 1
+
+def test_unlimited_bucket_never_waits():
+    """Test if a rate of zero disables limiting"""
+    bucket = TokenBucket(rate=0, clock=FakeClock())
+    assert all(bucket.reserve() == 0.0 for _ in range(100))
+
+def test_quota_errors_are_retried_with_backoff(monkeypatch):
+    """Test if quota errors back off and retry while other errors are raised at once"""
+    monkeypatch.setenv('QUOTA_BACKOFF_BASE', '1')
+    sleeps = []
+    limiter = RateLimiter(google_qps=0, max_retries=3, sleep=sleeps.append)
+    responses = [googlemaps.exceptions._OverQueryLimit('OVER_QUERY_LIMIT'),
+                 googlemaps.exceptions.HTTPError(429), {'result': {}}]
+
+    def place(place_id):
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    assert limiter.call_google('place', place, 'id1') == {'result': {}}
+    assert len(sleeps) == 2
+    assert 0.5 <= sleeps[0] <= 1 and 1 <= sleeps[1] <= 2
+    assert limiter.stats()['google:place']['backoffs'] == 2
+
+    def invalid(**kwargs):
+        raise googlemaps.exceptions.ApiError('INVALID_REQUEST')
+
+    with pytest.raises(googlemaps.exceptions.ApiError):
+        limiter.call_google('places_nearby', invalid)
+    assert not is_quota_error(googlemaps.exceptions.ApiError('INVALID_REQUEST'))
+
+    def exhausted(place_id):
+        raise googlemaps.exceptions.ApiError('OVER_QUERY_LIMIT')
+
+    with pytest.raises(googlemaps.exceptions.ApiError):
+        limiter.call_google('place', exhausted, 'id2')
+    assert limiter.stats()['google:place']['backoffs'] == 5
+
+def test_finder_keeps_businesses_through_quota_errors(mocker):
+    """Test if a place hitting OVER_QUERY_LIMIT is retried instead of dropped"""
+    mock_client = mocker.Mock()
+    mocker.patch('googlemaps.Client', return_value=mock_client)
+    mock_client.places_nearby.return_value = {'results': [
+        {'name': f'Place {i}', 'place_id': f'id{i}', 'geometry': {'location': {'lat': 0, 'lng': 0}}}
+        for i in range(3)
+    ]}
+    throttled = []
+
+    def place_details(place_id):
+        if place_id == 'id1' and not throttled:
+            throttled.append(place_id)
+            raise googlemaps.exceptions.ApiError('OVER_QUERY_LIMIT')
+        return {'result': {'formatted_address': f'{place_id} address'}}
+
+    mock_client.place.side_effect = place_details
+    limiter = RateLimiter(sleep=lambda seconds: None)
+    finder = EnhancedRecyclingFinder('test-key', rate_limiter=limiter)
+    results = finder.search_businesses("Test City", coordinates=(1.0, 2.0))
+
+    assert [business.place_id for business in results] == ['id0', 'id1', 'id2']
+    assert mock_client.place.call_count == 4
+    stats = limiter.stats()
+    assert stats['google:place']['requests'] == 4
+    assert stats['google:places_nearby']['requests'] == 1
+    assert 'google:place: 4 requests' in limiter.summary()
@@ -57,4 +57,251 @@ def test_website_content_analysis(finder):
     """Test website content analysis"""
     test_url = "http://example.com"  # Use a mock website
     materials = finder.analyze_website_content(test_url)
-    assert isinstance(materials, dict) 
\ No newline at end of file
+    assert isinstance(materials, dict) 
+
+def test_search_businesses_concurrent_details(mocker, monkeypatch):
+    """Test that concurrent details fetching keeps order, the cutoff and error isolation"""
+    monkeypatch.setenv('MAX_RESULTS', '3')
+    monkeypatch.setenv('DETAILS_WORKERS', '4')
+    mock_client = mocker.Mock()
+    mocker.patch('googlemaps.Client', return_value=mock_client)
+
+    places = [
+        {'name': f'Place {i}', 'place_id': f'id{i}',
+         'geometry': {'location': {'lat': 51.0 + i, 'lng': -1.0}}}
+        for i in range(6)
+    ]
+
+    def place_details(place_id):
+        if place_id == 'id1':
+            raise RuntimeError('boom')
+        return {'result': {'formatted_address': f'{place_id} address'}}
+
+    mock_client.geocode.return_value = [{'geometry': {'location': {'lat': 51.0, 'lng': -1.0}}}]
+    mock_client.places_nearby.return_value = {'results': places}
+    mock_client.place.side_effect = place_details
+
+    finder = EnhancedRecyclingFinder('test-key')
+    results = finder.search_businesses("Test City, Test Country")
+
+    assert [business.place_id for business in results] == ['id0', 'id2', 'id3']
+    assert mock_client.place.call_count == 4
+
+
+def test_place_details_cache(mocker):
+    """Test if place details are served from the cache on repeat searches"""
+    mock_client = mocker.Mock()
+    mocker.patch('googlemaps.Client', return_value=mock_client)
+    mock_client.geocode.return_value = [{'geometry': {'location': {'lat': 51.0, 'lng': -1.0}}}]
+    mock_client.places_nearby.return_value = {'results': [
+        {'name': 'Cached Place', 'place_id': 'cached1', 'geometry': {'location': {'lat': 51.0, 'lng': -1.0}}}
+    ]}
+    mock_client.place.return_value = {'result': {'formatted_address': '1 Cache Street'}}
+
+    first = EnhancedRecyclingFinder('test-key').search_businesses("Test City, Test Country")
+    finder = EnhancedRecyclingFinder('test-key')
+    second = finder.search_businesses("Test City, Test Country")
+
+    assert first[0].address == second[0].address == '1 Cache Street'
+    assert mock_client.place.call_count == 1
+    assert finder.details_cache.stats() == {'hits': 1, 'misses': 0}
+
+    refreshing = EnhancedRecyclingFinder('test-key', refresh_details=True)
+    refreshing.search_businesses("Test City, Test Country")
+    assert mock_client.place.call_count == 2
+    assert refreshing.details_cache.stats() == {'hits': 0, 'misses': 1}
+
+
+def test_tiled_search_subdivides_saturated_tiles(mocker, monkeypatch):
+    """Test if saturated tiles are split and results are merged by place_id"""
+    monkeypatch.setenv('MAX_RESULTS', '1000')
+    mock_client = mocker.Mock()
+    mocker.patch('googlemaps.Client', return_value=mock_client)
+
+    def places_nearby(location, radius, **kwargs):
+        if radius > 5000:
+            # The whole area saturates the 60-result cap
+            count, prefix = 60, 'root'
+        else:
+            # Every quadrant sees a shared place plus a few of its own
+            count, prefix = 3, f"{location[0]:.3f},{location[1]:.3f}"
+        results = [{'name': 'Shared', 'place_id': 'shared', 'geometry': {'location': {'lat': 0, 'lng': 0}}}]
+        results += [
+            {'name': f'{prefix} {i}', 'place_id': f'{prefix}-{i}', 'geometry': {'location': {'lat': 0, 'lng': 0}}}
+            for i in range(count)
+        ]
+        return {'results': results}
+
+    mock_client.places_nearby.side_effect = places_nearby
+    mock_client.place.return_value = {'result': {'formatted_address': 'Somewhere'}}
+
+    finder = EnhancedRecyclingFinder('test-key')
+    results = finder.search_businesses("Test City", bounds=(54.9, -1.7, 55.0, -1.5), tiled=True)
+
+    assert mock_client.places_nearby.call_count == 5
+    assert len(results) == 1 + 60 + 4 * 3
+    assert len({business.place_id for business in results}) == len(results)
+
+def test_tiled_search_keeps_other_tiles_when_one_fails(mocker, monkeypatch):
+    """Test if a failing tile is skipped, keeping its fetched pages and every other tile's places"""
+    monkeypatch.setenv('MAX_RESULTS', '1000')
+    monkeypatch.setenv('PAGE_TOKEN_POLL_INTERVAL', '0')
+    mock_client = mocker.Mock()
+    mocker.patch('googlemaps.Client', return_value=mock_client)
+    quadrants = []
+
+    def place(place_id):
+        return {'name': place_id, 'place_id': place_id, 'geometry': {'location': {'lat': 0, 'lng': 0}}}
+
+    def places_nearby(location=None, radius=None, page_token=None, **kwargs):
+        if page_token == 'broken':
+            raise TimeoutError('second page timed out')
+        if radius > 5000:
+            return {'results': [place(f'root-{i}') for i in range(60)]}
+        quadrants.append(location)
+        if len(quadrants) == 1:
+            raise TimeoutError('first page timed out')
+        prefix = f"{location[0]:.3f},{location[1]:.3f}"
+        result = {'results': [place(f'{prefix}-{i}') for i in range(2)]}
+        if len(quadrants) == 2:
+            result['next_page_token'] = 'broken'
+        return result
+
+    mock_client.places_nearby.side_effect = places_nearby
+    mock_client.place.return_value = {'result': {'formatted_address': 'Somewhere'}}
+
+    finder = EnhancedRecyclingFinder('test-key')
+    finder.tile_workers = 1
+    results = finder.search_businesses("Test City", bounds=(54.9, -1.7, 55.0, -1.5), tiled=True)
+
+    # The failed quadrant adds nothing, the half-paged one keeps its first page
+    assert len(results) == 60 + 3 * 2
+
+
+def test_pagination_polls_until_page_token_is_valid(mocker, monkeypatch):
+    """Test if the next page is polled for instead of waiting a fixed delay"""
+    import googlemaps
+    monkeypatch.setenv('PAGE_TOKEN_POLL_INTERVAL', '0.01')
+    mock_client = mocker.Mock()
+    mocker.patch('googlemaps.Client', return_value=mock_client)
+
+    def page(prefix, token=None):
+        result = {'results': [
+            {'name': f'{prefix} {i}', 'place_id': f'{prefix}{i}', 'geometry': {'location': {'lat': 0, 'lng': 0}}}
+            for i in range(2)
+        ]}
+        if token:
+            result['next_page_token'] = token
+        return result
+
+    token_attempts = []
+
+    def places_nearby(page_token=None, **kwargs):
+        if page_token is None:
+            return page('first', token='token-2')
+        token_attempts.append(page_token)
+        if len(token_attempts) < 3:
+            raise googlemaps.exceptions.ApiError('INVALID_REQUEST')
+        return page('second')
+
+    mock_client.places_nearby.side_effect = places_nearby
+    mock_client.place.return_value = {'result': {'formatted_address': 'Somewhere'}}
+
+    results = EnhancedRecyclingFinder('test-key').search_businesses("Test City", coordinates=(1.0, 2.0))
+
+    assert [business.place_id for business in results] == ['first0', 'first1', 'second0', 'second1']
+    assert token_attempts == ['token-2'] * 3
+
+
+def test_search_businesses_hands_on_finished_businesses(mocker):
+    """Test if businesses reach on_business as soon as they are complete, websites included"""
+    mock_client = mocker.Mock()
+    mocker.patch('googlemaps.Client', return_value=mock_client)
+    mock_client.places_nearby.return_value = {'results': [
+        {'name': f'Place {i}', 'place_id': f'id{i}', 'geometry': {'location': {'lat': 0, 'lng': 0}}}
+        for i in range(3)
+    ]}
+
+    def place_details(place_id):
+        website = None if place_id == 'id0' else 'http://shared.example'
+        return {'result': {'formatted_address': 'Somewhere', 'website': website}}
+
+    mock_client.place.side_effect = place_details
+
+    finished = []
+    finder = EnhancedRecyclingFinder('test-key')
+    mocker.patch.object(finder.crawler, 'fetch', side_effect=lambda url, on_text=None: (
+        finished.append('crawled') or '<p>We take scrap metal</p>'
+    ))
+    results = finder.search_businesses("Test City", coordinates=(1.0, 2.0), on_business=finished.append)
+
+    # The business without a website is done before any page is crawled
+    assert finished[0].place_id == 'id0'
+    assert finished[1] == 'crawled'
+    assert sorted(business.place_id for business in finished[2:]) == ['id1', 'id2']
+    assert all('metal' in business.website_materials for business in finished[2:])
+    assert len(results) == 3
+
+def test_search_businesses_without_keeping_businesses(mocker, monkeypatch):
+    """Test if keep_businesses=False only hands businesses on, still stopping at max_results across pages"""
+    monkeypatch.setenv('MAX_RESULTS', '3')
+    mock_client = mocker.Mock()
+    mocker.patch('googlemaps.Client', return_value=mock_client)
+
+    def places_nearby(page_token=None, **kwargs):
+        prefix = 'second' if page_token else 'first'
+        result = {'results': [
+            {'name': f'{prefix} {i}', 'place_id': f'{prefix}{i}', 'geometry': {'location': {'lat': 0, 'lng': 0}}}
+            for i in range(2)
+        ]}
+        if not page_token:
+            result['next_page_token'] = 'token-2'
+        return result
+
+    mock_client.places_nearby.side_effect = places_nearby
+    mock_client.place.return_value = {'result': {'formatted_address': 'Somewhere'}}
+
+    finished = []
+    results = EnhancedRecyclingFinder('test-key').search_businesses(
+        "Test City", coordinates=(1.0, 2.0), on_business=finished.append, keep_businesses=False)
+
+    assert results == []
+    assert [business.place_id for business in finished] == ['first0', 'first1', 'second0']
+    assert mock_client.place.call_count == 3
+
+def test_per_business_output_is_debug_logging(finder, capsys, caplog):
+    """Test if building a business and adding its website materials log at debug level instead of printing"""
+    import logging
+    caplog.set_level(logging.DEBUG, logger='recycling_business_finder.recycling_business_finder')
+    place = {'name': 'Test Recycling', 'place_id': 'id1', 'geometry': {'location': {'lat': 54.97, 'lng': -1.61}}}
+    business = finder.build_business(place, {'formatted_address': '1 Test Street'})
+    finder.add_website_materials(business, {'metal': ['metal']})
+
+    assert capsys.readouterr().out == ''
+    assert "Website materials found for Test Recycling: {'metal': ['metal']}" in caplog.text
+
+def test_finder_runs_inside_an_event_loop(mocker):
+    """Test if website analysis and the whole search work from code already running an event loop"""
+    import asyncio
+    mock_client = mocker.Mock()
+    mocker.patch('googlemaps.Client', return_value=mock_client)
+    mock_client.places_nearby.return_value = {'results': [
+        {'name': 'Place 1', 'place_id': 'id1', 'geometry': {'location': {'lat': 0, 'lng': 0}}}
+    ]}
+    mock_client.place.return_value = {'result': {'formatted_address': 'Somewhere', 'website': 'http://site.example'}}
+
+    finder = EnhancedRecyclingFinder('test-key')
+    mocker.patch.object(finder.crawler, 'fetch', return_value='<p>We take scrap metal</p>')
+
+    async def caller():
+        analyzed = await finder.analyze_websites_async(['http://site.example'])
+        # The synchronous API must not trip over the running loop either
+        blocking = finder.analyze_websites(['http://site.example'])
+        results = await finder.search_businesses_async("Test City", coordinates=(1.0, 2.0))
+        return analyzed, blocking, results
+
+    analyzed, blocking, results = asyncio.run(caller())
+    assert 'metal' in analyzed['http://site.example']
+    assert blocking == analyzed
+    assert [business.place_id for business in results] == ['id1']
+    assert 'metal' in results[0].website_materials
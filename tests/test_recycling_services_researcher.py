@@ -1,6 +1,7 @@
 import pytest
 import os
-from recycling_services_researcher import RecyclingServiceManager
+from recycling_services_researcher import RecyclingServiceManager, legacy_arguments, load_locations, main, process_batch
+from recycling_business_finder.business_table import BusinessTable
 from dotenv import load_dotenv
 from unittest.mock import patch
 
@@ -37,7 +38,7 @@ def test_find_recycling_services(manager):
     """Test if find_recycling_services method works"""
     manager.find_recycling_services("Newcastle", "UK")
     if manager.json_data is not None:  # If API returns results
-        assert isinstance(manager.json_data, list)
+        assert isinstance(manager.json_data, (list, BusinessTable))
 
 def test_process_location(manager):
     """Test if process_location method works"""
@@ -119,4 +120,167 @@ def test_mock_api_call(mocker, manager):
     assert first_result['address'] == '123 Test St'
     assert first_result['phone'] == '123-456-7890'
     assert first_result['website'] == 'http://example.com'
-    assert first_result['rating'] == 4.5
\ No newline at end of file
+    assert first_result['rating'] == 4.5
+
+def test_load_locations(tmp_path):
+    """Test if batch locations load from CSV and JSON files"""
+    csv_path = tmp_path / 'locations.csv'
+    csv_path.write_text("city,country,lat,lng\nNewcastle,UK,54.97,-1.61\nLeeds,UK,,\n")
+    json_path = tmp_path / 'locations.json'
+    json_path.write_text('[{"city": "York", "country": "UK"}]')
+
+    assert load_locations(str(csv_path)) == [
+        {'city': 'Newcastle', 'country': 'UK', 'coordinates': (54.97, -1.61)},
+        {'city': 'Leeds', 'country': 'UK'}
+    ]
+    assert load_locations(str(json_path)) == [{'city': 'York', 'country': 'UK'}]
+
+def test_process_batch_reports_each_location(mocker, tmp_path):
+    """Test if batch mode reports per-location success and failure in a manifest"""
+    def fake_process_location(self, city, country, coordinates=None, bounds=None):
+        if city == 'Broken':
+            raise RuntimeError('quota exhausted')
+        self.json_data = [{'name': 'Test Recycling'}]
+        return f"{city}.json", f"{city}.sql"
+
+    mocker.patch.object(RecyclingServiceManager, 'process_location', fake_process_location)
+    manifest_path = tmp_path / 'manifest.json'
+    manifest = process_batch(
+        [{'city': 'Newcastle', 'country': 'UK'}, {'city': 'Broken', 'country': 'UK'}],
+        workers=1,
+        manifest_path=str(manifest_path)
+    )
+
+    assert manifest['succeeded'] == 1
+    assert manifest['failed'] == 1
+    assert manifest['locations'][0]['json_file'] == 'Newcastle.json'
+    assert manifest['locations'][1]['error'] == 'quota exhausted'
+    assert manifest_path.exists()
+
+def test_process_location_streams_json_lines(mocker, monkeypatch, tmp_path):
+    """Test if jsonl.gz output is written during the search and feeds the SQL file"""
+    from recycling_business_finder.recycling_business_finder import EnhancedRecyclingFinder, RecyclingBusiness
+    from recycling_business_finder.json_lines import JsonLinesRecords
+    from recycling_data_engineer.reporting_engineer import iter_json_records
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('OUTPUT_FORMAT', 'jsonl.gz')
+
+    def fake_search(self, location, coordinates=None, bounds=None, on_business=None, checkpoint=None,
+                    keep_businesses=True):
+        assert not keep_businesses
+        for i in range(2):
+            business = RecyclingBusiness(name=f'Streamed {i}', address='1 Test Street')
+            business.coordinates = {'lat': 54.97, 'lng': -1.61}
+            business.place_id = f'stream{i}'
+            on_business(business)
+        return []
+
+    mocker.patch.object(EnhancedRecyclingFinder, 'search_businesses', fake_search)
+    manager = RecyclingServiceManager()
+    json_file, sql_file = manager.process_location("Newcastle", "UK")
+
+    assert json_file.endswith('.jsonl.gz')
+    # Nothing is held in memory; the count comes from the writer
+    assert isinstance(manager.json_data, JsonLinesRecords)
+    assert len(manager.json_data) == 2
+    assert [record['place_id'] for record in iter_json_records(json_file)] == ['stream0', 'stream1']
+    with open(sql_file, encoding='utf-8') as f:
+        assert f.read().count("INSERT INTO recycling.Businesses") == 2
+
+def test_checkpoint_kept_until_location_completes(mocker, isolated_checkpoint_dir, monkeypatch, tmp_path):
+    """Test if a failed search leaves its checkpoint behind and a completed one removes it"""
+    from recycling_business_finder.recycling_business_finder import EnhancedRecyclingFinder, RecyclingBusiness
+    monkeypatch.chdir(tmp_path)
+    checkpoint_file = isolated_checkpoint_dir / 'newcastle_uk.jsonl'
+
+    def failing_search(self, location, coordinates=None, bounds=None, on_business=None, checkpoint=None):
+        checkpoint.record_business({'place_id': 'done1'})
+        raise RuntimeError('interrupted')
+
+    mocker.patch.object(EnhancedRecyclingFinder, 'search_businesses', failing_search)
+    with pytest.raises(RuntimeError):
+        RecyclingServiceManager().process_location("Newcastle", "UK")
+    assert checkpoint_file.exists()
+
+    def resumed_search(self, location, coordinates=None, bounds=None, on_business=None, checkpoint=None):
+        assert list(checkpoint.businesses) == ['done1']
+        business = RecyclingBusiness(name='Resumed', address='1 Test Street')
+        business.coordinates = {'lat': 54.97, 'lng': -1.61}
+        business.place_id = 'done1'
+        return [business]
+
+    mocker.patch.object(EnhancedRecyclingFinder, 'search_businesses', resumed_search)
+    RecyclingServiceManager().process_location("Newcastle", "UK")
+    assert not checkpoint_file.exists()
+
+def test_import_is_quiet_and_light():
+    """Test if importing the CLI prints nothing and leaves googlemaps, requests and dotenv unimported"""
+    import subprocess
+    import sys
+    code = ("import sys, recycling_services_researcher; "
+            "print(sorted(m for m in ('googlemaps', 'requests', 'dotenv', 'sqlalchemy') if m in sys.modules))")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+    assert result.stdout == '[]\n'
+
+def test_sql_command_runs_without_api_key(monkeypatch, tmp_path):
+    """Test if the sql subcommand converts a results file without a Google API key"""
+    monkeypatch.delenv('GOOGLE_API_KEY', raising=False)
+    monkeypatch.setattr('dotenv.load_dotenv', lambda *args, **kwargs: False)
+    json_path = tmp_path / 'newcastle_uk_20240101_120000.json'
+    json_path.write_text('[{"name": "Test Recycling", "address": "1 Test Street", '
+                         '"coordinates": {"lat": 54.97, "lng": -1.61}, "place_id": "id1", '
+                         '"materials": ["plastic"], "website_materials": {}, "phone": null, "website": null, '
+                         '"rating": 4.5, "opening_hours": [], "service_keywords": [], "address_components": {}}]')
+
+    assert main(['sql', str(json_path)]) == 0
+    assert 'Test Recycling' in (tmp_path / 'newcastle_uk.sql').read_text(encoding='utf-8')
+
+    with pytest.raises(ValueError, match='GOOGLE_API_KEY'):
+        RecyclingServiceManager().find_recycling_services('Newcastle', 'UK')
+
+def test_legacy_arguments_map_to_subcommands():
+    """Test if the original command lines still work"""
+    assert legacy_arguments(['Newcastle', 'UK']) == ['search', 'Newcastle', 'UK']
+    assert legacy_arguments(['--batch', 'locations.csv', '--workers', '4']) == ['batch', 'locations.csv', '--workers', '4']
+    assert legacy_arguments(['sql', 'results.json']) == ['sql', 'results.json']
+
+def test_batch_workers_split_rate_limits(mocker, monkeypatch, tmp_path):
+    """Test if each batch worker process gets its share of GOOGLE_QPS and WEBSITE_HOST_RATE"""
+    from concurrent.futures import Future
+    from recycling_business_finder.rate_limit import shared_rate_limiter
+
+    monkeypatch.setenv('GOOGLE_QPS', '40')
+    monkeypatch.setenv('WEBSITE_HOST_RATE', '2')
+
+    class InlineExecutor:
+        """Run the pool's initializer and tasks in this process"""
+        def __init__(self, max_workers, initializer=None, initargs=()):
+            initializer(*initargs)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            return False
+
+        def submit(self, fn, *args):
+            future = Future()
+            future.set_result(fn(*args))
+            return future
+
+    rates = []
+
+    def fake_process_location(self, city, country, coordinates=None, bounds=None):
+        limiter = shared_rate_limiter()
+        rates.append((limiter.rate_for('google:place'), limiter.rate_for('host:example.com')))
+        self.json_data = [{'name': 'Test Recycling'}]
+        return f"{city}.json", f"{city}.sql"
+
+    mocker.patch('concurrent.futures.ProcessPoolExecutor', InlineExecutor)
+    mocker.patch.object(RecyclingServiceManager, 'process_location', fake_process_location)
+    manifest = process_batch([{'city': 'Newcastle', 'country': 'UK'}, {'city': 'Leeds', 'country': 'UK'}],
+                             workers=4, manifest_path=str(tmp_path / 'manifest.json'))
+
+    assert manifest['succeeded'] == 2
+    assert rates == [(10.0, 0.5), (10.0, 0.5)]
@@ -1,11 +1,19 @@
 import pytest
+import json
 from recycling_data_engineer.reporting_engineer import (
     clean_time_string,
     convert_time_format,
     parse_opening_hours,
+    parse_hours_line,
     match_materials,
-    generate_sql_statements
+    generate_sql_statements,
+    iter_json_records,
+    write_sql_file,
+    content_hash,
+    content_hashes
 )
+from recycling_data_engineer.existing_materials import EXISTING_MATERIALS
+from recycling_data_engineer.seed_materials import generate_materials_seed_sql
 
 def test_clean_time_string():
     """Test if clean_time_string properly cleans time strings"""
@@ -32,6 +40,29 @@ def test_parse_opening_hours():
     assert len(parsed_hours) == 3
     assert all(len(hour) == 4 for hour in parsed_hours)  # Each tuple should have 4 elements
 
+def test_parse_opening_hours_variants():
+    """Test if dash variants, Google's narrow spaces, 24-hour times and split days parse"""
+    assert parse_opening_hours(["Monday: 9:00\u202fAM\u2009–\u20095:00\u202fPM"]) == [(1, '09:00:00', '17:00:00', False)]
+    assert parse_opening_hours(["Monday: 9:00 AM-5:00 PM"]) == [(1, '09:00:00', '17:00:00', False)]
+    assert parse_opening_hours(["Sunday: 08:00 - 17:30"]) == [(0, '08:00:00', '17:30:00', False)]
+    assert parse_opening_hours(["Friday: 9:00 AM – 12:00 PM, 1:00 – 5:00 PM"]) == [
+        (5, '09:00:00', '12:00:00', False),
+        (5, '13:00:00', '17:00:00', False)
+    ]
+
+def test_parse_opening_hours_inherits_am_pm():
+    """Test if a time without AM/PM takes the other's unless that would open after closing"""
+    assert parse_opening_hours(["Monday: 9 – 5 PM"]) == [(1, '09:00:00', '17:00:00', False)]
+    assert parse_opening_hours(["Monday: 1:00 – 5:00 PM"]) == [(1, '13:00:00', '17:00:00', False)]
+    assert parse_opening_hours(["Saturday: 11:00 – 1:00 AM"]) == [(6, '23:00:00', '01:00:00', False)]
+
+def test_parse_opening_hours_logs_unparseable_lines(caplog):
+    """Test if bad lines are skipped with a logged warning, once per distinct line"""
+    parse_hours_line.cache_clear()
+    assert parse_opening_hours(["Funday: 9-5", "Monday: soon", "Monday: soon"]) == []
+    assert len(caplog.records) == 2
+    assert all(record.levelname == 'WARNING' for record in caplog.records)
+
 def test_match_materials():
     """Test if match_materials correctly matches materials"""
     test_materials = ["metal", "plastic"]
@@ -46,4 +77,118 @@ def test_match_materials():
     
     matched = match_materials(test_materials, test_website_materials, test_existing_materials)
     assert isinstance(matched, list)
-    assert all(isinstance(match, tuple) for match in matched) 
\ No newline at end of file
+    assert all(isinstance(match, tuple) for match in matched) 
+
+@pytest.fixture
+def sample_business():
+    """Provide a minimal business record as produced by the finder"""
+    return {
+        'name': "O'Brien Recycling",
+        'address': '1 Test Street',
+        'coordinates': {'lat': 54.97, 'lng': -1.61},
+        'place_id': 'test123',
+        'materials': ['plastic', 'paper'],
+        'website_materials': {'plastic': ['pet', 'hdpe'], 'paper': ['newspaper']},
+        'phone': None,
+        'website': None,
+        'rating': 4.5,
+        'opening_hours': ['Monday: 9:00 AM – 5:00 PM'],
+        'service_keywords': [],
+        'address_components': {}
+    }
+
+def test_existing_materials_have_stable_ids():
+    """Test if every catalog entry has a unique MaterialID"""
+    ids = [mat['MaterialID'] for mat in EXISTING_MATERIALS]
+    assert ids == list(range(1, len(EXISTING_MATERIALS) + 1))
+
+def test_generate_sql_uses_material_ids(sample_business):
+    """Test if material inserts use catalog IDs in one multi-row statement"""
+    sql = generate_sql_statements([sample_business])
+    assert "FROM recycling.Materials" not in sql
+    assert sql.count("INSERT INTO recycling.BusinessMaterials") == 1
+    assert "(@BusinessID_0, 20, 'plastic', 'PET', 1)" in sql
+    assert "O''Brien Recycling" in sql
+
+def test_materials_seed_sql():
+    """Test if the seed script loads every material with its ID"""
+    sql = generate_materials_seed_sql()
+    assert "SET IDENTITY_INSERT recycling.Materials ON;" in sql
+    assert all(f"({mat['MaterialID']}, '{mat['CategoryName']}'" in sql for mat in EXISTING_MATERIALS)
+    # Materials with IDENTITY-assigned IDs are moved before the catalog is merged
+    assert sql.index("DELETE m FROM recycling.Materials") < sql.index("MERGE recycling.Materials")
+    assert "UPDATE l SET MaterialID = mp.NewID" in sql
+
+def test_write_sql_file_matches_generated_sql(sample_business, tmp_path):
+    """Test if streamed SQL output matches the in-memory generator"""
+    records = [sample_business, dict(sample_business, place_id='test456')]
+    sql_path = tmp_path / 'out.sql'
+
+    assert write_sql_file(iter(records), str(sql_path)) == 2
+    assert sql_path.read_text(encoding='utf-8') == generate_sql_statements(records)
+
+def test_iter_json_records_reads_arrays_and_json_lines(sample_business, tmp_path):
+    """Test if records stream from both JSON arrays and JSON Lines files"""
+    records = [dict(sample_business, place_id=f'id{i}') for i in range(5)]
+    array_path = tmp_path / 'records.json'
+    array_path.write_text(json.dumps(records, indent=2), encoding='utf-8')
+    lines_path = tmp_path / 'records.jsonl'
+    lines_path.write_text("\n".join(json.dumps(record) for record in records) + "\n", encoding='utf-8')
+
+    assert list(iter_json_records(str(array_path), chunk_size=37)) == records
+    assert list(iter_json_records(str(lines_path))) == records
+
+def test_content_hash_ignores_key_order(sample_business):
+    """Test if content hashes depend on the record's content, not its key order"""
+    reordered = dict(reversed(list(sample_business.items())))
+    assert content_hash(reordered) == content_hash(sample_business)
+    assert content_hash(dict(sample_business, rating=3.0)) != content_hash(sample_business)
+
+def test_delta_sql_compares_stored_hashes_and_soft_deletes_within_scope(sample_business):
+    """Test if delta MERGEs compare the stored ContentHash and soft-deletes stay inside the run's area"""
+    near = dict(sample_business, place_id='near')
+    far = dict(sample_business, place_id='far', coordinates={'lat': 55.01, 'lng': -1.5})
+
+    sql = generate_sql_statements([near, far], delta=True)
+    assert sql.count("MERGE recycling.Businesses") == 2
+    assert sql.count("target.ContentHash <> source.ContentHash") == 2
+    assert f"'{content_hash(far)}' AS ContentHash" in sql
+    # Child rows are only rewritten when the MERGE wrote the business
+    assert sql.count("IF @@ROWCOUNT > 0") == 2
+    assert "INSERT INTO @SeenPlaceIDs (PlaceID) VALUES ('near');" in sql
+    assert "SET IsActive = 0" in sql
+    assert "Latitude BETWEEN 54.97 AND 55.01" in sql
+    assert "Longitude BETWEEN -1.61 AND -1.5" in sql
+    assert "PlaceID NOT IN (SELECT PlaceID FROM @SeenPlaceIDs)" in sql
+
+def test_full_sql_has_no_delta_statements(sample_business):
+    """Test if a full script inserts without merging or soft-deleting"""
+    sql = generate_sql_statements([sample_business])
+    assert "MERGE" not in sql
+    assert "@SeenPlaceIDs" not in sql
+    assert "IsActive = 0" not in sql
+
+def test_content_hash_is_stable_across_hash_seeds():
+    """Test if a business built by the finder hashes the same under different PYTHONHASHSEED values"""
+    import os
+    import subprocess
+    import sys
+    code = (
+        "from recycling_business_finder.recycling_business_finder import EnhancedRecyclingFinder, RecyclingBusiness\n"
+        "from recycling_data_engineer.reporting_engineer import content_hash\n"
+        "business = RecyclingBusiness('Test Recycling', '1 Test Street')\n"
+        "business.place_id = 'id1'\n"
+        "business.website_materials = {'plastic': ['plastic', 'pet'], 'metal': ['metal']}\n"
+        "EnhancedRecyclingFinder.add_website_materials(None, business, "
+        "{'paper': ['paper'], 'glass': ['glass'], 'electronics': ['computer'], 'wood': ['wood']})\n"
+        "print(content_hash(business.to_dict()))\n"
+        "print(content_hash(dict(business.to_dict(), materials=list(reversed(business.to_dict()['materials'])))))\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    hashes = set()
+    for seed in ('1', '2', '3'):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        result = subprocess.run([sys.executable, '-c', code], cwd=root, env=env,
+                                capture_output=True, text=True, check=True)
+        hashes.update(result.stdout.splitlines()[-2:])
+    assert len(hashes) == 1
@@ -0,0 +1,37 @@
+from benchmarks.search_benchmark import (
+    FakeGoogleClient, SyntheticSites, compare, synthetic_area, synthetic_places
+)
+from recycling_business_finder.geo import bounds_center
+
+def test_fake_client_pages_up_to_the_result_cap():
+    """Test if the fake nearby search pages like the Places API and stops at 60 results"""
+    client = FakeGoogleClient(synthetic_places(200, site_url='http://sites'))
+    center = bounds_center(synthetic_area(200))
+
+    response = client.places_nearby(location=center, radius=50000, keyword='recycling')
+    place_ids = [place['place_id'] for place in response['results']]
+    while 'next_page_token' in response:
+        response = client.places_nearby(page_token=response['next_page_token'])
+        place_ids += [place['place_id'] for place in response['results']]
+
+    assert len(place_ids) == len(set(place_ids)) == 60
+    assert client.requests == 3
+    assert 'details' not in response['results'][0]
+    assert client.place(place_ids[0])['result']['formatted_address'].endswith('Newcastle upon Tyne')
+    assert client.places_nearby(location=center, radius=1)['results'] == []
+
+def test_synthetic_sites_serve_sized_pages():
+    """Test if the local websites honour the page size and count requests"""
+    import requests
+    with SyntheticSites(page_bytes=8000) as sites:
+        body = requests.get(f"{sites.url}/site/3").text
+    assert 7000 <= len(body) <= 8000
+    assert 'We accept' in body
+    assert sites.requests == 1
+
+def test_compare_reports_wall_time_changes():
+    """Test if results files are compared scenario by scenario"""
+    previous = {'scenarios': [{'target': 'finder', 'places': 60, 'wall_seconds': 2.0}]}
+    current = {'scenarios': [{'target': 'finder', 'places': 60, 'wall_seconds': 1.0},
+                             {'target': 'manager', 'places': 60, 'wall_seconds': 1.5}]}
+    assert compare(previous, current) == ['finder      60: 2.00s -> 1.00s (0.50x)']
@@ -0,0 +1,12 @@
+from recycling_data_engineer.startup_benchmark import run_benchmark
+
+def test_sql_command_skips_heavy_imports():
+    """Test if the benchmark times each scenario and the sql command imports no search or database dependencies"""
+    results = run_benchmark(runs=1, businesses=2)
+    scenarios = results['scenarios']
+
+    assert set(scenarios) == {'interpreter', 'import', 'help', 'sql', 'finder_import'}
+    assert scenarios['sql']['heavy_modules'] == []
+    assert scenarios['help']['heavy_modules'] == []
+    assert 'googlemaps' in scenarios['finder_import']['heavy_modules']
+    assert all(scenario['median_ms'] > 0 for scenario in scenarios.values())
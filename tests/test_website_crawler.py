@@ -0,0 +1,107 @@
+import pytest
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from recycling_business_finder.rate_limit import RateLimiter
+from recycling_business_finder.website_crawler import WebsiteCrawler
+
+class _PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        content_type = 'text/html; charset=utf-8'
+        body = f"<html><body>Page {self.path}</body></html>".encode('utf-8')
+        if self.path == '/brochure.pdf':
+            content_type = 'application/pdf'
+            body = b'%PDF-1.4 plastic'
+        elif self.path == '/big':
+            body = b'<p>' + b'a' * 100000 + b'</p>'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def local_site():
+    """Serve simple HTML pages from a local HTTP server"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _PageHandler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+def test_crawl_fetches_all_pages(local_site):
+    """Test if crawl returns the text of every page keyed by url"""
+    crawler = WebsiteCrawler(max_concurrency=4, per_host=2)
+    urls = [f"{local_site}/{i}" for i in range(5)]
+    pages = crawler.crawl(urls + [urls[0], None])
+
+    assert list(pages) == urls
+    assert all(f"Page /{i}" in pages[url] for i, url in enumerate(urls))
+
+def test_crawl_isolates_failures(local_site):
+    """Test if an unreachable site does not affect the others"""
+    crawler = WebsiteCrawler()
+    pages = crawler.crawl([f"{local_site}/ok", "http://127.0.0.1:1/unreachable"])
+
+    assert "Page /ok" in pages[f"{local_site}/ok"]
+    assert pages["http://127.0.0.1:1/unreachable"] is None
+
+def test_fetch_skips_non_text_content(local_site):
+    """Test if non-HTML responses are not read"""
+    assert WebsiteCrawler().fetch(f"{local_site}/brochure.pdf") == ''
+
+def test_fetch_caps_bytes_read(local_site, monkeypatch):
+    """Test if at most WEBSITE_MAX_BYTES of a page are read"""
+    monkeypatch.setenv('WEBSITE_MAX_BYTES', '1000')
+    assert len(WebsiteCrawler().fetch(f"{local_site}/big")) == 1000
+
+def test_crawl_respects_host_rate(local_site):
+    """Test if requests to one host are spaced by WEBSITE_HOST_RATE"""
+    sleeps = []
+    limiter = RateLimiter(host_rate=1, sleep=sleeps.append)
+    crawler = WebsiteCrawler(per_host=4, rate_limiter=limiter)
+    pages = crawler.crawl([f"{local_site}/{i}" for i in range(3)])
+
+    assert all(pages.values())
+    # One request fits the burst, the next two wait for a token each
+    assert len(sleeps) == 2
+    assert sorted(round(seconds) for seconds in sleeps) == [1, 2]
+    host = local_site.split('//', 1)[1]
+    assert limiter.stats()[f"host:{host}"]['requests'] == 3
+
+def test_fetch_streams_text_while_downloading(local_site, monkeypatch):
+    """Test if on_text receives the capped page in pieces that add up to the returned text"""
+    monkeypatch.setenv('WEBSITE_MAX_BYTES', '70000')
+    pieces = []
+    text = WebsiteCrawler().fetch(f"{local_site}/big", on_text=pieces.append)
+
+    assert len(text) == 70000
+    assert len(pieces) > 1
+    assert ''.join(pieces) == text
+
+def test_crawl_inside_running_loop(local_site):
+    """Test if async callers can await crawl_async and the synchronous crawl still works inside their loop"""
+    import asyncio
+    crawler = WebsiteCrawler()
+    urls = [f"{local_site}/{i}" for i in range(2)]
+
+    async def caller():
+        return await crawler.crawl_async(urls), crawler.crawl(urls)
+
+    awaited, blocking = asyncio.run(caller())
+    assert awaited == blocking
+    assert "Page /1" in awaited[urls[1]]
+
+def test_streamed_text_callbacks_count_as_extract(local_site):
+    """Test if time spent handling streamed text is reported as extract, not crawl"""
+    import time
+    from recycling_business_finder.instrumentation import INSTRUMENTATION
+    INSTRUMENTATION.reset()
+    WebsiteCrawler().fetch(f"{local_site}/big", on_text=lambda text: time.sleep(0.1))
+
+    stages = INSTRUMENTATION.summary()['stages']
+    assert stages['extract']['seconds'] >= 0.1
+    assert stages['crawl']['seconds'] < 0.1